@@ -0,0 +1,141 @@
+"""Insert throughput and index size with random (v4) vs time-ordered (v7) UUID keys.
+
+Creates throw-away copies of ``applications`` and ``application_section_data``
+(same key columns and indexes) per key kind, inserts the same number of
+applications with their sections in batched transactions, and reports rows
+per second plus the on-disk size of every table and index::
+
+    python -m src.benchmarks.uuid_keys
+    python -m src.benchmarks.uuid_keys --database-url postgresql+asyncpg://... --applications 200000
+
+Without ``--database-url`` a temporary SQLite file is used. Index sizes come
+from ``dbstat`` on SQLite and ``pg_relation_size`` on Postgres. The gap grows
+once the indexes no longer fit in the database's page cache.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+from collections.abc import Callable
+
+from sqlalchemy import Column, ForeignKey, Index, MetaData, String, Table, UniqueConstraint, insert, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.types import JSON
+
+from src.core.ids import uuid7
+
+KEY_KINDS: dict[str, Callable[[], uuid.UUID]] = {"uuid4": uuid.uuid4, "uuid7": uuid7}
+SECTION_IDS = ("PERSONAL_INFO", "KYC", "EMPLOYMENT", "BANKING")
+
+
+def _tables(kind: str) -> tuple[MetaData, Table, Table]:
+    metadata = MetaData()
+    applications = Table(
+        f"bench_{kind}_applications",
+        metadata,
+        Column("id", UUID(as_uuid=True), primary_key=True),
+        Column("rule_version", String(32), nullable=False),
+    )
+    section_data = Table(
+        f"bench_{kind}_section_data",
+        metadata,
+        Column("id", UUID(as_uuid=True), primary_key=True),
+        Column("application_id", UUID(as_uuid=True), ForeignKey(applications.c.id), nullable=False),
+        Column("section_id", String(128), nullable=False),
+        Column("data", JSON, nullable=False),
+        UniqueConstraint("application_id", "section_id", name=f"uq_bench_{kind}_app_section"),
+        Index(f"ix_bench_{kind}_application_id", "application_id"),
+    )
+    return metadata, applications, section_data
+
+
+async def _run(engine: AsyncEngine, kind: str, application_count: int, batch_size: int) -> dict[str, object]:
+    new_id = KEY_KINDS[kind]
+    metadata, applications, section_data = _tables(kind)
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.drop_all)
+        await conn.run_sync(metadata.create_all)
+
+    rows = 0
+    started = time.perf_counter()
+    for offset in range(0, application_count, batch_size):
+        application_ids = [new_id() for _ in range(min(batch_size, application_count - offset))]
+        sections = [
+            {"id": new_id(), "application_id": application_id, "section_id": section_id, "data": {"n": offset}}
+            for application_id in application_ids
+            for section_id in SECTION_IDS
+        ]
+        async with engine.begin() as conn:
+            await conn.execute(insert(applications), [{"id": id_, "rule_version": "1.0.0"} for id_ in application_ids])
+            await conn.execute(insert(section_data), sections)
+        rows += len(application_ids) + len(sections)
+    elapsed = time.perf_counter() - started
+
+    sizes = await _relation_sizes(engine, f"bench_{kind}_")
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.drop_all)
+    return {"kind": kind, "rows": rows, "seconds": elapsed, "sizes": sizes}
+
+
+async def _relation_sizes(engine: AsyncEngine, prefix: str) -> dict[str, int]:
+    """Bytes per table and index whose name contains ``prefix`` (kind stripped from the names)."""
+    async with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            result = await conn.execute(
+                text("SELECT name, SUM(pgsize) FROM dbstat WHERE name LIKE :pattern GROUP BY name"),
+                {"pattern": f"%{prefix}%"},
+            )
+        elif engine.dialect.name == "postgresql":
+            result = await conn.execute(
+                text(
+                    "SELECT relname, pg_relation_size(oid) FROM pg_class "
+                    "WHERE relname LIKE :pattern AND relkind IN ('r', 'i')"
+                ),
+                {"pattern": f"%{prefix}%"},
+            )
+        else:
+            return {}
+        return {name.replace(prefix, "bench_"): size for name, size in result.all()}
+
+
+def _report(results: list[dict[str, object]]) -> None:
+    print(f"{'keys':<8}{'rows':>10}{'seconds':>10}{'rows/s':>12}")
+    for result in results:
+        rate = result["rows"] / result["seconds"]
+        print(f"{result['kind']:<8}{result['rows']:>10}{result['seconds']:>10.2f}{rate:>12.0f}")
+
+    names = sorted({name for result in results for name in result["sizes"]})
+    if not names:
+        return
+    print()
+    print(f"{'relation':<42}" + "".join(f"{result['kind'] + ' KiB':>14}" for result in results))
+    for name in names:
+        print(f"{name:<42}" + "".join(f"{result['sizes'].get(name, 0) // 1024:>14}" for result in results))
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", help="defaults to a temporary SQLite file")
+    parser.add_argument("--applications", type=int, default=50000)
+    parser.add_argument("--batch-size", type=int, default=500, help="applications per transaction")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = args.database_url or f"sqlite+aiosqlite:///{os.path.join(directory, 'bench.db')}"
+        engine = create_async_engine(database_url)
+        try:
+            results = [await _run(engine, kind, args.applications, args.batch_size) for kind in KEY_KINDS]
+        finally:
+            await engine.dispose()
+    print(f"{engine.dialect.name}, {args.applications} applications x {len(SECTION_IDS)} sections")
+    _report(results)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
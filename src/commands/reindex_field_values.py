@@ -0,0 +1,94 @@
+"""Rebuild the application_field_values lookup index from stored section data.
+
+Saves and actions keep the index current for the fields the rule config flags
+``"indexed": true``, but only from the moment a field is flagged. Run this once
+after deploying a new flag (or unflagging one), and after the migration that
+created the table::
+
+    python -m src.commands.reindex_field_values
+    python -m src.commands.reindex_field_values --batch-size 200
+
+Applications are processed in id order, one transaction per batch, against
+``DATABASE_URL`` with the rule configs of ``RULE_CONFIG_DIR``. The section rows
+of a batch are locked on Postgres while it is re-indexed, so a concurrent save
+cannot be overwritten with an older value. Safe to re-run or interrupt.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from uuid import UUID
+
+from sqlalchemy import select
+
+from src.core.database import AsyncSessionLocal, engine
+from src.models.application import Application
+from src.models.application_section_data import ApplicationSectionData
+from src.repositories.application_field_value_repository import (
+    ApplicationFieldValueRepository,
+    SectionFieldValues,
+)
+from src.services.rule_registry import get_rule_registry
+from src.services.rule_service import RuleService
+
+
+async def reindex(batch_size: int) -> tuple[int, int]:
+    """Re-index every application; returns (applications, indexed sections)."""
+    rule_service = RuleService(get_rule_registry())
+    applications = 0
+    sections = 0
+    after: UUID | None = None
+    while True:
+        async with AsyncSessionLocal() as session:
+            query = select(Application.id, Application.rule_version).order_by(Application.id).limit(batch_size)
+            if after is not None:
+                query = query.where(Application.id > after)
+            batch = (await session.execute(query)).all()
+            if not batch:
+                return applications, sections
+            rule_versions = {application_id: rule_version for application_id, rule_version in batch}
+
+            rows = await session.execute(
+                select(
+                    ApplicationSectionData.application_id,
+                    ApplicationSectionData.section_id,
+                    ApplicationSectionData.data,
+                )
+                .where(ApplicationSectionData.application_id.in_(list(rule_versions)))
+                .with_for_update()
+            )
+            values = [
+                SectionFieldValues(
+                    application_id,
+                    section_id,
+                    data,
+                    rule_service.indexed_fields(rule_versions[application_id], section_id),
+                )
+                for application_id, section_id, data in rows.all()
+            ]
+            values = [value for value in values if value.indexed_fields]
+            await ApplicationFieldValueRepository(session).replace_applications(list(rule_versions), values)
+            await session.commit()
+
+        applications += len(batch)
+        sections += len(values)
+        after = batch[-1][0]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500, help="applications per transaction")
+    args = parser.parse_args()
+    if args.batch_size <= 0:
+        parser.error("--batch-size must be positive")
+
+    try:
+        applications, sections = await reindex(args.batch_size)
+    finally:
+        await engine.dispose()
+    print(f"Re-indexed {sections} sections of {applications} applications")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
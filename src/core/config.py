@@ -1,5 +1,6 @@
 import os
 from functools import lru_cache
+from pathlib import Path
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -14,6 +15,71 @@ class Settings(BaseSettings):
         "sqlite+aiosqlite:///./loan_poc.db"  # SQLite default for dev
     )
 
+    # Directory of <rule_version>.json files; re-scanned for changes at this interval (0 disables)
+    rule_config_dir: str = os.getenv(
+        "RULE_CONFIG_DIR",
+        str(Path(__file__).resolve().parent.parent / "rules"),
+    )
+    rule_reload_interval_seconds: float = float(os.getenv("RULE_RELOAD_INTERVAL_SECONDS", "5"))
+    # Max resolved override overlays kept per process (keyed by rule version + override hash)
+    override_cache_size: int = int(os.getenv("OVERRIDE_CACHE_SIZE", "1024"))
+
+    # Connection pool (server databases): sizes, checkout timeout, recycle age (-1: never) and pre-ping.
+    # Pre-ping costs a round trip per checkout; without it, keep the recycle age below the server's idle timeout
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    db_pool_timeout_seconds: float = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+    db_pool_recycle_seconds: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "-1"))
+    db_pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    # Read replica for read-only endpoints (empty: everything on the primary). A client that wrote within
+    # the window keeps reading from the primary, so it always sees its own writes
+    database_read_url: str = os.getenv("DATABASE_READ_URL", "")
+    db_read_pool_size: int = int(os.getenv("DB_READ_POOL_SIZE", os.getenv("DB_POOL_SIZE", "5")))
+    read_after_write_window_seconds: float = float(os.getenv("READ_AFTER_WRITE_WINDOW_SECONDS", "5"))
+
+    # SQLite production profile (file databases only): WAL and tuned pragmas on every connection, a pool of
+    # query-only reader connections for read-only endpoints, and a single writer connection
+    sqlite_production_profile: bool = os.getenv("SQLITE_PRODUCTION_PROFILE", "false").lower() == "true"
+    sqlite_reader_pool_size: int = int(os.getenv("SQLITE_READER_POOL_SIZE", "4"))
+    sqlite_busy_timeout_ms: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    sqlite_cache_size_kib: int = int(os.getenv("SQLITE_CACHE_SIZE_KIB", "65536"))
+    sqlite_mmap_size_bytes: int = int(os.getenv("SQLITE_MMAP_SIZE_BYTES", str(256 * 1024 * 1024)))
+
+    # Group-commit concurrent save-draft writes (opt-in)
+    draft_coalescing_enabled: bool = os.getenv("DRAFT_COALESCING_ENABLED", "false").lower() == "true"
+    draft_coalescing_max_batch_size: int = int(os.getenv("DRAFT_COALESCING_MAX_BATCH_SIZE", "64"))
+    draft_coalescing_max_delay_ms: float = float(os.getenv("DRAFT_COALESCING_MAX_DELAY_MS", "10"))
+
+    # Serialized /evaluate responses keyed by ETag (size 0 disables); EVALUATION_CACHE_URL=redis://... shares them
+    evaluation_cache_size: int = int(os.getenv("EVALUATION_CACHE_SIZE", "2048"))
+    evaluation_cache_ttl_seconds: float = float(os.getenv("EVALUATION_CACHE_TTL_SECONDS", "300"))
+    evaluation_cache_url: str = os.getenv("EVALUATION_CACHE_URL", "")
+
+    # Action handlers: default per-action timeout and max concurrent runs per action (per process)
+    action_timeout_seconds: float = float(os.getenv("ACTION_TIMEOUT_SECONDS", "10"))
+    action_max_concurrency: int = int(os.getenv("ACTION_MAX_CONCURRENCY", "16"))
+    # Action outcomes cached by action + normalized payload (size 0 disables single-flight and caching)
+    action_cache_size: int = int(os.getenv("ACTION_CACHE_SIZE", "4096"))
+    action_cache_ttl_seconds: float = float(os.getenv("ACTION_CACHE_TTL_SECONDS", "600"))
+    # Background action jobs (Prefer: respond-async): worker pool size per process, and how long a
+    # RUNNING job may go without finishing before a restarted process picks it up again
+    action_job_workers: int = int(os.getenv("ACTION_JOB_WORKERS", "4"))
+    action_job_stale_after_seconds: float = float(os.getenv("ACTION_JOB_STALE_AFTER_SECONDS", "300"))
+    # Runs a job may start before it is marked FAILED (crashed handlers, dead processes).
+    action_job_max_attempts: int = int(os.getenv("ACTION_JOB_MAX_ATTEMPTS", "3"))
+
+    # Idempotency-Key on mutating endpoints: replay window, how long a duplicate waits for the original,
+    # and the batched purge of expired keys
+    idempotency_retention_seconds: float = float(os.getenv("IDEMPOTENCY_RETENTION_SECONDS", "86400"))
+    idempotency_wait_seconds: float = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "10"))
+    # Lease on an in-progress key, renewed by its owner; only a dead owner's key is taken over.
+    idempotency_lease_seconds: float = float(os.getenv("IDEMPOTENCY_LEASE_SECONDS", "60"))
+    idempotency_purge_interval_seconds: float = float(os.getenv("IDEMPOTENCY_PURGE_INTERVAL_SECONDS", "60"))
+    idempotency_purge_batch_size: int = int(os.getenv("IDEMPOTENCY_PURGE_BATCH_SIZE", "500"))
+
+    # Debug: validate server-built evaluate responses against the pydantic schemas before sending
+    validate_responses: bool = os.getenv("VALIDATE_RESPONSES", "false").lower() == "true"
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -1,15 +1,25 @@
 from collections.abc import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Session
 
+from src.core import read_after_write
 from src.core.config import get_settings
 
 
 settings = get_settings()
 
 # Configure engine based on database type
-engine_kwargs = {"pool_pre_ping": True}
+engine_kwargs = {
+    "pool_size": settings.db_pool_size,
+    "max_overflow": settings.db_max_overflow,
+    "pool_timeout": settings.db_pool_timeout_seconds,
+    "pool_recycle": settings.db_pool_recycle_seconds,
+    "pool_pre_ping": settings.db_pool_pre_ping,
+}
 
 # SQLite doesn't need connection pooling
 if "sqlite" in settings.database_url.lower():
@@ -17,12 +27,90 @@ if "sqlite" in settings.database_url.lower():
         "connect_args": {"check_same_thread": False},
     }
 
-engine = create_async_engine(settings.database_url, **engine_kwargs)
+
+def _is_sqlite_file(database_url: str) -> bool:
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite":
+        return False
+    database = url.database or ""
+    return database not in ("", ":memory:") and url.query.get("mode") != "memory"
+
+
+def _sqlite_pragmas(query_only: bool = False) -> list[str]:
+    pragmas = [
+        # Readers no longer block the writer (or each other); the mode persists in the file.
+        "PRAGMA journal_mode=WAL",
+        # Durable at checkpoints; a power loss can only drop the last commits, never corrupt.
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA mmap_size={settings.sqlite_mmap_size_bytes}",
+        f"PRAGMA cache_size=-{settings.sqlite_cache_size_kib}",
+        f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}",
+    ]
+    if query_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def _create_sqlite_engine(pool_size: int, query_only: bool = False) -> AsyncEngine:
+    sqlite_engine = create_async_engine(
+        settings.database_url,
+        pool_size=pool_size,
+        max_overflow=0,
+        **engine_kwargs,
+    )
+    pragmas = _sqlite_pragmas(query_only)
+
+    @event.listens_for(sqlite_engine.sync_engine, "connect")
+    def _apply_pragmas(dbapi_connection, _) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    return sqlite_engine
+
+
+if settings.sqlite_production_profile and _is_sqlite_file(settings.database_url):
+    # SQLite serializes writers anyway; one connection queues them in-process instead of
+    # spinning on the file lock, while read-only endpoints use their own pool. Every write
+    # (requests with their idempotency rows, action jobs, the draft coalescer) checks out
+    # this connection, and nothing holding it waits for another.
+    engine = _create_sqlite_engine(pool_size=1)
+    read_engine = _create_sqlite_engine(pool_size=settings.sqlite_reader_pool_size, query_only=True)
+else:
+    engine = create_async_engine(settings.database_url, **engine_kwargs)
+    read_engine = engine
+
+# A replica lags the primary; read-only requests of a client that just wrote stay on the primary.
+read_replica_enabled = bool(settings.database_read_url)
+if read_replica_enabled:
+    read_engine = create_async_engine(
+        settings.database_read_url,
+        **{**engine_kwargs, "pool_size": settings.db_read_pool_size},
+    )
+
+
+
+class _ReadSession(Session):
+    """Uses the primary instead of the read engine when read_after_write asks it to."""
+
+    def get_bind(self, *args, **kwargs):
+        if self.info.get(read_after_write.USE_PRIMARY):
+            return engine.sync_engine
+        return super().get_bind(*args, **kwargs)
+
+
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
     class_=AsyncSession,
     expire_on_commit=False,
 )
+ReadSessionLocal = async_sessionmaker(
+    bind=read_engine,
+    class_=AsyncSession,
+    sync_session_class=_ReadSession,
+    expire_on_commit=False,
+)
 
 
 class Base(DeclarativeBase):
@@ -32,3 +120,16 @@ class Base(DeclarativeBase):
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         yield session
+
+
+async def get_read_db_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session for endpoints that never write.
+
+    Uses the read replica when one is configured and the reader pool on the SQLite profile.
+    Reads of recently written applications, and every read of a client whose ``last_write``
+    cookie is still fresh, go to the primary instead (see read_after_write).
+    """
+    async with ReadSessionLocal() as session:
+        if read_replica_enabled and read_after_write.is_sticky(request, settings.read_after_write_window_seconds):
+            session.info[read_after_write.USE_PRIMARY] = True
+        yield session
@@ -0,0 +1,53 @@
+"""Time-ordered primary keys.
+
+UUIDv7 (RFC 9562) puts a 48-bit Unix millisecond timestamp in front of the
+random bits, so ids generated later sort later: as 16 bytes (Postgres
+``uuid``) and as hex text (SQLite ``CHAR(32)``) alike. New rows therefore
+land on the right-most pages of primary-key and foreign-key indexes instead
+of random ones. Within a millisecond a 12-bit counter (seeded randomly, per
+RFC 9562 method 1) keeps ids from this process strictly increasing, also if
+the clock steps back.
+
+The ids are ordinary UUIDs in the same columns, so existing version 4 ids
+stay valid; they just don't carry any order.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import uuid
+
+_MAX_COUNTER = 0xFFF
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def uuid7() -> uuid.UUID:
+    global _last_ms, _counter
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            # Top counter bit starts at zero, leaving room for 2048+ ids in the same millisecond.
+            _counter = int.from_bytes(os.urandom(2), "big") & (_MAX_COUNTER >> 1)
+        elif _counter < _MAX_COUNTER:
+            _counter += 1
+        else:
+            # Counter exhausted (or clock went back): borrow the next millisecond.
+            _last_ms += 1
+            _counter = 0
+        timestamp_ms, counter = _last_ms, _counter
+
+    random_bits = int.from_bytes(os.urandom(8), "big") & 0x3FFF_FFFF_FFFF_FFFF
+    value = (
+        (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76  # version
+        | counter << 64
+        | 0b10 << 62  # RFC 9562 variant
+        | random_bits
+    )
+    return uuid.UUID(int=value)
@@ -0,0 +1,147 @@
+"""Read-your-writes on top of a lagging read replica.
+
+Write paths note the applications they change where they bump
+``data_version``, and the action jobs they create or update; when that
+session commits, the ids are recorded as recently written. For
+``READ_AFTER_WRITE_WINDOW_SECONDS`` afterwards, read sessions that load those
+rows are routed to the primary (see ``route_recent_writes``), so an evaluate
+right after a save never sees the replica's older ``data_version`` and a job
+poll never goes back to an older status. This needs nothing from the client. The
+record is per process: deployments with several workers should route an
+application's requests to the same worker, or keep the window above the
+replica lag and rely on the cookie below.
+
+Write endpoints also mark their request, and the response sets a short-lived
+``last_write`` cookie with the time of the write. Clients that send it back
+get the primary for every read-only request during the window, listings
+included.
+"""
+
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from functools import lru_cache
+from uuid import UUID
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import get_settings
+
+COOKIE_NAME = "last_write"
+# Key in the ASGI scope state; set by write endpoints.
+_WROTE = "read_after_write.wrote"
+# Session.info keys: applications written in the open transaction; reads to send to the primary.
+_WRITTEN = "read_after_write.written"
+USE_PRIMARY = "read_after_write.use_primary"
+
+
+class RecentWrites:
+    """Ids of applications and action jobs committed to in the last ``window_seconds``, oldest first."""
+
+    def __init__(self, window_seconds: float, max_entries: int = 100_000) -> None:
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._written_at: OrderedDict[UUID, float] = OrderedDict()
+
+    def record(self, ids: Iterable[UUID]) -> None:
+        now = time.monotonic()
+        for row_id in ids:
+            self._written_at[row_id] = now
+            self._written_at.move_to_end(row_id)
+        self._expire(now)
+
+    def any_recent(self, ids: Iterable[UUID]) -> bool:
+        now = time.monotonic()
+        self._expire(now)
+        return any(row_id in self._written_at for row_id in ids)
+
+    def _expire(self, now: float) -> None:
+        written_at = self._written_at
+        while written_at and (
+            len(written_at) > self.max_entries or now - next(iter(written_at.values())) >= self.window_seconds
+        ):
+            written_at.popitem(last=False)
+
+
+@lru_cache
+def get_recent_writes() -> RecentWrites | None:
+    """None unless a read replica is configured."""
+    settings = get_settings()
+    if not settings.database_read_url or settings.read_after_write_window_seconds <= 0:
+        return None
+    return RecentWrites(settings.read_after_write_window_seconds)
+
+
+def note_written(session: AsyncSession, ids: Iterable[UUID]) -> None:
+    """Remember that this transaction writes the rows with ``ids``; recorded once it commits."""
+    if get_recent_writes() is not None:
+        session.info.setdefault(_WRITTEN, set()).update(ids)
+
+
+def route_recent_writes(session: AsyncSession, ids: Iterable[UUID]) -> None:
+    """Send this read session to the primary if any of the rows with ``ids`` was just written.
+
+    Must be called before the session runs its first statement.
+    """
+    recent_writes = get_recent_writes()
+    if recent_writes is not None and recent_writes.any_recent(ids):
+        session.info[USE_PRIMARY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _record_committed_writes(session: Session) -> None:
+    written = session.info.pop(_WRITTEN, None)
+    recent_writes = get_recent_writes()
+    if written and recent_writes is not None:
+        recent_writes.record(written)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_writes(session: Session) -> None:
+    session.info.pop(_WRITTEN, None)
+
+
+def mark_write(request: Request) -> None:
+    """Route dependency of write endpoints: the response sets the ``last_write`` cookie."""
+    request.scope.setdefault("state", {})[_WROTE] = True
+
+
+def is_sticky(request: Request, window_seconds: float) -> bool:
+    """True while the client's last write is younger than ``window_seconds``."""
+    value = request.cookies.get(COOKIE_NAME)
+    if value is None or window_seconds <= 0:
+        return False
+    try:
+        written_ms = int(value)
+    except ValueError:
+        return False
+    return time.time() * 1000 - written_ms < window_seconds * 1000
+
+
+class ReadAfterWriteMiddleware:
+    def __init__(self, app: ASGIApp, window_seconds: float) -> None:
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.window_seconds <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and scope.get("state", {}).get(_WROTE):
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{COOKIE_NAME}={int(time.time() * 1000)}; Max-Age={math.ceil(self.window_seconds)}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -0,0 +1,35 @@
+"""JSON encoding for responses the server assembles itself.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise; both produce compact UTF-8 bytes with the same key order.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+from types import MappingProxyType
+from typing import Any
+from uuid import UUID
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    # Compiled rule plans hold read-only mappings.
+    if isinstance(value, MappingProxyType):
+        return dict(value)
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(document: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(document, default=_default)
+    return json.dumps(document, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
@@ -1,13 +1,25 @@
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
 from src.core.config import get_settings
+from src.core.database import read_replica_enabled
+from src.core.read_after_write import ReadAfterWriteMiddleware
 from src.routers.action import router as action_router
 from src.routers.applications import router as applications_router
 from src.routers.evaluate import router as evaluate_router
+from src.routers.metrics import router as metrics_router
+from src.routers.rules import router as rules_router
 from src.routers.save_draft import router as save_draft_router
 from src.routers.submit import router as submit_router
+from src.routers.validate import router as validate_router
+from src.services.action_job_runner import get_action_job_runner
+from src.services.draft_write_coalescer import get_draft_write_coalescer
+from src.services.evaluation_cache import get_evaluation_cache
+from src.services.idempotency import get_idempotency_store
+from src.services.rule_registry import get_rule_registry
 
 # Configure logging
 logging.basicConfig(
@@ -18,12 +30,37 @@ logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
-app = FastAPI(title=settings.app_name)
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    # Picks up action jobs left unfinished by a previous run.
+    await get_action_job_runner().start()
+    yield
+    await get_action_job_runner().close()
+    write_coalescer = get_draft_write_coalescer()
+    if write_coalescer is not None:
+        await write_coalescer.close()
+    evaluation_cache = get_evaluation_cache()
+    if evaluation_cache is not None:
+        await evaluation_cache.close()
+    await get_idempotency_store().close()
+
+
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
+if read_replica_enabled:
+    app.add_middleware(ReadAfterWriteMiddleware, window_seconds=settings.read_after_write_window_seconds)
+
+# Compile every available rule version once, before the first request arrives.
+rule_registry = get_rule_registry()
+logger.info(f"📚 Loaded rule versions: {', '.join(rule_registry.versions())}")
 
 app.include_router(applications_router)
 app.include_router(evaluate_router)
 app.include_router(action_router)
 app.include_router(save_draft_router)
 app.include_router(submit_router)
+app.include_router(validate_router)
+app.include_router(rules_router)
+app.include_router(metrics_router)
 
 logger.info(f"✅ {settings.app_name} started")
@@ -10,7 +10,14 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from src.core.config import get_settings
 from src.core.database import Base
-from src.models import Application, ApplicationOverride, ApplicationSectionData  # noqa: F401
+from src.models import (  # noqa: F401
+    ActionJob,
+    Application,
+    ApplicationFieldValue,
+    ApplicationOverride,
+    ApplicationSectionData,
+    IdempotencyKey,
+)
 
 config = context.config
 
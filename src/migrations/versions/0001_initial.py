@@ -16,6 +16,9 @@ down_revision: str | None = None
 branch_labels: Sequence[str] | None = None
 depends_on: Sequence[str] | None = None
 
+# JSONB on Postgres; plain JSON keeps the migrations runnable on SQLite.
+_JSONB = sa.JSON().with_variant(postgresql.JSONB(astext_type=sa.Text()), "postgresql")
+
 
 def upgrade() -> None:
     op.create_table(
@@ -23,7 +26,7 @@ def upgrade() -> None:
         sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column("rule_version", sa.String(length=32), nullable=False),
         sa.Column("phase", sa.String(length=64), nullable=False),
-        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
         sa.PrimaryKeyConstraint("id"),
     )
 
@@ -32,7 +35,7 @@ def upgrade() -> None:
         sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column("application_id", postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column("section_id", sa.String(length=128), nullable=False),
-        sa.Column("data", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("data", _JSONB, nullable=False),
         sa.ForeignKeyConstraint(["application_id"], ["applications.id"], ondelete="CASCADE"),
         sa.PrimaryKeyConstraint("id"),
         sa.UniqueConstraint("application_id", "section_id", name="uq_app_section_data_app_section"),
@@ -44,7 +47,7 @@ def upgrade() -> None:
         "application_overrides",
         sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column("application_id", postgresql.UUID(as_uuid=True), nullable=False),
-        sa.Column("override_patch", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("override_patch", _JSONB, nullable=False),
         sa.ForeignKeyConstraint(["application_id"], ["applications.id"], ondelete="CASCADE"),
         sa.PrimaryKeyConstraint("id"),
         sa.UniqueConstraint("application_id", name="uq_application_overrides_application_id"),
@@ -0,0 +1,33 @@
+"""precomputed section completion status
+
+Revision ID: 0002_section_status
+Revises: 0001_initial
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0002_section_status"
+down_revision: str | None = "0001_initial"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("application_section_data", sa.Column("status", sa.String(length=16), nullable=True))
+    op.add_column("application_section_data", sa.Column("status_stamp", sa.String(length=40), nullable=True))
+    op.create_index(
+        "ix_app_section_data_section_status",
+        "application_section_data",
+        ["section_id", "status", "status_stamp"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_app_section_data_section_status", table_name="application_section_data")
+    op.drop_column("application_section_data", "status_stamp")
+    op.drop_column("application_section_data", "status")
@@ -0,0 +1,27 @@
+"""application data version stamp
+
+Revision ID: 0003_application_data_version
+Revises: 0002_section_status
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0003_application_data_version"
+down_revision: str | None = "0002_section_status"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "applications",
+        sa.Column("data_version", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("applications", "data_version")
@@ -0,0 +1,44 @@
+"""background action jobs
+
+Revision ID: 0004_action_jobs
+Revises: 0003_application_data_version
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0004_action_jobs"
+down_revision: str | None = "0003_application_data_version"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "action_jobs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("application_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("action_id", sa.String(length=64), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.String(length=512), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["application_id"], ["applications.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_action_jobs_application_id", "action_jobs", ["application_id"], unique=False)
+    op.create_index("ix_action_jobs_status_updated_at", "action_jobs", ["status", "updated_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_action_jobs_status_updated_at", table_name="action_jobs")
+    op.drop_index("ix_action_jobs_application_id", table_name="action_jobs")
+    op.drop_table("action_jobs")
@@ -0,0 +1,65 @@
+"""application listing and field search indexes
+
+Revision ID: 0006_application_listing_indexes
+Revises: 0005_idempotency_keys
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0006_application_listing_indexes"
+down_revision: str | None = "0005_idempotency_keys"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+# Searchable section fields (see SEARCHABLE_FIELDS) -> expression index name.
+_SQLITE_FIELD_INDEXES = {
+    "panNumber": "ix_app_section_data_pan_number",
+    "panVerified": "ix_app_section_data_pan_verified",
+}
+
+
+def upgrade() -> None:
+    op.create_index("ix_applications_created_at_id", "applications", ["created_at", "id"], unique=False)
+    op.create_index(
+        "ix_applications_phase_created_at_id", "applications", ["phase", "created_at", "id"], unique=False
+    )
+    op.create_index(
+        "ix_applications_rule_version_created_at_id",
+        "applications",
+        ["rule_version", "created_at", "id"],
+        unique=False,
+    )
+
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.create_index(
+            "ix_app_section_data_data_gin",
+            "application_section_data",
+            [sa.text("(data::jsonb) jsonb_path_ops")],
+            unique=False,
+            postgresql_using="gin",
+        )
+    elif dialect == "sqlite":
+        for field_id, index_name in _SQLITE_FIELD_INDEXES.items():
+            op.create_index(
+                index_name,
+                "application_section_data",
+                [sa.text(f"""json_extract(data, '$."{field_id}"')""")],
+                unique=False,
+            )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.drop_index("ix_app_section_data_data_gin", table_name="application_section_data")
+    elif dialect == "sqlite":
+        for index_name in _SQLITE_FIELD_INDEXES.values():
+            op.drop_index(index_name, table_name="application_section_data")
+    op.drop_index("ix_applications_rule_version_created_at_id", table_name="applications")
+    op.drop_index("ix_applications_phase_created_at_id", table_name="applications")
+    op.drop_index("ix_applications_created_at_id", table_name="applications")
@@ -0,0 +1,44 @@
+"""application field value lookup index
+
+Revision ID: 0007_application_field_values
+Revises: 0006_application_listing_indexes
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0007_application_field_values"
+down_revision: str | None = "0006_application_listing_indexes"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    value_type = sa.String(length=256)
+    if op.get_bind().dialect.name == "postgresql":
+        value_type = sa.String(length=256, collation="C")
+    op.create_table(
+        "application_field_values",
+        sa.Column("application_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("section_id", sa.String(length=128), nullable=False),
+        sa.Column("field_id", sa.String(length=128), nullable=False),
+        sa.Column("value", value_type, nullable=False),
+        sa.ForeignKeyConstraint(["application_id"], ["applications.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("application_id", "section_id", "field_id"),
+    )
+    op.create_index(
+        "ix_application_field_values_lookup",
+        "application_field_values",
+        ["section_id", "field_id", "value", "application_id"],
+        unique=False,
+    )
+    # Starts empty: index the existing section data with python -m src.commands.reindex_field_values.
+
+
+def downgrade() -> None:
+    op.drop_index("ix_application_field_values_lookup", table_name="application_field_values")
+    op.drop_table("application_field_values")
@@ -1,5 +1,15 @@
+from src.models.action_job import ActionJob
 from src.models.application import Application
+from src.models.application_field_value import ApplicationFieldValue
 from src.models.application_override import ApplicationOverride
 from src.models.application_section_data import ApplicationSectionData
+from src.models.idempotency_key import IdempotencyKey
 
-__all__ = ["Application", "ApplicationSectionData", "ApplicationOverride"]
+__all__ = [
+    "Application",
+    "ApplicationSectionData",
+    "ApplicationOverride",
+    "ApplicationFieldValue",
+    "ActionJob",
+    "IdempotencyKey",
+]
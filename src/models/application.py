@@ -1,20 +1,29 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, String
+from sqlalchemy import DateTime, Index, Integer, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
 from src.core.database import Base
+from src.core.ids import uuid7
 
 
 class Application(Base):
     __tablename__ = "applications"
+    __table_args__ = (
+        # Keyset pagination of GET /applications, newest first, optionally within a phase or rule version.
+        Index("ix_applications_created_at_id", "created_at", "id"),
+        Index("ix_applications_phase_created_at_id", "phase", "created_at", "id"),
+        Index("ix_applications_rule_version_created_at_id", "rule_version", "created_at", "id"),
+    )
 
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     rule_version: Mapped[str] = mapped_column(String(32), nullable=False)
     phase: Mapped[str] = mapped_column(String(64), nullable=False)
+    # Bumped by every section-data or override write; drives evaluation caching and ETags.
+    data_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
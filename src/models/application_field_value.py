@@ -0,0 +1,36 @@
+import uuid
+
+from sqlalchemy import ForeignKey, Index, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core.database import Base
+
+# Normalized values longer than this are not indexed.
+MAX_INDEXED_VALUE_LENGTH = 256
+
+
+class ApplicationFieldValue(Base):
+    """Write-through lookup index of the section fields the rule config flags ``"indexed": true``."""
+
+    __tablename__ = "application_field_values"
+    __table_args__ = (
+        # Covers exact and prefix lookups without touching the table.
+        Index("ix_application_field_values_lookup", "section_id", "field_id", "value", "application_id"),
+    )
+
+    application_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("applications.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    section_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    field_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    # Normalized value (see normalize_field_value). Byte-wise collation on Postgres so that
+    # prefix ranges follow the index order, as SQLite's default BINARY collation does.
+    value: Mapped[str] = mapped_column(
+        String(MAX_INDEXED_VALUE_LENGTH).with_variant(
+            String(MAX_INDEXED_VALUE_LENGTH, collation="C"), "postgresql"
+        ),
+        nullable=False,
+    )
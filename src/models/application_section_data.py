@@ -1,12 +1,20 @@
 import uuid
 from typing import Any
 
-from sqlalchemy import ForeignKey, Index, String, UniqueConstraint
+from sqlalchemy import ForeignKey, Index, String, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.types import JSON
 
 from src.core.database import Base
+from src.core.ids import uuid7
+
+# Fields GET /applications can filter on, with the name of their SQLite expression index.
+# Postgres serves any of them from the GIN index on the whole document.
+SEARCHABLE_FIELDS: dict[str, str] = {
+    "panNumber": "ix_app_section_data_pan_number",
+    "panVerified": "ix_app_section_data_pan_verified",
+}
 
 
 class ApplicationSectionData(Base):
@@ -15,9 +23,20 @@ class ApplicationSectionData(Base):
         UniqueConstraint("application_id", "section_id", name="uq_app_section_data_app_section"),
         Index("ix_app_section_data_application_id", "application_id"),
         Index("ix_app_section_data_section_id", "section_id"),
+        Index("ix_app_section_data_section_status", "section_id", "status", "status_stamp"),
+        # Field-value search (GET /applications).
+        Index(
+            "ix_app_section_data_data_gin",
+            text("(data::jsonb) jsonb_path_ops"),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+        *(
+            Index(index_name, text(f"""json_extract(data, '$."{field_id}"')""")).ddl_if(dialect="sqlite")
+            for field_id, index_name in SEARCHABLE_FIELDS.items()
+        ),
     )
 
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     application_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("applications.id", ondelete="CASCADE"),
@@ -25,5 +44,9 @@ class ApplicationSectionData(Base):
     )
     section_id: Mapped[str] = mapped_column(String(128), nullable=False)
     data: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False, default=dict)
+    # Completion status maintained at write time; only trusted while status_stamp
+    # matches the current rule plan + override overlay (see rule_plan.status_stamp).
+    status: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    status_stamp: Mapped[str | None] = mapped_column(String(40), nullable=True)
 
     application = relationship("Application", back_populates="section_data")
@@ -0,0 +1,27 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import DateTime, Index, Integer, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import JSON
+
+from src.core.database import Base
+
+
+class IdempotencyKey(Base):
+    """Outcome of one mutating request, replayed for retries carrying the same Idempotency-Key."""
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (Index("ix_idempotency_keys_created_at", "created_at"),)
+
+    # sha256 of endpoint scope + client key; the raw key is never stored.
+    key_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    # sha256 of the canonical request body; a reused key with a different body is rejected.
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    # NULL while the original request is still running.
+    status_code: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    response_body: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    response_headers: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    # While status_code is NULL: the owner renews this; once it passes, a duplicate may take over.
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,143 @@
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core import read_after_write
+from src.models.action_job import ActionJob
+
+JOB_PENDING = "PENDING"
+JOB_RUNNING = "RUNNING"
+JOB_COMPLETED = "COMPLETED"
+JOB_FAILED = "FAILED"
+
+
+class ActionJobRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def create(self, application_id: UUID, action_id: str, payload: dict[str, Any]) -> ActionJob:
+        now = self.now_utc()
+        entity = ActionJob(
+            application_id=application_id,
+            action_id=action_id,
+            payload=payload,
+            status=JOB_PENDING,
+            attempts=0,
+            created_at=now,
+            updated_at=now,
+        )
+        self.session.add(entity)
+        await self.session.flush()
+        read_after_write.note_written(self.session, [entity.id])
+        return entity
+
+    def read_own_writes(self, job_ids: list[UUID]) -> None:
+        """On a read session: use the primary if one of these jobs was just written."""
+        read_after_write.route_recent_writes(self.session, job_ids)
+
+    async def get_by_id(self, job_id: UUID) -> ActionJob | None:
+        return await self.session.get(ActionJob, job_id, populate_existing=True)
+
+    async def claim(self, job_id: UUID) -> bool:
+        """PENDING -> RUNNING; False when another worker (or process) got there first."""
+        result = await self.session.execute(
+            update(ActionJob)
+            .where(ActionJob.id == job_id, ActionJob.status == JOB_PENDING)
+            .values(status=JOB_RUNNING, attempts=ActionJob.attempts + 1, updated_at=self.now_utc())
+        )
+        read_after_write.note_written(self.session, [job_id])
+        return result.rowcount == 1
+
+    async def finish(
+        self,
+        job_id: UUID,
+        status: str,
+        result: dict[str, Any] | None = None,
+        error: str | None = None,
+    ) -> None:
+        now = self.now_utc()
+        await self.session.execute(
+            update(ActionJob)
+            .where(ActionJob.id == job_id)
+            .values(status=status, result=result, error=error, updated_at=now, completed_at=now)
+        )
+        read_after_write.note_written(self.session, [job_id])
+
+    async def release(self, job_ids: list[UUID]) -> None:
+        """RUNNING -> PENDING for jobs interrupted before they finished."""
+        if not job_ids:
+            return
+        await self.session.execute(
+            update(ActionJob)
+            .where(ActionJob.id.in_(job_ids), ActionJob.status == JOB_RUNNING)
+            .values(status=JOB_PENDING, updated_at=self.now_utc())
+        )
+        read_after_write.note_written(self.session, job_ids)
+
+    async def requeue_or_fail(self, job_id: UUID, error: str, max_attempts: int) -> bool:
+        """RUNNING -> PENDING after a crash, or FAILED once ``max_attempts`` runs were used.
+
+        Returns True when the job went back to PENDING.
+        """
+        read_after_write.note_written(self.session, [job_id])
+        result = await self.session.execute(
+            update(ActionJob)
+            .where(ActionJob.id == job_id, ActionJob.status == JOB_RUNNING, ActionJob.attempts < max_attempts)
+            .values(status=JOB_PENDING, error=error, updated_at=self.now_utc())
+        )
+        if result.rowcount == 1:
+            return True
+        now = self.now_utc()
+        await self.session.execute(
+            update(ActionJob)
+            .where(ActionJob.id == job_id, ActionJob.status == JOB_RUNNING)
+            .values(status=JOB_FAILED, error=error, updated_at=now, completed_at=now)
+        )
+        return False
+
+    async def fail_exhausted(self, running_before: datetime, max_attempts: int) -> None:
+        """Stale RUNNING jobs that already used ``max_attempts`` runs -> FAILED."""
+        now = self.now_utc()
+        await self.session.execute(
+            update(ActionJob)
+            .where(
+                ActionJob.status == JOB_RUNNING,
+                ActionJob.updated_at < running_before,
+                ActionJob.attempts >= max_attempts,
+            )
+            .values(
+                status=JOB_FAILED,
+                error=f"Abandoned after {max_attempts} attempts",
+                updated_at=now,
+                completed_at=now,
+            )
+        )
+
+    async def get_recoverable_ids(self, running_before: datetime, limit: int) -> list[UUID]:
+        """Pending jobs plus jobs left RUNNING (e.g. by a crashed process) since before ``running_before``."""
+        query = (
+            select(ActionJob.id)
+            .where(
+                or_(
+                    ActionJob.status == JOB_PENDING,
+                    (ActionJob.status == JOB_RUNNING) & (ActionJob.updated_at < running_before),
+                )
+            )
+            .order_by(ActionJob.created_at)
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def commit(self) -> None:
+        await self.session.commit()
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
+
+    @staticmethod
+    def now_utc() -> datetime:
+        return datetime.now(timezone.utc)
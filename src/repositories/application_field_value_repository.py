@@ -0,0 +1,159 @@
+from collections.abc import Collection, Mapping, Sequence
+from typing import Any, NamedTuple
+from uuid import UUID
+
+from sqlalchemy import delete, insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.application_field_value import MAX_INDEXED_VALUE_LENGTH, ApplicationFieldValue
+from src.repositories.utils import chunked
+
+# Two bound parameters per (application_id, section_id) pair.
+_PAIR_CHUNK_SIZE = 250
+# Four bound parameters per row; keeps multi-row VALUES under SQLite's parameter limit.
+_INSERT_CHUNK_SIZE = 200
+_MAX_CODE_POINT = 0x10FFFF
+_SURROGATES = range(0xD800, 0xE000)
+
+
+class SectionFieldValues(NamedTuple):
+    application_id: UUID
+    section_id: str
+    # Current data of the section (or just the changed fields, see replace_fields).
+    data: Mapping[str, Any]
+    indexed_fields: Collection[str]
+
+
+class FieldValueMatch(NamedTuple):
+    application_id: UUID
+    value: str
+
+
+def normalize_field_value(value: Any) -> str | None:
+    """Lookup key of a field value: trimmed, case-folded text; ``None`` when it is not indexed."""
+    if isinstance(value, bool):
+        normalized = "true" if value else "false"
+    elif isinstance(value, int):
+        normalized = str(value)
+    elif isinstance(value, float):
+        normalized = str(int(value)) if value.is_integer() else repr(value)
+    elif isinstance(value, str):
+        normalized = value.strip().casefold()
+    else:
+        return None
+    if not normalized or len(normalized) > MAX_INDEXED_VALUE_LENGTH:
+        return None
+    return normalized
+
+
+def _prefix_upper_bound(prefix: str) -> str | None:
+    """Smallest string above every string starting with ``prefix``, in code point order."""
+    while prefix:
+        code_point = ord(prefix[-1]) + 1
+        if code_point in _SURROGATES:
+            code_point = _SURROGATES.stop
+        if code_point <= _MAX_CODE_POINT:
+            return prefix[:-1] + chr(code_point)
+        prefix = prefix[:-1]
+    return None
+
+
+class ApplicationFieldValueRepository:
+    """Maintains and queries the application_field_values lookup index.
+
+    Writes go through the same session as the section data they mirror, so the
+    index commits (or rolls back) with it. Sections without indexed fields cost
+    no statements at all.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def replace_sections(self, sections: Sequence[SectionFieldValues]) -> None:
+        """Re-index whole sections from their current data."""
+        sections = [section for section in sections if section.indexed_fields]
+        if not sections:
+            return
+        pairs = list(dict.fromkeys((section.application_id, section.section_id) for section in sections))
+        for chunk in chunked(pairs, _PAIR_CHUNK_SIZE):
+            await self.session.execute(
+                delete(ApplicationFieldValue).where(
+                    tuple_(ApplicationFieldValue.application_id, ApplicationFieldValue.section_id).in_(chunk)
+                )
+            )
+        await self._insert(sections)
+
+    async def replace_applications(
+        self,
+        application_ids: Sequence[UUID],
+        sections: Sequence[SectionFieldValues],
+    ) -> None:
+        """Rebuild the whole index of ``application_ids``; fields no longer flagged lose their entries."""
+        for chunk in chunked(application_ids):
+            await self.session.execute(
+                delete(ApplicationFieldValue).where(ApplicationFieldValue.application_id.in_(chunk))
+            )
+        await self._insert(sections)
+
+    async def replace_fields(
+        self,
+        application_id: UUID,
+        section_id: str,
+        updated_fields: Mapping[str, Any],
+        indexed_fields: Collection[str],
+    ) -> None:
+        """Re-index only the ``updated_fields`` of a section; its other entries stay."""
+        field_ids = [field_id for field_id in updated_fields if field_id in indexed_fields]
+        if not field_ids:
+            return
+        await self.session.execute(
+            delete(ApplicationFieldValue).where(
+                ApplicationFieldValue.application_id == application_id,
+                ApplicationFieldValue.section_id == section_id,
+                ApplicationFieldValue.field_id.in_(field_ids),
+            )
+        )
+        await self._insert([SectionFieldValues(application_id, section_id, updated_fields, field_ids)])
+
+    async def find(
+        self,
+        section_id: str,
+        field_id: str,
+        *,
+        value: str | None = None,
+        prefix: str | None = None,
+        limit: int,
+    ) -> list[FieldValueMatch]:
+        """Applications whose normalized value equals ``value`` or starts with ``prefix``."""
+        query = select(ApplicationFieldValue.application_id, ApplicationFieldValue.value).where(
+            ApplicationFieldValue.section_id == section_id,
+            ApplicationFieldValue.field_id == field_id,
+        )
+        if value is not None:
+            query = query.where(ApplicationFieldValue.value == value)
+        elif prefix is not None:
+            # A range rather than LIKE, so both dialects seek the lookup index.
+            query = query.where(ApplicationFieldValue.value >= prefix)
+            upper_bound = _prefix_upper_bound(prefix)
+            if upper_bound is not None:
+                query = query.where(ApplicationFieldValue.value < upper_bound)
+        query = query.order_by(ApplicationFieldValue.value, ApplicationFieldValue.application_id).limit(limit)
+        result = await self.session.execute(query)
+        return [FieldValueMatch(application_id, value) for application_id, value in result.all()]
+
+    async def _insert(self, sections: Sequence[SectionFieldValues]) -> None:
+        rows = []
+        for section in sections:
+            for field_id in section.indexed_fields:
+                value = normalize_field_value(section.data.get(field_id))
+                if value is not None:
+                    rows.append(
+                        {
+                            "application_id": section.application_id,
+                            "section_id": section.section_id,
+                            "field_id": field_id,
+                            "value": value,
+                        }
+                    )
+        for chunk in chunked(rows, _INSERT_CHUNK_SIZE):
+            await self.session.execute(insert(ApplicationFieldValue.__table__).values(list(chunk)))
@@ -3,7 +3,9 @@ from uuid import UUID
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.models.application import Application
 from src.models.application_override import ApplicationOverride
+from src.repositories.utils import bump_data_versions
 
 
 class ApplicationOverrideRepository:
@@ -15,6 +17,15 @@ class ApplicationOverrideRepository:
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_by_rule_version(self, rule_version: str) -> list[ApplicationOverride]:
+        query = (
+            select(ApplicationOverride)
+            .join(Application, Application.id == ApplicationOverride.application_id)
+            .where(Application.rule_version == rule_version)
+        )
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
     async def upsert(self, application_id: UUID, override_patch: dict) -> ApplicationOverride:
         existing = await self.get_by_application_id(application_id)
         if existing is None:
@@ -24,6 +35,7 @@ class ApplicationOverrideRepository:
             existing.override_patch = override_patch
             entity = existing
 
+        await bump_data_versions(self.session, [application_id])
         await self.session.flush()
         await self.session.refresh(entity)
         return entity
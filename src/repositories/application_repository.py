@@ -1,9 +1,79 @@
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, String, cast, exists, func, literal_column, or_, select, tuple_, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
+from src.core import read_after_write
 from src.models.application import Application
+from src.models.application_override import ApplicationOverride
+from src.models.application_section_data import ApplicationSectionData
+from src.repositories.utils import chunked
+
+
+@dataclass(frozen=True, slots=True)
+class ApplicationAggregate:
+    """An application with its override patch and persisted section data, loaded together."""
+
+    application: Application
+    override_patch: dict[str, Any] | None
+    section_data: dict[str, dict[str, Any]]
+
+    @classmethod
+    def from_application(cls, application: Application) -> "ApplicationAggregate":
+        override = application.override
+        return cls(
+            application=application,
+            override_patch=override.override_patch if override is not None else None,
+            section_data={item.section_id: item.data for item in application.section_data},
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ApplicationCompletion:
+    """Application header plus the persisted status of each section; no section payloads."""
+
+    application_id: UUID
+    rule_version: str
+    phase: str
+    override_patch: dict[str, Any] | None
+    # section_id -> (status, status_stamp)
+    section_statuses: dict[str, tuple[str | None, str | None]]
+
+
+@dataclass(frozen=True, slots=True)
+class ApplicationVersion:
+    """Just enough of an application to validate a request and derive its ETag."""
+
+    application_id: UUID
+    rule_version: str
+    phase: str
+    data_version: int
+
+
+@dataclass(frozen=True, slots=True)
+class ApplicationListRow:
+    application_id: UUID
+    rule_version: str
+    phase: str
+    created_at: datetime
+    # Keyset position of this row: (created_at as compared by the database, id).
+    position: tuple[str, UUID]
+
+
+@dataclass(frozen=True, slots=True)
+class FieldFilter:
+    """Applications whose ``section_id`` section stores one of ``values`` in ``field_id``."""
+
+    section_id: str
+    field_id: str
+    # JSON scalars: the value as given, plus the boolean or number it spells, if any.
+    values: tuple[str | bool | int | float, ...]
 
 
 class ApplicationRepository:
@@ -14,15 +84,223 @@ class ApplicationRepository:
         self.session.add(application)
         await self.session.flush()
         await self.session.refresh(application)
+        read_after_write.note_written(self.session, [application.id])
         return application
 
-    async def get_by_id(self, application_id: UUID) -> Application | None:
+    def read_own_writes(self, application_ids: Iterable[UUID]) -> None:
+        """On a read session: use the primary if one of these applications was just written."""
+        read_after_write.route_recent_writes(self.session, application_ids)
+
+    async def get_by_id(self, application_id: UUID, with_override: bool = False) -> Application | None:
         query = select(Application).where(Application.id == application_id)
+        if with_override:
+            query = query.options(joinedload(Application.override))
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_by_ids(self, application_ids: Sequence[UUID]) -> list[Application]:
+        applications: list[Application] = []
+        for chunk in chunked(application_ids):
+            query = select(Application).where(Application.id.in_(chunk))
+            result = await self.session.execute(query)
+            applications.extend(result.scalars().all())
+        return applications
+
+    async def get_version(self, application_id: UUID) -> ApplicationVersion | None:
+        query = select(
+            Application.id,
+            Application.rule_version,
+            Application.phase,
+            Application.data_version,
+        ).where(Application.id == application_id)
+        row = (await self.session.execute(query)).one_or_none()
+        if row is None:
+            return None
+        return ApplicationVersion(
+            application_id=row.id,
+            rule_version=row.rule_version,
+            phase=row.phase,
+            data_version=row.data_version,
+        )
+
+    async def get_aggregate(self, application_id: UUID) -> ApplicationAggregate | None:
+        """Fetch the application, its override and all section data in one round trip."""
+        query = self._aggregate_query().where(Application.id == application_id)
+        result = await self.session.execute(query)
+        application = result.unique().scalar_one_or_none()
+        return None if application is None else ApplicationAggregate.from_application(application)
+
+    async def get_aggregates(self, application_ids: Sequence[UUID]) -> dict[UUID, ApplicationAggregate]:
+        aggregates: dict[UUID, ApplicationAggregate] = {}
+        for chunk in chunked(application_ids):
+            query = self._aggregate_query().where(Application.id.in_(chunk))
+            result = await self.session.execute(query)
+            for application in result.unique().scalars().all():
+                aggregates[application.id] = ApplicationAggregate.from_application(application)
+        return aggregates
+
+    async def get_completion(self, application_id: UUID) -> ApplicationCompletion | None:
+        """Read the application, its override and every section's stored status in one query."""
+        query = (
+            select(
+                Application.id,
+                Application.rule_version,
+                Application.phase,
+                ApplicationOverride.override_patch,
+                ApplicationSectionData.section_id,
+                ApplicationSectionData.status,
+                ApplicationSectionData.status_stamp,
+            )
+            .outerjoin(ApplicationOverride, ApplicationOverride.application_id == Application.id)
+            .outerjoin(ApplicationSectionData, ApplicationSectionData.application_id == Application.id)
+            .where(Application.id == application_id)
+        )
+        rows = (await self.session.execute(query)).all()
+        if not rows:
+            return None
+
+        first = rows[0]
+        return ApplicationCompletion(
+            application_id=first.id,
+            rule_version=first.rule_version,
+            phase=first.phase,
+            override_patch=first.override_patch,
+            section_statuses={
+                row.section_id: (row.status, row.status_stamp)
+                for row in rows
+                if row.section_id is not None
+            },
+        )
+
+    async def get_ids_with_completed_sections(
+        self,
+        rule_version: str,
+        section_ids: Sequence[str],
+        status_stamp: str,
+        application_ids: Sequence[UUID] | None = None,
+        limit: int = 1000,
+    ) -> list[UUID]:
+        """Applications whose given sections are all stored as COMPLETED under ``status_stamp``.
+
+        With ``application_ids=None`` only applications without an override are considered;
+        overridden applications have their own stamp and are queried by id.
+        """
+        if section_ids:
+            query = (
+                select(Application.id)
+                .join(ApplicationSectionData, ApplicationSectionData.application_id == Application.id)
+                .where(
+                    ApplicationSectionData.section_id.in_(section_ids),
+                    ApplicationSectionData.status == "COMPLETED",
+                    ApplicationSectionData.status_stamp == status_stamp,
+                )
+                .group_by(Application.id)
+                .having(func.count() == len(section_ids))
+            )
+        else:
+            query = select(Application.id)
+        query = query.where(Application.rule_version == rule_version).order_by(Application.id).limit(limit)
+
+        if application_ids is None:
+            query = query.where(~exists().where(ApplicationOverride.application_id == Application.id))
+            return list((await self.session.execute(query)).scalars().all())
+
+        found: list[UUID] = []
+        for chunk in chunked(application_ids):
+            result = await self.session.execute(query.where(Application.id.in_(chunk)))
+            found.extend(result.scalars().all())
+        return found[:limit]
+
+    async def list_page(
+        self,
+        limit: int,
+        after: tuple[str, UUID] | None = None,
+        phase: str | None = None,
+        rule_version: str | None = None,
+        field_filter: FieldFilter | None = None,
+    ) -> list[ApplicationListRow]:
+        """Up to ``limit`` applications, newest first, strictly after the ``after`` position.
+
+        Keyset pagination on (created_at, id): every page is an index range scan,
+        however deep it is.
+        """
+        created_key = self._created_at_key()
+        query = select(
+            Application.id,
+            Application.rule_version,
+            Application.phase,
+            Application.created_at,
+            created_key.label("created_key"),
+        )
+        if phase is not None:
+            query = query.where(Application.phase == phase)
+        if rule_version is not None:
+            query = query.where(Application.rule_version == rule_version)
+        if field_filter is not None:
+            matching = select(ApplicationSectionData.application_id).where(
+                ApplicationSectionData.section_id == field_filter.section_id,
+                self._field_in(field_filter.field_id, field_filter.values),
+            )
+            query = query.where(Application.id.in_(matching))
+        if after is not None:
+            position, application_id = after
+            if not self._sqlite():
+                position = datetime.fromisoformat(position)
+            query = query.where(tuple_(created_key, Application.id) < (position, application_id))
+        query = query.order_by(created_key.desc(), Application.id.desc()).limit(limit)
+
+        rows = (await self.session.execute(query)).all()
+        return [
+            ApplicationListRow(
+                application_id=row.id,
+                rule_version=row.rule_version,
+                phase=row.phase,
+                created_at=row.created_at,
+                position=(row.created_key if self._sqlite() else row.created_key.isoformat(), row.id),
+            )
+            for row in rows
+        ]
+
+    def detach(self, application: Application) -> None:
+        """Keep an already-loaded application (with its override and sections) readable across a rollback."""
+        self.session.expunge(application)
+
     async def commit(self) -> None:
         await self.session.commit()
 
     async def rollback(self) -> None:
         await self.session.rollback()
+
+    def _sqlite(self) -> bool:
+        bind = self.session.bind
+        return bind is not None and bind.dialect.name == "sqlite"
+
+    def _created_at_key(self) -> ColumnElement:
+        # SQLite keeps created_at as text with whatever precision it was written in; compare that
+        # text as-is (re-bound datetimes gain microseconds and would never compare equal).
+        if self._sqlite():
+            return type_coerce(Application.created_at, String)
+        return Application.created_at
+
+    def _field_in(self, field_id: str, values: Sequence[str | bool | int | float]) -> ColumnElement:
+        """``data[field_id]`` is one of ``values``, written to match the dialect's field index."""
+        data = ApplicationSectionData.data
+        dialect_name = self.session.bind.dialect.name if self.session.bind is not None else None
+        if dialect_name == "postgresql":
+            return or_(*(cast(data, JSONB).contains({field_id: value}) for value in values))
+        if dialect_name == "sqlite":
+            if not field_id.isidentifier():
+                raise ValueError(f"Invalid field id: {field_id!r}")
+            # A literal path, so the expression matches the field's expression index. JSON true and
+            # false come back as 1 and 0, which is also how booleans are bound.
+            return func.json_extract(data, literal_column(f"""'$."{field_id}"'""")).in_(values)
+        # Other dialects: string values only.
+        return data[field_id].as_string() == values[0]
+
+    @staticmethod
+    def _aggregate_query():
+        # LEFT OUTER JOINs on both relationships keep this a single statement.
+        return select(Application).options(
+            joinedload(Application.override),
+            joinedload(Application.section_data),
+        )
@@ -1,16 +1,44 @@
+import json
+from collections.abc import Collection, Iterable, Sequence
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, NamedTuple
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, cast, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.application_section_data import ApplicationSectionData
+from src.repositories.application_field_value_repository import (
+    ApplicationFieldValueRepository,
+    SectionFieldValues,
+)
+from src.repositories.utils import bump_data_versions, chunked
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE ... RETURNING; others fall back to SELECT + flush.
+_NATIVE_UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+# Six bound parameters per row; keeps multi-row VALUES under SQLite's parameter limit.
+_UPSERT_MANY_CHUNK_SIZE = 150
+
+
+class SectionDataWrite(NamedTuple):
+    application_id: UUID
+    section_id: str
+    data: dict[str, Any]
+    status: str | None = None
+    status_stamp: str | None = None
+    # Fields of the section kept in the field-value lookup index.
+    indexed_fields: frozenset[str] = frozenset()
 
 
 class ApplicationSectionDataRepository:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
+        self.field_values = ApplicationFieldValueRepository(session)
 
     @staticmethod
     def _ensure_uuid(value: str | UUID) -> UUID:
@@ -42,31 +70,124 @@ class ApplicationSectionDataRepository:
         application_id: UUID | str,
         section_id: str,
         data: dict[str, Any],
+        status: str | None = None,
+        status_stamp: str | None = None,
+        indexed_fields: Collection[str] = (),
     ) -> ApplicationSectionData:
         app_id = self._ensure_uuid(application_id)
+        await self.field_values.replace_sections([SectionFieldValues(app_id, section_id, data, indexed_fields)])
+        dialect_insert = self._dialect_insert()
+        if dialect_insert is not None:
+            stmt = dialect_insert(ApplicationSectionData).values(
+                application_id=app_id,
+                section_id=section_id,
+                data=data,
+                status=status,
+                status_stamp=status_stamp,
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[ApplicationSectionData.application_id, ApplicationSectionData.section_id],
+                set_={
+                    "data": stmt.excluded.data,
+                    "status": stmt.excluded.status,
+                    "status_stamp": stmt.excluded.status_stamp,
+                },
+            )
+            await bump_data_versions(self.session, [app_id])
+            return await self._execute_returning(stmt)
+
         existing = await self.get_by_application_and_section(app_id, section_id)
         if existing is None:
             entity = ApplicationSectionData(
                 application_id=app_id,
                 section_id=section_id,
                 data=data,
+                status=status,
+                status_stamp=status_stamp,
             )
             self.session.add(entity)
         else:
             existing.data = data
+            existing.status = status
+            existing.status_stamp = status_stamp
             entity = existing
 
+        await bump_data_versions(self.session, [app_id])
         await self.session.flush()
         await self.session.refresh(entity)
         return entity
 
+    async def upsert_many(self, rows: Sequence[SectionDataWrite]) -> None:
+        """Upsert many section rows in as few statements as possible; later duplicates win."""
+        latest = {(row.application_id, row.section_id): row for row in rows}
+        if not latest:
+            return
+
+        dialect_insert = self._dialect_insert()
+        if dialect_insert is None:
+            for row in latest.values():
+                await self.upsert(
+                    row.application_id,
+                    row.section_id,
+                    row.data,
+                    row.status,
+                    row.status_stamp,
+                    row.indexed_fields,
+                )
+            return
+
+        values = [
+            {
+                "application_id": row.application_id,
+                "section_id": row.section_id,
+                "data": row.data,
+                "status": row.status,
+                "status_stamp": row.status_stamp,
+            }
+            for row in latest.values()
+        ]
+        for chunk in chunked(values, _UPSERT_MANY_CHUNK_SIZE):
+            stmt = dialect_insert(ApplicationSectionData.__table__).values(list(chunk))
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["application_id", "section_id"],
+                set_={
+                    "data": stmt.excluded.data,
+                    "status": stmt.excluded.status,
+                    "status_stamp": stmt.excluded.status_stamp,
+                },
+            )
+            await self.session.execute(stmt)
+        await self.field_values.replace_sections(
+            [
+                SectionFieldValues(row.application_id, row.section_id, row.data, row.indexed_fields)
+                for row in latest.values()
+            ]
+        )
+        await bump_data_versions(self.session, [row.application_id for row in latest.values()])
+
     async def merge_fields(
         self,
         application_id: UUID | str,
         section_id: str,
         updated_fields: dict[str, Any],
+        indexed_fields: Collection[str] = (),
     ) -> ApplicationSectionData:
         app_id = self._ensure_uuid(application_id)
+        await self.field_values.replace_fields(app_id, section_id, updated_fields, indexed_fields)
+        dialect_insert = self._dialect_insert()
+        if dialect_insert is not None and all('"' not in key for key in updated_fields):
+            stmt = dialect_insert(ApplicationSectionData).values(
+                application_id=app_id,
+                section_id=section_id,
+                data=updated_fields,
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[ApplicationSectionData.application_id, ApplicationSectionData.section_id],
+                set_={"data": self._merged_data_expression(stmt.excluded.data, updated_fields)},
+            )
+            await bump_data_versions(self.session, [app_id])
+            return await self._execute_returning(stmt)
+
         existing = await self.get_by_application_and_section(app_id, section_id)
         if existing is None:
             entity = ApplicationSectionData(
@@ -81,10 +202,80 @@ class ApplicationSectionDataRepository:
             existing.data = merged
             entity = existing
 
+        await bump_data_versions(self.session, [app_id])
         await self.session.flush()
         await self.session.refresh(entity)
         return entity
 
+    async def set_status(
+        self,
+        entity: ApplicationSectionData,
+        status: str | None,
+        status_stamp: str | None,
+    ) -> None:
+        if entity.status == status and entity.status_stamp == status_stamp:
+            return
+        entity.status = status
+        entity.status_stamp = status_stamp
+        await self.session.flush()
+
+    async def set_statuses(
+        self,
+        application_id: UUID,
+        statuses: dict[str, str],
+        status_stamp: str,
+    ) -> None:
+        """Overwrite the stored status of existing section rows of one application."""
+        for section_id, status in statuses.items():
+            await self.session.execute(
+                update(ApplicationSectionData)
+                .where(
+                    ApplicationSectionData.application_id == application_id,
+                    ApplicationSectionData.section_id == section_id,
+                )
+                .values(status=status, status_stamp=status_stamp)
+            )
+
+    async def clear_statuses(self, application_id: UUID, section_ids: Iterable[str]) -> None:
+        """Mark stored statuses as unknown; the next submit recomputes them."""
+        section_ids = list(section_ids)
+        if not section_ids:
+            return
+        await self.session.execute(
+            update(ApplicationSectionData)
+            .where(
+                ApplicationSectionData.application_id == application_id,
+                ApplicationSectionData.section_id.in_(section_ids),
+            )
+            .values(status=None, status_stamp=None)
+        )
+
+    def _dialect_insert(self):
+        """Return the dialect's ``insert`` supporting ON CONFLICT, or ``None`` to use the ORM path."""
+        bind = self.session.bind
+        dialect_name = bind.dialect.name if bind is not None else None
+        return _NATIVE_UPSERT_INSERTS.get(dialect_name)
+
+    def _merged_data_expression(self, incoming: ColumnElement, updated_fields: dict[str, Any]) -> ColumnElement:
+        """Shallow-merge ``incoming`` into the stored JSON object inside the database."""
+        current = ApplicationSectionData.data
+        if self.session.bind.dialect.name == "postgresql":
+            return cast(current, JSONB).op("||")(cast(incoming, JSONB))
+
+        # One json_set per top-level key. json_patch (RFC 7396) would merge nested objects
+        # recursively and drop nulls, unlike dict.update and Postgres ||.
+        merged = current
+        for key, value in updated_fields.items():
+            merged = func.json_set(merged, f'$."{key}"', func.json(json.dumps(value)))
+        return merged
+
+    async def _execute_returning(self, stmt) -> ApplicationSectionData:
+        result = await self.session.execute(
+            stmt.returning(ApplicationSectionData),
+            execution_options={"populate_existing": True},
+        )
+        return result.scalar_one()
+
     async def commit(self) -> None:
         await self.session.commit()
 
@@ -0,0 +1,144 @@
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.idempotency_key import IdempotencyKey
+
+# Dialects with INSERT ... ON CONFLICT DO NOTHING; others rely on the primary-key violation.
+_NATIVE_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+# Rows are re-read with populate_existing; skips evaluating WHERE clauses against loaded rows,
+# which on SQLite hold naive datetimes.
+_NO_SYNC = {"synchronize_session": False}
+
+
+class IdempotencyRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def insert(self, key_hash: str, request_hash: str, lease_expires_at: datetime) -> bool:
+        """Claim ``key_hash`` for a new request; False when a row for it already exists."""
+        values = {
+            "key_hash": key_hash,
+            "request_hash": request_hash,
+            "created_at": self.now_utc(),
+            "lease_expires_at": lease_expires_at,
+        }
+        bind = self.session.bind
+        dialect_insert = _NATIVE_INSERTS.get(bind.dialect.name if bind is not None else None)
+        if dialect_insert is not None:
+            stmt = dialect_insert(IdempotencyKey).values(**values).on_conflict_do_nothing(
+                index_elements=[IdempotencyKey.key_hash]
+            )
+            result = await self.session.execute(stmt)
+            return result.rowcount == 1
+
+        try:
+            async with self.session.begin_nested():
+                self.session.add(IdempotencyKey(**values))
+        except IntegrityError:
+            return False
+        return True
+
+    async def take_over(
+        self,
+        key_hash: str,
+        request_hash: str,
+        lease_expires_at: datetime,
+        completed_before: datetime,
+        unleased_before: datetime,
+    ) -> bool:
+        """Reclaim a row whose owner's lease ran out or that is past retention; False when it is still live."""
+        now = self.now_utc()
+        abandoned = or_(
+            IdempotencyKey.lease_expires_at < now,
+            # Claimed before leases existed.
+            IdempotencyKey.lease_expires_at.is_(None) & (IdempotencyKey.created_at < unleased_before),
+        )
+        result = await self.session.execute(
+            update(IdempotencyKey)
+            .where(
+                IdempotencyKey.key_hash == key_hash,
+                or_(
+                    IdempotencyKey.status_code.is_(None) & abandoned,
+                    IdempotencyKey.created_at < completed_before,
+                ),
+            )
+            .values(
+                request_hash=request_hash,
+                status_code=None,
+                response_body=None,
+                response_headers=None,
+                created_at=now,
+                lease_expires_at=lease_expires_at,
+            ),
+            execution_options=_NO_SYNC,
+        )
+        return result.rowcount == 1
+
+    async def renew(self, key_hash: str, lease_expires_at: datetime) -> None:
+        await self.session.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.key_hash == key_hash, IdempotencyKey.status_code.is_(None))
+            .values(lease_expires_at=lease_expires_at),
+            execution_options=_NO_SYNC,
+        )
+
+    async def get(self, key_hash: str) -> IdempotencyKey | None:
+        return await self.session.get(IdempotencyKey, key_hash, populate_existing=True)
+
+    async def complete(
+        self,
+        key_hash: str,
+        status_code: int,
+        response_body: bytes,
+        response_headers: dict[str, Any] | None,
+    ) -> None:
+        await self.session.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.key_hash == key_hash)
+            .values(
+                status_code=status_code,
+                response_body=response_body,
+                response_headers=response_headers,
+                lease_expires_at=None,
+            ),
+            execution_options=_NO_SYNC,
+        )
+
+    async def delete(self, key_hash: str) -> None:
+        await self.session.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.key_hash == key_hash),
+            execution_options=_NO_SYNC,
+        )
+
+    async def purge(self, created_before: datetime, limit: int) -> int:
+        """Delete up to ``limit`` rows older than ``created_before``; returns how many went."""
+        expired = (
+            select(IdempotencyKey.key_hash)
+            .where(IdempotencyKey.created_at < created_before)
+            .limit(limit)
+        )
+        result = await self.session.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.key_hash.in_(expired)),
+            execution_options=_NO_SYNC,
+        )
+        return result.rowcount
+
+    async def commit(self) -> None:
+        await self.session.commit()
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
+
+    @staticmethod
+    def now_utc() -> datetime:
+        return datetime.now(timezone.utc)
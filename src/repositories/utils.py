@@ -0,0 +1,31 @@
+from collections.abc import Iterable, Iterator, Sequence
+from typing import TypeVar
+from uuid import UUID
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core import read_after_write
+from src.models.application import Application
+
+T = TypeVar("T")
+
+# Keeps IN (...) lists well below SQLite's bound-parameter limit.
+IN_CLAUSE_CHUNK_SIZE = 500
+
+
+def chunked(items: Sequence[T], size: int = IN_CLAUSE_CHUNK_SIZE) -> Iterator[Sequence[T]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+async def bump_data_versions(session: AsyncSession, application_ids: Iterable[UUID]) -> None:
+    """Invalidate cached evaluations of the given applications (see Application.data_version)."""
+    unique_ids = list(dict.fromkeys(application_ids))
+    read_after_write.note_written(session, unique_ids)
+    for chunk in chunked(unique_ids):
+        await session.execute(
+            update(Application)
+            .where(Application.id.in_(chunk))
+            .values(data_version=Application.data_version + 1)
+        )
@@ -1,15 +1,81 @@
-from fastapi import APIRouter, Depends
+from uuid import UUID
 
-from src.schemas.action import ActionRequest, ActionResponse
+from fastapi import APIRouter, Depends, Header, Response, status
+from fastapi.responses import JSONResponse
+
+from src.core.read_after_write import mark_write
+from src.schemas.action import (
+    ActionAndEvaluateRequest,
+    ActionAndEvaluateResponse,
+    ActionJobResponse,
+    ActionRequest,
+    ActionResponse,
+    BatchActionRequest,
+    BatchActionResponse,
+)
 from src.services.action_service import ActionService
-from src.services.dependencies import get_action_service
+from src.services.dependencies import get_action_service, get_read_action_service, get_request_idempotency
+from src.services.idempotency import RequestIdempotency
 
 router = APIRouter(tags=["action"])
 
 
-@router.post("/action", response_model=ActionResponse)
+@router.post(
+    "/action",
+    response_model=ActionResponse,
+    responses={status.HTTP_202_ACCEPTED: {"model": ActionJobResponse}},
+    dependencies=[Depends(mark_write)],
+)
 async def action(
     request: ActionRequest,
+    prefer: str | None = Header(default=None),
+    idempotency_key: str | None = Header(default=None),
+    service: ActionService = Depends(get_action_service),
+    idempotency: RequestIdempotency = Depends(get_request_idempotency),
+) -> ActionResponse | Response:
+    # RFC 7240: "Prefer: respond-async" queues the action and returns its job for polling.
+    if prefer is not None and "respond-async" in prefer.lower():
+        return await idempotency.run("action-async", idempotency_key, request, lambda: _submit_job(service, request))
+    return await idempotency.run("action", idempotency_key, request, lambda: service.execute(request))
+
+
+@router.post("/action/batch", response_model=BatchActionResponse, dependencies=[Depends(mark_write)])
+async def action_batch(
+    request: BatchActionRequest,
+    idempotency_key: str | None = Header(default=None),
+    service: ActionService = Depends(get_action_service),
+    idempotency: RequestIdempotency = Depends(get_request_idempotency),
+) -> BatchActionResponse | Response:
+    return await idempotency.run("action-batch", idempotency_key, request, lambda: service.execute_batch(request))
+
+
+@router.post("/action/evaluate", response_model=ActionAndEvaluateResponse, dependencies=[Depends(mark_write)])
+async def action_and_evaluate(
+    request: ActionAndEvaluateRequest,
+    idempotency_key: str | None = Header(default=None),
     service: ActionService = Depends(get_action_service),
-) -> ActionResponse:
-    return await service.execute(request)
+    idempotency: RequestIdempotency = Depends(get_request_idempotency),
+) -> Response:
+    """Run the action and return the application's evaluation in the same response."""
+
+    async def handler() -> Response:
+        return Response(content=await service.execute_and_evaluate(request), media_type="application/json")
+
+    return await idempotency.run("action-evaluate", idempotency_key, request, handler)
+
+
+@router.get("/action/{job_id}", response_model=ActionJobResponse)
+async def action_job(
+    job_id: UUID,
+    service: ActionService = Depends(get_read_action_service),
+) -> ActionJobResponse:
+    return await service.get_job(job_id)
+
+
+async def _submit_job(service: ActionService, request: ActionRequest) -> JSONResponse:
+    job = await service.submit_job(request)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=job.model_dump(mode="json"),
+        headers={"Location": f"/action/{job.jobId}"},
+    )
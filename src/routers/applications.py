@@ -1,14 +1,77 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 
-from src.schemas.application import CreateApplicationResponse
+from src.core.read_after_write import mark_write
+from src.schemas.application import (
+    ApplicationListResponse,
+    CreateApplicationResponse,
+    FieldValueLookupResponse,
+)
+from src.schemas.submit import SubmittableApplicationsResponse
 from src.services.application_service import ApplicationService
-from src.services.dependencies import get_application_service
+from src.services.dependencies import (
+    get_application_service,
+    get_field_lookup_service,
+    get_read_application_service,
+    get_read_submit_service,
+)
+from src.services.field_lookup_service import FieldLookupService
+from src.services.submit_service import SubmitService
 
 router = APIRouter(prefix="/applications", tags=["applications"])
 
 
-@router.post("", response_model=CreateApplicationResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "",
+    response_model=CreateApplicationResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(mark_write)],
+)
 async def create_application(
     service: ApplicationService = Depends(get_application_service),
 ) -> CreateApplicationResponse:
     return await service.create_application()
+
+
+@router.get("", response_model=ApplicationListResponse)
+async def list_applications(
+    phase: str | None = Query(None),
+    ruleVersion: str | None = Query(None),
+    sectionId: str | None = Query(None),
+    fieldId: str | None = Query(None, pattern=r"^[A-Za-z_][A-Za-z0-9_]*$"),
+    fieldValue: str | None = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = Query(None),
+    service: ApplicationService = Depends(get_read_application_service),
+) -> ApplicationListResponse:
+    """Applications newest first, one keyset page at a time; follow `nextCursor` for older ones."""
+    return await service.list_applications(
+        limit=limit,
+        cursor=cursor,
+        phase=phase,
+        rule_version=ruleVersion,
+        section_id=sectionId,
+        field_id=fieldId,
+        field_value=fieldValue,
+    )
+
+
+@router.get("/field-lookup", response_model=FieldValueLookupResponse)
+async def lookup_field_value(
+    sectionId: str = Query(...),
+    fieldId: str = Query(...),
+    value: str | None = Query(None),
+    prefix: str | None = Query(None),
+    limit: int = Query(100, ge=1, le=1000),
+    service: FieldLookupService = Depends(get_field_lookup_service),
+) -> FieldValueLookupResponse:
+    """Applications whose indexed field equals `value` or starts with `prefix` (case-insensitive)."""
+    return await service.lookup(sectionId, fieldId, limit, value=value, prefix=prefix)
+
+
+@router.get("/submittable", response_model=SubmittableApplicationsResponse)
+async def list_submittable_applications(
+    ruleVersion: str = Query(...),
+    limit: int = Query(1000, ge=1, le=10000),
+    service: SubmitService = Depends(get_read_submit_service),
+) -> SubmittableApplicationsResponse:
+    return await service.list_submittable(ruleVersion, limit)
@@ -1,15 +1,46 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Response, status
+from fastapi.responses import StreamingResponse
 
-from src.schemas.evaluate import EvaluateRequest, EvaluateResponse
+from src.schemas.evaluate import BatchEvaluateRequest, EvaluateRequest, EvaluateResponse, EvaluateValuesResponse
 from src.services.dependencies import get_evaluate_service
-from src.services.evaluate_service import EvaluateService
+from src.services.evaluate_service import EvaluateService, EvaluationResult
 
 router = APIRouter(tags=["evaluate"])
 
+_NOT_MODIFIED = {status.HTTP_304_NOT_MODIFIED: {"description": "Evaluation unchanged since If-None-Match"}}
 
-@router.post("/evaluate", response_model=EvaluateResponse)
+
+@router.post("/evaluate", response_model=EvaluateResponse, responses=_NOT_MODIFIED)
 async def evaluate(
     request: EvaluateRequest,
+    if_none_match: str | None = Header(default=None),
+    service: EvaluateService = Depends(get_evaluate_service),
+) -> Response:
+    return _evaluation_response(await service.evaluate(request, if_none_match))
+
+
+@router.post("/evaluate/values", response_model=EvaluateValuesResponse, responses=_NOT_MODIFIED)
+async def evaluate_values(
+    request: EvaluateRequest,
+    if_none_match: str | None = Header(default=None),
     service: EvaluateService = Depends(get_evaluate_service),
-) -> EvaluateResponse:
-    return await service.evaluate(request)
+) -> Response:
+    """Lean evaluate: values, effective flags and statuses; metadata via GET /rules/{ruleVersion}."""
+    return _evaluation_response(await service.evaluate(request, if_none_match, values_only=True))
+
+
+@router.post("/evaluate/batch", response_class=StreamingResponse)
+async def evaluate_batch(
+    request: BatchEvaluateRequest,
+    service: EvaluateService = Depends(get_evaluate_service),
+) -> StreamingResponse:
+    """Stream one BatchEvaluateItem per line (NDJSON), in request order."""
+    lines = await service.evaluate_batch(request)
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
+def _evaluation_response(result: EvaluationResult) -> Response:
+    headers = {"ETag": result.etag, "Cache-Control": "private, no-cache"}
+    if result.body is None:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=result.body, media_type="application/json", headers=headers)
@@ -0,0 +1,32 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from src.services.action_job_runner import ActionJobRunner, get_action_job_runner
+from src.services.action_result_cache import ActionResultCache, get_action_result_cache
+from src.services.draft_write_coalescer import DraftWriteCoalescer, get_draft_write_coalescer
+from src.services.evaluation_cache import EvaluationCacheBackend, get_evaluation_cache
+from src.services.idempotency import IdempotencyStore, get_idempotency_store
+from src.services.rule_registry import RuleRegistry, get_rule_registry
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics")
+async def metrics(
+    rule_registry: RuleRegistry = Depends(get_rule_registry),
+    write_coalescer: DraftWriteCoalescer | None = Depends(get_draft_write_coalescer),
+    evaluation_cache: EvaluationCacheBackend | None = Depends(get_evaluation_cache),
+    job_runner: ActionJobRunner = Depends(get_action_job_runner),
+    action_cache: ActionResultCache | None = Depends(get_action_result_cache),
+    idempotency_store: IdempotencyStore = Depends(get_idempotency_store),
+) -> dict[str, Any]:
+    return {
+        "ruleVersions": rule_registry.versions(),
+        "overrideOverlayCache": rule_registry.overlay_cache.stats().as_dict(),
+        "draftWriteCoalescer": write_coalescer.stats() if write_coalescer is not None else None,
+        "evaluationCache": evaluation_cache.stats() if evaluation_cache is not None else None,
+        "actionJobs": job_runner.stats(),
+        "actionCache": action_cache.stats() if action_cache is not None else None,
+        "idempotency": idempotency_store.stats(),
+    }
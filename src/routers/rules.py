@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+
+from src.schemas.rules import RuleSchemaResponse
+from src.services.dependencies import get_rule_service
+from src.services.evaluation_cache import etag_matches
+from src.services.rule_service import RuleService
+
+router = APIRouter(tags=["rules"])
+
+# Content fetched by hash never changes; a year is the conventional "forever".
+_IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@router.get(
+    "/rules/{rule_version}",
+    response_model=RuleSchemaResponse,
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Schema unchanged since If-None-Match"}},
+)
+async def get_rule_schema(
+    rule_version: str,
+    schemaHash: str | None = Query(default=None, description="Pin the request to this content hash"),
+    if_none_match: str | None = Header(default=None),
+    rule_service: RuleService = Depends(get_rule_service),
+) -> Response:
+    """Static field/section metadata of a rule version.
+
+    Requests pinned with ``schemaHash`` (as referenced by POST /evaluate/values)
+    are cacheable forever; unpinned requests must revalidate, since a rule
+    version can be hot-reloaded.
+    """
+    digest, body = rule_service.rule_schema(rule_version, schemaHash)
+    etag = f'"{digest}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": _IMMUTABLE_CACHE_CONTROL if schemaHash else "public, no-cache",
+    }
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
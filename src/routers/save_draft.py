@@ -1,15 +1,52 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Response
 
-from src.schemas.save_draft import SaveDraftRequest, SaveDraftResponse
-from src.services.dependencies import get_save_draft_service
+from src.core.read_after_write import mark_write
+from src.schemas.save_draft import (
+    BulkSaveDraftRequest,
+    BulkSaveDraftResponse,
+    SaveAndEvaluateRequest,
+    SaveAndEvaluateResponse,
+    SaveDraftRequest,
+    SaveDraftResponse,
+)
+from src.services.dependencies import get_request_idempotency, get_save_draft_service
+from src.services.idempotency import RequestIdempotency
 from src.services.save_draft_service import SaveDraftService
 
 router = APIRouter(tags=["save-draft"])
 
 
-@router.post("/save-draft", response_model=SaveDraftResponse)
+@router.post("/save-draft", response_model=SaveDraftResponse, dependencies=[Depends(mark_write)])
 async def save_draft(
     request: SaveDraftRequest,
+    idempotency_key: str | None = Header(default=None),
     service: SaveDraftService = Depends(get_save_draft_service),
-) -> SaveDraftResponse:
-    return await service.save(request)
+    idempotency: RequestIdempotency = Depends(get_request_idempotency),
+) -> SaveDraftResponse | Response:
+    return await idempotency.run("save-draft", idempotency_key, request, lambda: service.save(request))
+
+
+@router.post("/save-draft/bulk", response_model=BulkSaveDraftResponse, dependencies=[Depends(mark_write)])
+async def save_draft_bulk(
+    request: BulkSaveDraftRequest,
+    idempotency_key: str | None = Header(default=None),
+    service: SaveDraftService = Depends(get_save_draft_service),
+    idempotency: RequestIdempotency = Depends(get_request_idempotency),
+) -> BulkSaveDraftResponse | Response:
+    """Save many sections, of one or many applications, in one transaction with per-item results."""
+    return await idempotency.run("save-draft-bulk", idempotency_key, request, lambda: service.save_bulk(request))
+
+
+@router.post("/save-draft/evaluate", response_model=SaveAndEvaluateResponse, dependencies=[Depends(mark_write)])
+async def save_draft_and_evaluate(
+    request: SaveAndEvaluateRequest,
+    idempotency_key: str | None = Header(default=None),
+    service: SaveDraftService = Depends(get_save_draft_service),
+    idempotency: RequestIdempotency = Depends(get_request_idempotency),
+) -> Response:
+    """Save the draft and return the application's evaluation in the same response."""
+
+    async def handler() -> Response:
+        return Response(content=await service.save_and_evaluate(request), media_type="application/json")
+
+    return await idempotency.run("save-draft-evaluate", idempotency_key, request, handler)
@@ -1,15 +1,19 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Response
 
+from src.core.read_after_write import mark_write
 from src.schemas.submit import SubmitRequest, SubmitResponse
-from src.services.dependencies import get_submit_service
+from src.services.dependencies import get_request_idempotency, get_submit_service
+from src.services.idempotency import RequestIdempotency
 from src.services.submit_service import SubmitService
 
 router = APIRouter(tags=["submit"])
 
 
-@router.post("/submit", response_model=SubmitResponse)
+@router.post("/submit", response_model=SubmitResponse, dependencies=[Depends(mark_write)])
 async def submit(
     request: SubmitRequest,
+    idempotency_key: str | None = Header(default=None),
     service: SubmitService = Depends(get_submit_service),
-) -> SubmitResponse:
-    return await service.submit(request)
+    idempotency: RequestIdempotency = Depends(get_request_idempotency),
+) -> SubmitResponse | Response:
+    return await idempotency.run("submit", idempotency_key, request, lambda: service.submit(request))
@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Depends
+
+from src.schemas.validation import BatchValidateRequest, BatchValidateResponse
+from src.services.dependencies import get_validation_service
+from src.services.validation_service import ValidationService
+
+router = APIRouter(tags=["validate"])
+
+
+@router.post("/validate/batch", response_model=BatchValidateResponse)
+async def validate_batch(
+    request: BatchValidateRequest,
+    service: ValidationService = Depends(get_validation_service),
+) -> BatchValidateResponse:
+    return await service.validate_batch(request)
@@ -1,7 +1,10 @@
+from datetime import datetime
 from typing import Any
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, conlist
+
+from src.schemas.evaluate import EvaluateResponse
 
 
 class ActionRequest(BaseModel):
@@ -19,3 +22,59 @@ class ActionResponse(BaseModel):
     message: str
 
     model_config = ConfigDict(extra="forbid")
+
+
+class ActionAndEvaluateRequest(ActionRequest):
+    # Token from a previous evaluation; when still valid only changed sections are returned.
+    evaluationToken: str | None = None
+
+
+class ActionAndEvaluateResponse(ActionResponse):
+    # The application evaluated right after the action's updates were written.
+    evaluation: EvaluateResponse
+
+
+class ActionItem(BaseModel):
+    actionId: str
+    payload: dict[str, Any]
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class BatchActionRequest(BaseModel):
+    applicationId: UUID
+    actions: conlist(ActionItem, min_length=1, max_length=16)
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class ActionResult(BaseModel):
+    actionId: str
+    success: bool
+    updatedFields: dict[str, Any]
+    fieldLocks: list[str]
+    message: str
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class BatchActionResponse(BaseModel):
+    # True only when every action succeeded.
+    success: bool
+    results: list[ActionResult]
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class ActionJobResponse(BaseModel):
+    jobId: UUID
+    applicationId: UUID
+    actionId: str
+    # PENDING | RUNNING | COMPLETED | FAILED
+    status: str
+    result: ActionResponse | None = None
+    error: str | None = None
+    createdAt: datetime
+    completedAt: datetime | None = None
+
+    model_config = ConfigDict(extra="forbid")
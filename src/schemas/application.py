@@ -1,8 +1,46 @@
+from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class CreateApplicationResponse(BaseModel):
     applicationId: UUID
     ruleVersion: str
+
+
+class ApplicationSummary(BaseModel):
+    applicationId: UUID
+    ruleVersion: str
+    phase: str
+    createdAt: datetime
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class ApplicationListResponse(BaseModel):
+    # Newest first.
+    applications: list[ApplicationSummary]
+    # Pass as `cursor` to get the next (older) page; None on the last page.
+    nextCursor: str | None = None
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class FieldValueMatch(BaseModel):
+    applicationId: UUID
+    # Normalized (trimmed, case-folded) value as indexed.
+    value: str
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class FieldValueLookupResponse(BaseModel):
+    sectionId: str
+    fieldId: str
+    # Ordered by value, then applicationId.
+    matches: list[FieldValueMatch]
+    # True when more matches exist than `limit`.
+    truncated: bool
+
+    model_config = ConfigDict(extra="forbid")
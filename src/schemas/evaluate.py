@@ -1,7 +1,9 @@
 from typing import Any
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, conlist
+
+from src.schemas.validation import FieldError
 
 
 class EvaluateRequest(BaseModel):
@@ -9,6 +11,8 @@ class EvaluateRequest(BaseModel):
     phase: str
     context: dict[str, Any]
     sectionData: dict[str, Any]
+    # Token from a previous response; when still valid only changed sections are returned.
+    evaluationToken: str | None = None
 
     model_config = ConfigDict(extra="forbid")
 
@@ -49,5 +53,64 @@ class EvaluateResponse(BaseModel):
     phase: str
     sections: list[Section]
     actions: list[Action]
+    evaluationToken: str | None = None
+    # True when `sections` only holds the sections that changed since `evaluationToken`.
+    incremental: bool = False
+    # Rule `validation` failures of visible fields, across all sections (also when incremental).
+    validationErrors: list[FieldError] = []
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class FieldFlags(BaseModel):
+    mandatory: bool
+    editable: bool
+    visible: bool
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class SectionValues(BaseModel):
+    sectionId: str
+    mandatory: bool
+    editable: bool
+    visible: bool
+    status: str
+    # Only fields that hold a value; absent fields are null.
+    values: dict[str, Any]
+    # Only fields whose effective flags differ from the rule schema defaults.
+    fieldFlags: dict[str, FieldFlags]
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class EvaluateValuesResponse(BaseModel):
+    """Values, effective flags and statuses only; static metadata lives in GET /rules/{ruleVersion}."""
+
+    ruleVersion: str
+    schemaHash: str
+    applicationId: UUID
+    phase: str
+    sections: list[SectionValues]
+    evaluationToken: str | None = None
+    incremental: bool = False
+    validationErrors: list[FieldError] = []
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class BatchEvaluateRequest(BaseModel):
+    applicationIds: conlist(UUID, min_length=1, max_length=1000)
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class BatchEvaluateItem(BaseModel):
+    """One line of the NDJSON stream returned by POST /evaluate/batch."""
+
+    applicationId: UUID
+    statusCode: int
+    result: EvaluateResponse | None = None
+    error: str | None = None
 
     model_config = ConfigDict(extra="forbid")
@@ -0,0 +1,44 @@
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict
+
+from src.schemas.evaluate import Action
+
+
+class FieldSchema(BaseModel):
+    fieldId: str
+    type: str
+    mandatory: bool
+    editable: bool
+    visible: bool
+    # Expressions that replace the static flag above once evaluated against the data.
+    mandatoryWhen: str | None = None
+    editableWhen: str | None = None
+    visibleWhen: str | None = None
+    validation: dict[str, Any]
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class SectionSchema(BaseModel):
+    sectionId: str
+    mandatory: bool
+    editable: bool
+    visible: bool
+    mandatoryWhen: str | None = None
+    editableWhen: str | None = None
+    visibleWhen: str | None = None
+    fields: list[FieldSchema]
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class RuleSchemaResponse(BaseModel):
+    """Static metadata of one rule version; flags are the defaults before overrides."""
+
+    ruleVersion: str
+    schemaHash: str
+    sections: list[SectionSchema]
+    actions: list[Action]
+
+    model_config = ConfigDict(extra="forbid")
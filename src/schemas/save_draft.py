@@ -2,7 +2,10 @@ from datetime import datetime
 from typing import Any
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, conlist
+
+from src.schemas.evaluate import EvaluateResponse
+from src.schemas.validation import FieldError
 
 
 class SaveDraftRequest(BaseModel):
@@ -18,3 +21,42 @@ class SaveDraftResponse(BaseModel):
     timestamp: datetime
 
     model_config = ConfigDict(extra="forbid")
+
+
+class SaveAndEvaluateRequest(SaveDraftRequest):
+    # Token from a previous evaluation; when still valid only changed sections are returned.
+    evaluationToken: str | None = None
+
+
+class SaveAndEvaluateResponse(SaveDraftResponse):
+    # The application evaluated right after the write, as POST /evaluate would return it.
+    evaluation: EvaluateResponse
+
+
+class BulkSaveDraftRequest(BaseModel):
+    # Sections of one or many applications; each (applicationId, sectionId) at most once.
+    items: conlist(SaveDraftRequest, min_length=1, max_length=500)
+    # When true nothing is written unless every item is valid.
+    atomic: bool = False
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class BulkSaveDraftResult(BaseModel):
+    applicationId: UUID
+    sectionId: str
+    statusCode: int
+    errors: list[FieldError] = []
+    error: str | None = None
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class BulkSaveDraftResponse(BaseModel):
+    # True only when every item was saved.
+    success: bool
+    # Commit time of the saved items; None when nothing was written.
+    timestamp: datetime | None
+    results: list[BulkSaveDraftResult]
+
+    model_config = ConfigDict(extra="forbid")
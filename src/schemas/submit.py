@@ -2,6 +2,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict
 
+from src.schemas.validation import FieldError
+
 
 class SubmitRequest(BaseModel):
     applicationId: UUID
@@ -13,5 +15,13 @@ class SubmitResponse(BaseModel):
     success: bool
     nextPhase: str | None = None
     missingMandatorySections: list[str] | None = None
+    validationErrors: list[FieldError] | None = None
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class SubmittableApplicationsResponse(BaseModel):
+    ruleVersion: str
+    applicationIds: list[UUID]
 
     model_config = ConfigDict(extra="forbid")
@@ -0,0 +1,33 @@
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, conlist
+
+
+class FieldError(BaseModel):
+    sectionId: str
+    fieldId: str
+    messages: list[str]
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class BatchValidateRequest(BaseModel):
+    applicationIds: conlist(UUID, min_length=1, max_length=1000)
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class BatchValidateItem(BaseModel):
+    applicationId: UUID
+    statusCode: int
+    valid: bool | None = None
+    errors: list[FieldError] = []
+    error: str | None = None
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class BatchValidateResponse(BaseModel):
+    results: list[BatchValidateItem]
+
+    model_config = ConfigDict(extra="forbid")
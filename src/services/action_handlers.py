@@ -0,0 +1,103 @@
+"""Built-in (mock) action handlers.
+
+These stand in for the external verification providers. Input formats come
+from the rule version's validation of the trigger field, so a rule change
+does not need a code change here.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from src.services.action_registry import ActionContext, ActionOutcome, ActionRegistry, PayloadNormalizer
+
+_KYC_SECTION_ID = "KYC"
+_EMPLOYMENT_SECTION_ID = "EMPLOYMENT"
+
+
+def _payload_value(payload: dict[str, Any], key: str) -> str:
+    return str(payload.get(key, "")).upper().strip()
+
+
+def _identifier_normalizer(*keys: str) -> PayloadNormalizer:
+    # Handlers read these identifiers case-insensitively (see _payload_value).
+    def normalize(payload: dict[str, Any]) -> dict[str, Any]:
+        return {key: _payload_value(payload, key) for key in keys}
+
+    return normalize
+
+
+def _invalid(context: ActionContext, value: str) -> bool:
+    return context.trigger_field is not None and bool(context.trigger_field.validate(value))
+
+
+async def verify_pan(context: ActionContext) -> ActionOutcome:
+    pan_number = _payload_value(context.payload, "panNumber")
+    if not pan_number:
+        return ActionOutcome(False, {"panVerified": False}, [], "PAN number missing in payload")
+    if _invalid(context, pan_number):
+        return ActionOutcome(False, {"panVerified": False}, [], "PAN format invalid")
+    return ActionOutcome(
+        success=True,
+        updated_fields={"panVerified": True, "panHolderName": "VERIFIED USER"},
+        field_locks=["panNumber", "panVerified"],
+        message="PAN verified successfully",
+    )
+
+
+async def verify_aadhaar(context: ActionContext) -> ActionOutcome:
+    aadhaar_number = _payload_value(context.payload, "aadhaarNumber")
+    if not aadhaar_number:
+        return ActionOutcome(False, {"aadhaarVerified": False}, [], "Aadhaar number missing in payload")
+    if _invalid(context, aadhaar_number):
+        return ActionOutcome(False, {"aadhaarVerified": False}, [], "Aadhaar format invalid")
+    return ActionOutcome(
+        success=True,
+        updated_fields={"aadhaarVerified": True},
+        field_locks=["aadhaarNumber", "aadhaarVerified"],
+        message="Aadhaar verified successfully",
+    )
+
+
+async def pull_bureau(context: ActionContext) -> ActionOutcome:
+    pan_number = _payload_value(context.payload, "panNumber")
+    if not pan_number or _invalid(context, pan_number):
+        return ActionOutcome(False, {}, [], "A valid PAN number is required for a bureau pull")
+    # Deterministic mock score in the usual 300-900 range.
+    score = 300 + sum(map(ord, pan_number)) % 601
+    return ActionOutcome(
+        success=True,
+        updated_fields={"bureauScore": score},
+        field_locks=["bureauScore"],
+        message="Bureau report fetched",
+    )
+
+
+async def fetch_bank_statement(context: ActionContext) -> ActionOutcome:
+    account_number = _payload_value(context.payload, "bankAccountNumber")
+    if not account_number or _invalid(context, account_number):
+        return ActionOutcome(False, {}, [], "A valid bank account number is required")
+    average_credit = 20000 + sum(map(ord, account_number)) * 37 % 80000
+    return ActionOutcome(
+        success=True,
+        updated_fields={"averageMonthlyCredit": average_credit},
+        field_locks=["averageMonthlyCredit"],
+        message="Bank statement fetched",
+    )
+
+
+def register_default_handlers(registry: ActionRegistry) -> None:
+    registry.register("VERIFY_PAN", verify_pan, _KYC_SECTION_ID, normalize=_identifier_normalizer("panNumber"))
+    registry.register(
+        "VERIFY_AADHAAR",
+        verify_aadhaar,
+        _KYC_SECTION_ID,
+        normalize=_identifier_normalizer("aadhaarNumber"),
+    )
+    registry.register("PULL_BUREAU", pull_bureau, _KYC_SECTION_ID, normalize=_identifier_normalizer("panNumber"))
+    registry.register(
+        "FETCH_BANK_STATEMENT",
+        fetch_bank_statement,
+        _EMPLOYMENT_SECTION_ID,
+        normalize=_identifier_normalizer("bankAccountNumber"),
+    )
@@ -0,0 +1,213 @@
+"""Bounded in-process worker pool for background action jobs.
+
+The ``action_jobs`` table is the durable queue; the in-memory queue only
+holds ids. A worker claims a job with a conditional PENDING -> RUNNING
+update, so a job id queued twice (or recovered by two processes) still runs
+once per claim. A job whose handler raises goes back to PENDING and is run
+again, until it has used ``max_attempts`` runs and is marked FAILED. On start,
+and every ``stale_after_seconds`` after that, the runner re-queues pending
+jobs and jobs left RUNNING for longer than that (a process died mid-job); on
+shutdown it releases the jobs it was running back to PENDING. Execution is
+therefore at-least-once, which the merge-style field updates of actions
+tolerate.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+from functools import lru_cache
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.config import get_settings
+from src.core.database import AsyncSessionLocal
+from src.repositories.action_job_repository import ActionJobRepository
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[AsyncSession, UUID], Awaitable[None]]
+
+
+class ActionJobRunner:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        run_job: JobHandler,
+        workers: int = 4,
+        stale_after_seconds: float = 300.0,
+        recover_limit: int = 10000,
+        max_attempts: int = 3,
+    ) -> None:
+        if workers <= 0:
+            raise ValueError("workers must be positive")
+        if max_attempts <= 0:
+            raise ValueError("max_attempts must be positive")
+        self.session_factory = session_factory
+        self.run_job = run_job
+        self.workers = workers
+        self.stale_after_seconds = stale_after_seconds
+        self.recover_limit = recover_limit
+        self.max_attempts = max_attempts
+        self._queue: asyncio.Queue[UUID] | None = None
+        self._tasks: list[asyncio.Task[None]] = []
+        # Ids in the queue, so a sweep does not queue them again.
+        self._queued: set[UUID] = set()
+        self._in_flight: set[UUID] = set()
+
+        self._jobs_enqueued = 0
+        self._jobs_recovered = 0
+        self._jobs_run = 0
+        self._jobs_crashed = 0
+        self._jobs_failed = 0
+
+    async def start(self) -> None:
+        """Start the workers and re-queue unfinished jobs; later calls are no-ops."""
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        await self._recover()
+        self._tasks.append(asyncio.create_task(self._sweep()))
+
+    async def enqueue(self, job_id: UUID) -> None:
+        await self.start()
+        self._put(job_id)
+        self._jobs_enqueued += 1
+
+    async def close(self) -> None:
+        """Stop the workers; jobs they were running go back to PENDING for the next start."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        self._queued.clear()
+
+        interrupted = list(self._in_flight)
+        self._in_flight.clear()
+        if interrupted:
+            async with self.session_factory() as session:
+                repository = ActionJobRepository(session)
+                await repository.release(interrupted)
+                await repository.commit()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "inFlight": len(self._in_flight),
+            "jobsEnqueued": self._jobs_enqueued,
+            "jobsRecovered": self._jobs_recovered,
+            "jobsRun": self._jobs_run,
+            "jobsCrashed": self._jobs_crashed,
+            "jobsFailed": self._jobs_failed,
+        }
+
+    def _put(self, job_id: UUID) -> None:
+        assert self._queue is not None
+        if job_id not in self._queued:
+            self._queued.add(job_id)
+            self._queue.put_nowait(job_id)
+
+    async def _sweep(self) -> None:
+        while True:
+            await asyncio.sleep(self.stale_after_seconds)
+            await self._recover()
+
+    async def _recover(self) -> None:
+        try:
+            async with self.session_factory() as session:
+                repository = ActionJobRepository(session)
+                running_before = repository.now_utc() - timedelta(seconds=self.stale_after_seconds)
+                await repository.fail_exhausted(running_before, self.max_attempts)
+                job_ids = await repository.get_recoverable_ids(running_before, self.recover_limit)
+                # Jobs this process is running (however long) or has queued are not lost.
+                job_ids = [
+                    job_id for job_id in job_ids if job_id not in self._in_flight and job_id not in self._queued
+                ]
+                await repository.release(job_ids)
+                await repository.commit()
+        except Exception as exc:
+            logger.warning("Could not recover unfinished action jobs: %s", exc)
+            return
+
+        for job_id in job_ids:
+            self._put(job_id)
+        self._jobs_recovered += len(job_ids)
+        if job_ids:
+            logger.info("Re-queued %d unfinished action jobs", len(job_ids))
+
+    async def _requeue_or_fail(self, job_id: UUID, exc: Exception) -> None:
+        try:
+            async with self.session_factory() as session:
+                repository = ActionJobRepository(session)
+                retry = await repository.requeue_or_fail(job_id, f"Action job crashed: {exc}"[:512], self.max_attempts)
+                await repository.commit()
+        except Exception as bookkeeping_exc:
+            # Left RUNNING; the next sweep picks it up once it is stale.
+            logger.warning("Could not release crashed action job %s: %s", job_id, bookkeeping_exc)
+            return
+        if retry:
+            self._put(job_id)
+        else:
+            self._jobs_failed += 1
+
+    async def _work(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            job_id = await queue.get()
+            self._queued.discard(job_id)
+            self._in_flight.add(job_id)
+            try:
+                async with self.session_factory() as session:
+                    await self.run_job(session, job_id)
+                self._jobs_run += 1
+            except asyncio.CancelledError:
+                # Left in _in_flight so close() releases the job.
+                raise
+            except Exception as exc:
+                self._jobs_crashed += 1
+                logger.error("Action job %s crashed: %s", job_id, exc, exc_info=True)
+                self._in_flight.discard(job_id)
+                await self._requeue_or_fail(job_id, exc)
+            self._in_flight.discard(job_id)
+            queue.task_done()
+
+
+async def _run_action_job(session: AsyncSession, job_id: UUID) -> None:
+    # Imported here: the action service itself enqueues through this module.
+    from src.repositories.application_repository import ApplicationRepository
+    from src.repositories.application_section_data_repository import ApplicationSectionDataRepository
+    from src.services.action_registry import get_action_registry
+    from src.services.action_result_cache import get_action_result_cache
+    from src.services.action_service import ActionService
+    from src.services.rule_registry import get_rule_registry
+    from src.services.rule_service import RuleService
+
+    service = ActionService(
+        ApplicationRepository(session),
+        ApplicationSectionDataRepository(session),
+        RuleService(get_rule_registry()),
+        get_action_registry(),
+        action_job_repository=ActionJobRepository(session),
+        result_cache=get_action_result_cache(),
+    )
+    await service.run_job(job_id)
+
+
+@lru_cache
+def get_action_job_runner() -> ActionJobRunner:
+    settings = get_settings()
+    return ActionJobRunner(
+        session_factory=AsyncSessionLocal,
+        run_job=_run_action_job,
+        workers=settings.action_job_workers,
+        stale_after_seconds=settings.action_job_stale_after_seconds,
+        max_attempts=settings.action_job_max_attempts,
+    )
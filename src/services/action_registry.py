@@ -0,0 +1,130 @@
+"""Registry of action handlers.
+
+Every action a rule version may declare (``actions`` in the rule config) is
+backed by an async handler registered here under its ``actionId``. A handler
+receives an :class:`ActionContext` and returns an :class:`ActionOutcome`; it
+never touches the database. The action service persists the field updates of
+all actions of one request in a single transaction.
+
+Each registration carries its own timeout and concurrency limit, so a slow
+provider (e.g. a bureau pull) cannot occupy every slot of a faster one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+from uuid import UUID
+
+from src.core.config import get_settings
+from src.services.rule_plan import FieldPlan
+
+
+@dataclass(frozen=True, slots=True)
+class ActionContext:
+    application_id: UUID
+    action_id: str
+    payload: dict[str, Any]
+    # The rule version's declaration of the action's trigger field, when a section declares it.
+    trigger_field: FieldPlan | None
+
+
+@dataclass(frozen=True, slots=True)
+class ActionOutcome:
+    success: bool
+    updated_fields: dict[str, Any]
+    field_locks: list[str]
+    message: str
+    # False for transient results (timeouts, provider errors) that must not be served from cache.
+    cacheable: bool = True
+
+
+ActionHandler = Callable[[ActionContext], Awaitable[ActionOutcome]]
+PayloadNormalizer = Callable[[dict[str, Any]], dict[str, Any]]
+
+
+def strip_strings(payload: dict[str, Any]) -> dict[str, Any]:
+    """Default payload normalization: surrounding whitespace never changes an action's result."""
+    return {key: value.strip() if isinstance(value, str) else value for key, value in payload.items()}
+
+
+@dataclass(frozen=True, slots=True)
+class RegisteredAction:
+    action_id: str
+    handler: ActionHandler
+    # Section the handler's ``updated_fields`` are merged into.
+    section_id: str
+    timeout_seconds: float
+    semaphore: asyncio.Semaphore = field(repr=False)
+    # Maps payloads the handler treats alike to one form; used for result caching.
+    normalize: PayloadNormalizer = strip_strings
+
+
+class ActionRegistry:
+    def __init__(self, default_timeout_seconds: float, default_max_concurrency: int) -> None:
+        self.default_timeout_seconds = default_timeout_seconds
+        self.default_max_concurrency = default_max_concurrency
+        self._actions: dict[str, RegisteredAction] = {}
+
+    def register(
+        self,
+        action_id: str,
+        handler: ActionHandler,
+        section_id: str,
+        timeout_seconds: float | None = None,
+        max_concurrency: int | None = None,
+        normalize: PayloadNormalizer = strip_strings,
+    ) -> None:
+        if action_id in self._actions:
+            raise ValueError(f"Action {action_id} is already registered")
+        self._actions[action_id] = RegisteredAction(
+            action_id=action_id,
+            handler=handler,
+            section_id=section_id,
+            timeout_seconds=timeout_seconds or self.default_timeout_seconds,
+            semaphore=asyncio.Semaphore(max(max_concurrency or self.default_max_concurrency, 1)),
+            normalize=normalize,
+        )
+
+    def action(
+        self,
+        action_id: str,
+        section_id: str,
+        timeout_seconds: float | None = None,
+        max_concurrency: int | None = None,
+        normalize: PayloadNormalizer = strip_strings,
+    ) -> Callable[[ActionHandler], ActionHandler]:
+        """Decorator form of :meth:`register`."""
+
+        def decorator(handler: ActionHandler) -> ActionHandler:
+            self.register(action_id, handler, section_id, timeout_seconds, max_concurrency, normalize)
+            return handler
+
+        return decorator
+
+    def get(self, action_id: str) -> RegisteredAction | None:
+        return self._actions.get(action_id)
+
+    def action_ids(self) -> list[str]:
+        return sorted(self._actions)
+
+    async def run(self, action: RegisteredAction, context: ActionContext) -> ActionOutcome:
+        """Run one handler under its concurrency limit; the timeout covers only the handler itself."""
+        async with action.semaphore:
+            return await asyncio.wait_for(action.handler(context), timeout=action.timeout_seconds)
+
+
+@lru_cache
+def get_action_registry() -> ActionRegistry:
+    from src.services.action_handlers import register_default_handlers
+
+    settings = get_settings()
+    registry = ActionRegistry(
+        default_timeout_seconds=settings.action_timeout_seconds,
+        default_max_concurrency=settings.action_max_concurrency,
+    )
+    register_default_handlers(registry)
+    return registry
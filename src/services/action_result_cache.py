@@ -0,0 +1,116 @@
+"""Result cache and single-flight coalescing for actions.
+
+Repeated actions are common: users double-tap "Verify" and the client retry
+manager re-sends requests. Three layers keep repeats cheap:
+
+* Identical concurrent requests for one application share a single in-flight
+  execution (:meth:`ActionResultCache.single_flight`), writes included.
+* Handler outcomes are cached by action id, rule plan digest and normalized
+  payload, so a repeat within the TTL does not call the provider again.
+  Outcomes marked not cacheable (timeouts, provider errors) are never stored.
+* After a request's updates are committed, the application's ``data_version``
+  is remembered. A repeat that finds the same version — nothing was written
+  since — is answered from the cache without touching section data at all.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
+from functools import lru_cache
+from typing import Any, Hashable, TypeVar
+from uuid import UUID
+
+from src.core.cache import LRUCache
+from src.core.config import get_settings
+from src.services.action_registry import ActionOutcome, RegisteredAction
+from src.services.rule_plan import canonical_digest
+
+T = TypeVar("T")
+
+
+class ActionResultCache:
+    def __init__(self, maxsize: int, ttl_seconds: float | None = None) -> None:
+        self._outcomes: LRUCache[str, ActionOutcome] = LRUCache(maxsize, ttl_seconds)
+        # request key -> (rule_version, data_version) right after that request's updates committed
+        self._applied: LRUCache[str, tuple[str, int]] = LRUCache(maxsize, ttl_seconds)
+        self._in_flight: dict[Hashable, asyncio.Future[Any]] = {}
+        self._coalesced = 0
+        self._replayed = 0
+
+    @staticmethod
+    def request_key(application_id: UUID, actions: Sequence[tuple[RegisteredAction, dict[str, Any]]]) -> str:
+        """Identity of one action request: application plus the normalized payload of every action."""
+        return canonical_digest(
+            {
+                "applicationId": str(application_id),
+                "actions": [[action.action_id, action.normalize(payload)] for action, payload in actions],
+            }
+        )
+
+    @staticmethod
+    def outcome_key(action: RegisteredAction, plan_digest: str, payload: dict[str, Any]) -> str:
+        # The plan digest covers the trigger field's validation, which handlers apply.
+        return canonical_digest({"a": action.action_id, "r": plan_digest, "p": action.normalize(payload)})
+
+    def get_outcome(self, key: str) -> ActionOutcome | None:
+        return self._outcomes.get(key)
+
+    def set_outcome(self, key: str, outcome: ActionOutcome) -> None:
+        if outcome.cacheable:
+            self._outcomes.set(key, outcome)
+
+    def is_applied(self, request_key: str, rule_version: str, data_version: int) -> bool:
+        if self._applied.get(request_key) != (rule_version, data_version):
+            return False
+        self._replayed += 1
+        return True
+
+    def set_applied(self, request_key: str, rule_version: str, data_version: int) -> None:
+        self._applied.set(request_key, (rule_version, data_version))
+
+    async def single_flight(self, key: Hashable, run: Callable[[], Awaitable[T]]) -> T:
+        """Run ``run`` once for all concurrent callers with the same key; they all get its result."""
+        while (future := self._in_flight.get(key)) is not None:
+            self._coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The leading request was cancelled (e.g. the client went away); take over.
+
+        future = asyncio.get_running_loop().create_future()
+        # Followers may all be gone; don't log "exception was never retrieved" for them.
+        future.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._in_flight[key] = future
+        try:
+            result = await run()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "outcomes": self._outcomes.stats().as_dict(),
+            "inFlight": len(self._in_flight),
+            "coalesced": self._coalesced,
+            "replayed": self._replayed,
+        }
+
+
+@lru_cache
+def get_action_result_cache() -> ActionResultCache | None:
+    settings = get_settings()
+    if settings.action_cache_size <= 0:
+        return None
+    return ActionResultCache(settings.action_cache_size, settings.action_cache_ttl_seconds or None)
@@ -1,62 +1,403 @@
+import asyncio
 import logging
-import re
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from typing import Any
+from uuid import UUID
 
 from fastapi import HTTPException, status
 
-from src.repositories.application_repository import ApplicationRepository
+from src.core import serialization
+from src.models.action_job import ActionJob
+from src.repositories.action_job_repository import JOB_COMPLETED, JOB_FAILED, ActionJobRepository
+from src.repositories.application_repository import ApplicationAggregate, ApplicationRepository
 from src.repositories.application_section_data_repository import ApplicationSectionDataRepository
-from src.schemas.action import ActionRequest, ActionResponse
+from src.schemas.action import (
+    ActionAndEvaluateRequest,
+    ActionAndEvaluateResponse,
+    ActionItem,
+    ActionJobResponse,
+    ActionRequest,
+    ActionResponse,
+    ActionResult,
+    BatchActionRequest,
+    BatchActionResponse,
+)
+from src.services.action_job_runner import ActionJobRunner
+from src.services.action_registry import ActionContext, ActionOutcome, ActionRegistry, RegisteredAction
+from src.services.action_result_cache import ActionResultCache
+from src.services.rule_plan import RulePlan
+from src.services.rule_service import RuleService
 
 logger = logging.getLogger(__name__)
 
 
-class ActionService:
-    _VERIFY_PAN = "VERIFY_PAN"
-    _PAN_PATTERN = re.compile(r"^[A-Z]{5}[0-9]{4}[A-Z]$")
-    _KYC_SECTION_ID = "KYC"
+@dataclass(frozen=True, slots=True)
+class _Execution:
+    results: list[ActionResult]
+    # EvaluateResponse document after the action's writes, when one was requested.
+    evaluation: dict[str, Any] | None = None
+
 
+class ActionService:
     def __init__(
         self,
         app_repository: ApplicationRepository,
         section_data_repository: ApplicationSectionDataRepository,
+        rule_service: RuleService,
+        action_registry: ActionRegistry,
+        action_job_repository: ActionJobRepository | None = None,
+        job_runner: ActionJobRunner | None = None,
+        result_cache: ActionResultCache | None = None,
+        validate_responses: bool = False,
     ) -> None:
         self.app_repository = app_repository
         self.section_data_repository = section_data_repository
+        self.rule_service = rule_service
+        self.action_registry = action_registry
+        self.action_job_repository = action_job_repository
+        self.job_runner = job_runner
+        self.result_cache = result_cache
+        self.validate_responses = validate_responses
 
     async def execute(self, request: ActionRequest) -> ActionResponse:
         logger.info(f"[ACTION] Executing action {request.actionId} for app {request.applicationId}")
-        
-        application = await self.app_repository.get_by_id(request.applicationId)
+        execution = await self._execute_once(
+            request.applicationId,
+            [ActionItem(actionId=request.actionId, payload=request.payload)],
+        )
+        return self._response(execution.results[0])
+
+    async def execute_and_evaluate(self, request: ActionAndEvaluateRequest) -> bytes:
+        """Run one action and return the serialized :class:`ActionAndEvaluateResponse`.
+
+        The evaluation reuses the aggregate loaded before the action plus the section
+        rows returned by the merge; nothing is read back after the write.
+        """
+        logger.info(f"[ACTION] Executing action {request.actionId} with evaluation for app {request.applicationId}")
+        execution = await self._execute_once(
+            request.applicationId,
+            [ActionItem(actionId=request.actionId, payload=request.payload)],
+            evaluate=True,
+            evaluation_token=request.evaluationToken,
+        )
+        document = {
+            **self._response(execution.results[0]).model_dump(mode="json"),
+            "evaluation": execution.evaluation,
+        }
+        if self.validate_responses:
+            ActionAndEvaluateResponse.model_validate(document)
+        return serialization.dumps(document)
+
+    async def execute_batch(self, request: BatchActionRequest) -> BatchActionResponse:
+        """Run several actions concurrently and persist all their field updates in one transaction."""
+        action_ids = [item.actionId for item in request.actions]
+        logger.info(f"[ACTION] Executing actions {action_ids} for app {request.applicationId}")
+        if len(set(action_ids)) != len(action_ids):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Duplicate actionId",
+            )
+        execution = await self._execute_once(request.applicationId, request.actions)
+        return BatchActionResponse(
+            success=all(result.success for result in execution.results),
+            results=execution.results,
+        )
+
+    async def submit_job(self, request: ActionRequest) -> ActionJobResponse:
+        """Accept an action for background execution; poll the job with :meth:`get_job`."""
+        assert self.action_job_repository is not None and self.job_runner is not None
+        application = await self.app_repository.get_by_id(request.applicationId, with_override=True)
         if application is None:
-            logger.error(f"[ACTION] Application not found: {request.applicationId}")
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Application not found",
             )
+        # Reject what would fail anyway before queueing it.
+        self._resolve(self.rule_service.get_plan(application.rule_version), request.applicationId, [request])
 
-        if request.actionId != self._VERIFY_PAN:
-            logger.error(f"[ACTION] Unsupported actionId: {request.actionId}")
+        job = await self.action_job_repository.create(request.applicationId, request.actionId, request.payload)
+        response = self._job_response(job)
+        await self.action_job_repository.commit()
+        await self.job_runner.enqueue(response.jobId)
+        logger.info(f"[ACTION] Queued action {request.actionId} as job {response.jobId}")
+        return response
+
+    async def get_job(self, job_id: UUID) -> ActionJobResponse:
+        assert self.action_job_repository is not None
+        self.action_job_repository.read_own_writes([job_id])
+        job = await self.action_job_repository.get_by_id(job_id)
+        if job is None:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Unsupported actionId",
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Action job not found",
             )
+        return self._job_response(job)
 
-        result = self._mock_verify_pan(request.payload)
-        logger.info(f"[ACTION] Mock verification result: {result}")
+    async def run_job(self, job_id: UUID) -> None:
+        """Run one queued job; called by the job runner on its own session."""
+        assert self.action_job_repository is not None
+        if not await self.action_job_repository.claim(job_id):
+            await self.action_job_repository.rollback()
+            return
+        await self.action_job_repository.commit()
 
+        job = await self.action_job_repository.get_by_id(job_id)
+        assert job is not None
+        application_id = job.application_id
+        item = ActionItem(actionId=job.action_id, payload=job.payload)
         try:
-            logger.info(
-                f"[ACTION] Merging fields for app={request.applicationId}, section={self._KYC_SECTION_ID}"
+            # On success the job is finished in the same transaction as the field updates.
+            await self._execute(application_id, [item], job_id=job_id)
+        except HTTPException as exc:
+            await self.action_job_repository.rollback()
+            await self.action_job_repository.finish(job_id, JOB_FAILED, error=str(exc.detail)[:512])
+            await self.action_job_repository.commit()
+
+    def _resolve(
+        self,
+        plan: RulePlan,
+        application_id: UUID,
+        items: Sequence[ActionItem | ActionRequest],
+    ) -> list[tuple[RegisteredAction, ActionContext]]:
+        runs: list[tuple[RegisteredAction, ActionContext]] = []
+        for item in items:
+            # An action must be both declared by the rule version and backed by a registered handler.
+            action_plan = plan.get_action(item.actionId)
+            action = self.action_registry.get(item.actionId)
+            if action_plan is None or action is None:
+                logger.error(f"[ACTION] Unsupported actionId: {item.actionId}")
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Unsupported actionId",
+                )
+            trigger_field = None
+            if action_plan.trigger_section_id is not None:
+                trigger_field = plan.get_field(action_plan.trigger_section_id, action_plan.trigger_field)
+            runs.append(
+                (action, ActionContext(application_id, item.actionId, item.payload, trigger_field))
+            )
+        return runs
+
+    async def _execute_once(
+        self,
+        application_id: UUID,
+        items: Sequence[ActionItem],
+        evaluate: bool = False,
+        evaluation_token: str | None = None,
+    ) -> _Execution:
+        """Identical concurrent requests for one application share one execution, writes included."""
+        actions = [(self.action_registry.get(item.actionId), item.payload) for item in items]
+        if self.result_cache is None or any(action is None for action, _ in actions):
+            return await self._execute(application_id, items, evaluate=evaluate, evaluation_token=evaluation_token)
+        request_key = self.result_cache.request_key(application_id, actions)
+        return await self.result_cache.single_flight(
+            (request_key, evaluate, evaluation_token),
+            lambda: self._execute(
+                application_id,
+                items,
+                request_key=request_key,
+                evaluate=evaluate,
+                evaluation_token=evaluation_token,
+            ),
+        )
+
+    async def _execute(
+        self,
+        application_id: UUID,
+        items: Sequence[ActionItem],
+        job_id: UUID | None = None,
+        request_key: str | None = None,
+        evaluate: bool = False,
+        evaluation_token: str | None = None,
+    ) -> _Execution:
+        aggregate = None
+        if evaluate:
+            aggregate = await self.app_repository.get_aggregate(application_id)
+            application = aggregate.application if aggregate is not None else None
+        else:
+            application = await self.app_repository.get_by_id(application_id, with_override=True)
+        if application is None:
+            logger.error(f"[ACTION] Application not found: {application_id}")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Application not found",
+            )
+
+        rule_version = application.rule_version
+        override_patch = application.override.override_patch if application.override is not None else None
+        data_version = application.data_version
+        if aggregate is not None:
+            # Keeps the loaded rows readable for the evaluation after the rollback below.
+            self.app_repository.detach(application)
+        plan = self.rule_service.get_plan(rule_version)
+        runs = self._resolve(plan, application_id, items)
+        outcome_keys = [
+            self.result_cache.outcome_key(action, plan.digest, context.payload)
+            if self.result_cache is not None
+            else None
+            for action, context in runs
+        ]
+
+        # Handlers may wait on external providers; don't hold a pooled connection meanwhile.
+        await self.app_repository.rollback()
+        if request_key is not None and self.result_cache is not None:
+            cached = [self.result_cache.get_outcome(key) if key is not None else None for key in outcome_keys]
+            # Failed outcomes are never stored and stored ones can be evicted: replay only a full set.
+            if all(outcome is not None for outcome in cached) and self.result_cache.is_applied(
+                request_key, rule_version, data_version
+            ):
+                # A repeat of a request whose updates are already in place: nothing to run or write.
+                logger.info(f"[ACTION] Replaying cached results for app {application_id}")
+                return self._execution(self._results(runs, cached), aggregate, {}, evaluation_token)
+
+        outcomes = await asyncio.gather(
+            *(self._run(action, context, key) for (action, context), key in zip(runs, outcome_keys))
+        )
+        results = self._results(runs, outcomes)
+
+        updates: dict[str, dict[str, Any]] = {}
+        for (action, _), outcome in zip(runs, outcomes):
+            if outcome.updated_fields:
+                updates.setdefault(action.section_id, {}).update(outcome.updated_fields)
+        job_result = None
+        if job_id is not None:
+            job_result = results[0].model_dump(mode="json", exclude={"actionId"})
+        written: dict[str, dict[str, Any]] = {}
+        if updates or job_id is not None:
+            data_version, written = await self._persist(
+                application_id, rule_version, override_patch, updates, job_id, job_result
             )
-            await self.section_data_repository.merge_fields(
-                application_id=request.applicationId,
-                section_id=self._KYC_SECTION_ID,
-                updated_fields=result["updatedFields"],
+        # A repeat may skip the handlers only if every outcome can be served from the cache.
+        if (
+            request_key is not None
+            and self.result_cache is not None
+            and data_version is not None
+            and all(outcome.cacheable for outcome in outcomes)
+        ):
+            self.result_cache.set_applied(request_key, rule_version, data_version)
+
+        logger.info(f"[ACTION] Actions {[action.action_id for action, _ in runs]} completed")
+        return self._execution(results, aggregate, written, evaluation_token)
+
+    @staticmethod
+    def _results(
+        runs: Sequence[tuple[RegisteredAction, ActionContext]],
+        outcomes: Sequence[ActionOutcome],
+    ) -> list[ActionResult]:
+        return [
+            ActionResult(
+                actionId=action.action_id,
+                success=outcome.success,
+                updatedFields=outcome.updated_fields,
+                fieldLocks=outcome.field_locks,
+                message=outcome.message,
+            )
+            for (action, _), outcome in zip(runs, outcomes)
+        ]
+
+    def _execution(
+        self,
+        results: list[ActionResult],
+        aggregate: ApplicationAggregate | None,
+        written: dict[str, dict[str, Any]],
+        evaluation_token: str | None,
+    ) -> _Execution:
+        if aggregate is None:
+            return _Execution(results)
+        # ``written`` holds the merged rows as stored, so concurrent merges are reflected too.
+        current = ApplicationAggregate(
+            application=aggregate.application,
+            override_patch=aggregate.override_patch,
+            section_data={**aggregate.section_data, **written},
+        )
+        evaluation = self.rule_service.evaluate(current, request_section_data=None, evaluation_token=evaluation_token)
+        return _Execution(results, evaluation)
+
+    async def _run(
+        self,
+        action: RegisteredAction,
+        context: ActionContext,
+        outcome_key: str | None = None,
+    ) -> ActionOutcome:
+        if outcome_key is not None and self.result_cache is not None:
+            cached = self.result_cache.get_outcome(outcome_key)
+            if cached is not None:
+                logger.info(f"[ACTION] {action.action_id} served from cache")
+                return cached
+        try:
+            outcome = await self.action_registry.run(action, context)
+        except TimeoutError:
+            logger.warning(f"[ACTION] {action.action_id} timed out after {action.timeout_seconds}s")
+            return ActionOutcome(False, {}, [], "Action timed out", cacheable=False)
+        except Exception as exc:
+            logger.error(f"[ACTION] {action.action_id} failed: {exc}", exc_info=True)
+            return ActionOutcome(False, {}, [], "Action failed", cacheable=False)
+        logger.info(f"[ACTION] {action.action_id} result: {outcome}")
+        if outcome_key is not None and self.result_cache is not None:
+            self.result_cache.set_outcome(outcome_key, outcome)
+        return outcome
+
+    async def _persist(
+        self,
+        application_id: UUID,
+        rule_version: str,
+        override_patch: dict[str, Any] | None,
+        updates: dict[str, dict[str, Any]],
+        job_id: UUID | None = None,
+        job_result: dict[str, Any] | None = None,
+    ) -> tuple[int | None, dict[str, dict[str, Any]]]:
+        """Merge, stamp and commit.
+
+        Returns the committed data_version (only read when results are cached) and the
+        merged data of every written section.
+        """
+        try:
+            logger.info(f"[ACTION] Merging fields for app={application_id}, sections={list(updates)}")
+            sections = {
+                section_id: await self.section_data_repository.merge_fields(
+                    application_id=application_id,
+                    section_id=section_id,
+                    updated_fields=updated_fields,
+                    indexed_fields=self.rule_service.indexed_fields(rule_version, section_id),
+                )
+                for section_id, updated_fields in updates.items()
+            }
+
+            other_sections = None
+            if any(self.rule_service.input_sections(rule_version, section_id) for section_id in sections):
+                aggregate = await self.app_repository.get_aggregate(application_id)
+                other_sections = {
+                    **(aggregate.section_data if aggregate is not None else {}),
+                    **{section_id: section.data for section_id, section in sections.items()},
+                }
+            dependent_sections: set[str] = set()
+            for section_id, section in sections.items():
+                section_status, status_stamp = self.rule_service.section_status(
+                    rule_version=rule_version,
+                    override_patch=override_patch,
+                    section_id=section_id,
+                    section_data=section.data,
+                    other_sections=other_sections,
+                )
+                await self.section_data_repository.set_status(section, section_status, status_stamp)
+                dependent_sections |= self.rule_service.dependent_sections(rule_version, section_id)
+
+            await self.section_data_repository.clear_statuses(
+                application_id,
+                sorted(dependent_sections - sections.keys()),
             )
+            if job_id is not None:
+                assert self.action_job_repository is not None
+                await self.action_job_repository.finish(job_id, JOB_COMPLETED, result=job_result)
+            # Read inside the transaction: the version bump keeps other writers out until commit.
+            version = await self.app_repository.get_version(application_id) if self.result_cache is not None else None
             logger.info("[ACTION] Fields merged, committing transaction")
             await self.section_data_repository.commit()
             logger.info("[ACTION] Transaction committed successfully")
+            written = {section_id: section.data for section_id, section in sections.items()}
+            return (version.data_version if version is not None else None), written
         except Exception as exc:
             logger.error(f"[ACTION] Failed to persist action result: {exc}", exc_info=True)
             await self.section_data_repository.rollback()
@@ -65,39 +406,29 @@ class ActionService:
                 detail=f"Failed to persist action result: {str(exc)}",
             ) from exc
 
-        logger.info(f"[ACTION] Action {request.actionId} completed successfully")
+    @staticmethod
+    def _response(result: ActionResult) -> ActionResponse:
         return ActionResponse(
-            success=result["success"],
-            updatedFields=result["updatedFields"],
-            fieldLocks=result["fieldLocks"],
-            message=result["message"],
+            success=result.success,
+            updatedFields=result.updatedFields,
+            fieldLocks=result.fieldLocks,
+            message=result.message,
         )
 
-    def _mock_verify_pan(self, payload: dict[str, Any]) -> dict[str, Any]:
-        pan_number = str(payload.get("panNumber", "")).upper().strip()
-        if not pan_number:
-            return {
-                "success": False,
-                "updatedFields": {"panVerified": False},
-                "fieldLocks": [],
-                "message": "PAN number missing in payload",
-            }
+    @staticmethod
+    def _job_response(job: ActionJob) -> ActionJobResponse:
+        return ActionJobResponse(
+            jobId=job.id,
+            applicationId=job.application_id,
+            actionId=job.action_id,
+            status=job.status,
+            result=ActionResponse.model_validate(job.result) if job.result is not None else None,
+            error=job.error,
+            createdAt=_as_utc(job.created_at),
+            completedAt=_as_utc(job.completed_at) if job.completed_at is not None else None,
+        )
 
-        is_valid = bool(self._PAN_PATTERN.fullmatch(pan_number))
-        if not is_valid:
-            return {
-                "success": False,
-                "updatedFields": {"panVerified": False},
-                "fieldLocks": [],
-                "message": "PAN format invalid",
-            }
 
-        return {
-            "success": True,
-            "updatedFields": {
-                "panVerified": True,
-                "panHolderName": "VERIFIED USER",
-            },
-            "fieldLocks": ["panNumber", "panVerified"],
-            "message": "PAN verified successfully",
-        }
+def _as_utc(value: datetime) -> datetime:
+    # SQLite returns the stored UTC timestamps without a zone.
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
@@ -1,9 +1,18 @@
+import base64
+import binascii
+import json
 import logging
+import math
+from datetime import datetime
+from uuid import UUID
+
 from fastapi import HTTPException, status
 
+from src.core import serialization
 from src.models.application import Application
-from src.repositories.application_repository import ApplicationRepository
-from src.schemas.application import CreateApplicationResponse
+from src.models.application_section_data import SEARCHABLE_FIELDS
+from src.repositories.application_repository import ApplicationRepository, FieldFilter
+from src.schemas.application import ApplicationListResponse, ApplicationSummary, CreateApplicationResponse
 
 logger = logging.getLogger(__name__)
 
@@ -39,3 +48,85 @@ class ApplicationService:
             applicationId=created.id,
             ruleVersion=created.rule_version,
         )
+
+    async def list_applications(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        phase: str | None = None,
+        rule_version: str | None = None,
+        section_id: str | None = None,
+        field_id: str | None = None,
+        field_value: str | None = None,
+    ) -> ApplicationListResponse:
+        field_params = (section_id, field_id, field_value)
+        field_filter = None
+        if any(param is not None for param in field_params):
+            if any(param is None for param in field_params):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="sectionId, fieldId and fieldValue must be given together",
+                )
+            field_filter = self._field_filter(section_id, field_id, field_value)
+
+        # One extra row tells whether another page follows.
+        rows = await self.repository.list_page(
+            limit=limit + 1,
+            after=self._decode_cursor(cursor) if cursor is not None else None,
+            phase=phase,
+            rule_version=rule_version,
+            field_filter=field_filter,
+        )
+        page = rows[:limit]
+        return ApplicationListResponse(
+            applications=[
+                ApplicationSummary(
+                    applicationId=row.application_id,
+                    ruleVersion=row.rule_version,
+                    phase=row.phase,
+                    createdAt=row.created_at,
+                )
+                for row in page
+            ],
+            nextCursor=self._encode_cursor(page[-1].position) if len(rows) > limit else None,
+        )
+
+    @staticmethod
+    def _field_filter(section_id: str, field_id: str, field_value: str) -> FieldFilter:
+        # Only fields with a search index; anything else would scan every section row.
+        if field_id not in SEARCHABLE_FIELDS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"fieldId must be one of: {', '.join(SEARCHABLE_FIELDS)}",
+            )
+        # A query string is always text: "false" must also find a stored false, "42" a stored 42.
+        values: tuple[str | bool | int | float, ...] = (field_value,)
+        try:
+            parsed = json.loads(field_value)
+        except ValueError:
+            parsed = None
+        if isinstance(parsed, (bool, int, float)) and (not isinstance(parsed, float) or math.isfinite(parsed)):
+            values += (parsed,)
+        return FieldFilter(section_id=section_id, field_id=field_id, values=values)
+
+    @staticmethod
+    def _encode_cursor(position: tuple[str, UUID]) -> str:
+        created_at, application_id = position
+        raw = serialization.dumps([created_at, application_id])
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple[str, UUID]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            created_at, application_id = json.loads(raw)
+            if not isinstance(created_at, str):
+                raise ValueError("created_at must be a string")
+            # The repository compares it as a timestamp on Postgres; reject anything else here.
+            datetime.fromisoformat(created_at)
+            return created_at, UUID(application_id)
+        except (binascii.Error, ValueError, TypeError) as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            ) from exc
@@ -1,16 +1,28 @@
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.database import get_db_session
+from src.core.config import get_settings
+from src.core.database import get_db_session, get_read_db_session
+from src.repositories.action_job_repository import ActionJobRepository
+from src.repositories.application_field_value_repository import ApplicationFieldValueRepository
 from src.repositories.application_override_repository import ApplicationOverrideRepository
 from src.repositories.application_repository import ApplicationRepository
 from src.repositories.application_section_data_repository import ApplicationSectionDataRepository
+from src.services.action_job_runner import ActionJobRunner, get_action_job_runner
+from src.services.action_registry import ActionRegistry, get_action_registry
+from src.services.action_result_cache import ActionResultCache, get_action_result_cache
 from src.services.action_service import ActionService
 from src.services.application_service import ApplicationService
+from src.services.draft_write_coalescer import DraftWriteCoalescer, get_draft_write_coalescer
 from src.services.evaluate_service import EvaluateService
+from src.services.evaluation_cache import EvaluationCacheBackend, get_evaluation_cache
+from src.services.field_lookup_service import FieldLookupService
+from src.services.idempotency import IdempotencyStore, RequestIdempotency, get_idempotency_store
+from src.services.rule_registry import RuleRegistry, get_rule_registry
 from src.services.rule_service import RuleService
 from src.services.save_draft_service import SaveDraftService
 from src.services.submit_service import SubmitService
+from src.services.validation_service import ValidationService
 
 
 async def get_application_service(
@@ -20,37 +32,130 @@ async def get_application_service(
     return ApplicationService(repository)
 
 
-async def get_evaluate_service(
+async def get_read_application_service(
+    session: AsyncSession = Depends(get_read_db_session),
+) -> ApplicationService:
+    """Application listing and search; never writes."""
+    return ApplicationService(ApplicationRepository(session))
+
+
+async def get_field_lookup_service(
+    session: AsyncSession = Depends(get_read_db_session),
+    rule_registry: RuleRegistry = Depends(get_rule_registry),
+) -> FieldLookupService:
+    return FieldLookupService(ApplicationFieldValueRepository(session), RuleService(rule_registry))
+
+
+async def get_request_idempotency(
     session: AsyncSession = Depends(get_db_session),
+    store: IdempotencyStore = Depends(get_idempotency_store),
+) -> RequestIdempotency:
+    """Idempotency-Key handling on the same primary session as the request's service."""
+    return RequestIdempotency(store, session)
+
+
+async def get_rule_service(
+    rule_registry: RuleRegistry = Depends(get_rule_registry),
+) -> RuleService:
+    return RuleService(rule_registry)
+
+
+async def get_evaluate_service(
+    session: AsyncSession = Depends(get_read_db_session),
+    rule_registry: RuleRegistry = Depends(get_rule_registry),
+    evaluation_cache: EvaluationCacheBackend | None = Depends(get_evaluation_cache),
 ) -> EvaluateService:
     app_repository = ApplicationRepository(session)
-    section_data_repository = ApplicationSectionDataRepository(session)
-    override_repository = ApplicationOverrideRepository(session)
-    rule_service = RuleService(section_data_repository, override_repository)
-    return EvaluateService(app_repository, rule_service)
+    rule_service = RuleService(rule_registry)
+    return EvaluateService(
+        app_repository,
+        rule_service,
+        evaluation_cache,
+        validate_responses=get_settings().validate_responses,
+    )
 
 
 async def get_action_service(
     session: AsyncSession = Depends(get_db_session),
+    rule_registry: RuleRegistry = Depends(get_rule_registry),
+    action_registry: ActionRegistry = Depends(get_action_registry),
+    job_runner: ActionJobRunner = Depends(get_action_job_runner),
+    result_cache: ActionResultCache | None = Depends(get_action_result_cache),
 ) -> ActionService:
     app_repository = ApplicationRepository(session)
     section_data_repository = ApplicationSectionDataRepository(session)
-    return ActionService(app_repository, section_data_repository)
+    rule_service = RuleService(rule_registry)
+    return ActionService(
+        app_repository,
+        section_data_repository,
+        rule_service,
+        action_registry,
+        action_job_repository=ActionJobRepository(session),
+        job_runner=job_runner,
+        result_cache=result_cache,
+        validate_responses=get_settings().validate_responses,
+    )
+
+
+async def get_read_action_service(
+    session: AsyncSession = Depends(get_read_db_session),
+    rule_registry: RuleRegistry = Depends(get_rule_registry),
+    action_registry: ActionRegistry = Depends(get_action_registry),
+) -> ActionService:
+    """Action job polling; never writes."""
+    return ActionService(
+        ApplicationRepository(session),
+        ApplicationSectionDataRepository(session),
+        RuleService(rule_registry),
+        action_registry,
+        action_job_repository=ActionJobRepository(session),
+    )
 
 
 async def get_save_draft_service(
     session: AsyncSession = Depends(get_db_session),
+    rule_registry: RuleRegistry = Depends(get_rule_registry),
+    write_coalescer: DraftWriteCoalescer | None = Depends(get_draft_write_coalescer),
 ) -> SaveDraftService:
     app_repository = ApplicationRepository(session)
     section_data_repository = ApplicationSectionDataRepository(session)
-    return SaveDraftService(app_repository, section_data_repository)
+    rule_service = RuleService(rule_registry)
+    return SaveDraftService(
+        app_repository,
+        section_data_repository,
+        rule_service,
+        write_coalescer,
+        validate_responses=get_settings().validate_responses,
+    )
 
 
 async def get_submit_service(
     session: AsyncSession = Depends(get_db_session),
+    rule_registry: RuleRegistry = Depends(get_rule_registry),
+) -> SubmitService:
+    return _submit_service(session, rule_registry)
+
+
+async def get_read_submit_service(
+    session: AsyncSession = Depends(get_read_db_session),
+    rule_registry: RuleRegistry = Depends(get_rule_registry),
 ) -> SubmitService:
+    """Submit checks that only read (no submit, no status refresh)."""
+    return _submit_service(session, rule_registry)
+
+
+async def get_validation_service(
+    session: AsyncSession = Depends(get_read_db_session),
+    rule_registry: RuleRegistry = Depends(get_rule_registry),
+) -> ValidationService:
+    app_repository = ApplicationRepository(session)
+    rule_service = RuleService(rule_registry)
+    return ValidationService(app_repository, rule_service)
+
+
+def _submit_service(session: AsyncSession, rule_registry: RuleRegistry) -> SubmitService:
     app_repository = ApplicationRepository(session)
     section_data_repository = ApplicationSectionDataRepository(session)
     override_repository = ApplicationOverrideRepository(session)
-    rule_service = RuleService(section_data_repository, override_repository)
-    return SubmitService(app_repository, rule_service)
+    rule_service = RuleService(rule_registry)
+    return SubmitService(app_repository, section_data_repository, override_repository, rule_service)
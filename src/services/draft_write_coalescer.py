@@ -0,0 +1,195 @@
+"""Group commit for save-draft traffic.
+
+Concurrent draft writes are queued in-process and applied in one transaction
+per short window (or as soon as ``max_batch_size`` writes are waiting). Within
+a batch the last write per (application, section) wins. Every caller is
+resolved only after the shared commit, so a successful response still means
+the draft is durable.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.config import get_settings
+from src.core.database import AsyncSessionLocal
+from src.repositories.application_section_data_repository import (
+    ApplicationSectionDataRepository,
+    SectionDataWrite,
+)
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the batch-size histogram buckets; the last bucket is open-ended.
+_BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+
+@dataclass(slots=True)
+class _PendingWrite:
+    row: SectionDataWrite
+    future: asyncio.Future[datetime]
+
+
+class DraftWriteCoalescer:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        max_batch_size: int = 64,
+        max_delay_seconds: float = 0.01,
+    ) -> None:
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size must be positive")
+        self.session_factory = session_factory
+        self.max_batch_size = max_batch_size
+        self.max_delay_seconds = max_delay_seconds
+        self._pending: list[_PendingWrite] = []
+        self._batch_full: asyncio.Event | None = None
+        self._flush_task: asyncio.Task[None] | None = None
+        # Batches are written one at a time; on SQLite that is the file lock anyway.
+        self._write_lock: asyncio.Lock | None = None
+
+        self._writes_submitted = 0
+        self._writes_coalesced = 0
+        self._batches_committed = 0
+        self._batches_failed = 0
+        self._largest_batch = 0
+        self._batch_size_histogram = [0] * (len(_BATCH_SIZE_BUCKETS) + 1)
+
+    async def submit(
+        self,
+        application_id: UUID,
+        section_id: str,
+        data: dict[str, Any],
+        status: str | None = None,
+        status_stamp: str | None = None,
+        indexed_fields: frozenset[str] = frozenset(),
+    ) -> datetime:
+        """Queue a draft write and wait for the commit that includes it."""
+        future: asyncio.Future[datetime] = asyncio.get_running_loop().create_future()
+        row = SectionDataWrite(application_id, section_id, data, status, status_stamp, indexed_fields)
+        self._pending.append(_PendingWrite(row, future))
+        self._writes_submitted += 1
+
+        if self._batch_full is None:
+            self._batch_full = asyncio.Event()
+            self._write_lock = asyncio.Lock()
+        if len(self._pending) >= self.max_batch_size:
+            self._batch_full.set()
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+
+        return await future
+
+    async def close(self) -> None:
+        """Flush whatever is still queued; used on application shutdown."""
+        while self._pending or self._flush_task is not None:
+            if self._batch_full is not None:
+                self._batch_full.set()
+            task = self._flush_task
+            if task is not None:
+                await task
+            elif self._pending:
+                self._flush_task = asyncio.create_task(self._flush_after_window())
+
+    def stats(self) -> dict[str, Any]:
+        histogram = {
+            f"le_{bound}": count
+            for bound, count in zip(_BATCH_SIZE_BUCKETS, self._batch_size_histogram)
+        }
+        histogram[f"gt_{_BATCH_SIZE_BUCKETS[-1]}"] = self._batch_size_histogram[-1]
+        return {
+            "writesSubmitted": self._writes_submitted,
+            "writesCoalesced": self._writes_coalesced,
+            "batchesCommitted": self._batches_committed,
+            "batchesFailed": self._batches_failed,
+            "largestBatch": self._largest_batch,
+            "pending": len(self._pending),
+            "batchSizeHistogram": histogram,
+        }
+
+    async def _flush_after_window(self) -> None:
+        assert self._batch_full is not None and self._write_lock is not None
+        try:
+            await asyncio.wait_for(self._batch_full.wait(), timeout=self.max_delay_seconds)
+        except asyncio.TimeoutError:
+            pass
+
+        self._batch_full.clear()
+        batch = self._pending[: self.max_batch_size]
+        self._pending = self._pending[self.max_batch_size:]
+        # Open the next window right away so writes arriving during this commit keep batching.
+        self._flush_task = asyncio.create_task(self._flush_after_window()) if self._pending else None
+        if len(self._pending) >= self.max_batch_size:
+            self._batch_full.set()
+
+        async with self._write_lock:
+            await self._write_batch(batch)
+
+    async def _write_batch(self, batch: list[_PendingWrite]) -> None:
+        self._record_batch_size(len(batch))
+        rows = [item.row for item in batch]
+        self._writes_coalesced += len(batch) - len({(row.application_id, row.section_id) for row in rows})
+
+        try:
+            await self._commit(rows)
+        except Exception as exc:
+            self._batches_failed += 1
+            logger.warning("Draft batch of %d failed (%s); retrying writes individually", len(batch), exc)
+            await self._write_individually(batch)
+            return
+
+        self._batches_committed += 1
+        committed_at = datetime.now(timezone.utc)
+        for item in batch:
+            if not item.future.done():
+                item.future.set_result(committed_at)
+
+    async def _write_individually(self, batch: list[_PendingWrite]) -> None:
+        # Isolates a bad row (e.g. an application deleted mid-window) from the rest of the batch.
+        for item in batch:
+            try:
+                await self._commit([item.row])
+            except Exception as exc:
+                if not item.future.done():
+                    item.future.set_exception(exc)
+                continue
+            if not item.future.done():
+                item.future.set_result(datetime.now(timezone.utc))
+
+    async def _commit(self, rows: list[SectionDataWrite]) -> None:
+        async with self.session_factory() as session:
+            repository = ApplicationSectionDataRepository(session)
+            try:
+                await repository.upsert_many(rows)
+                await repository.commit()
+            except Exception:
+                await repository.rollback()
+                raise
+
+    def _record_batch_size(self, size: int) -> None:
+        self._largest_batch = max(self._largest_batch, size)
+        for index, bound in enumerate(_BATCH_SIZE_BUCKETS):
+            if size <= bound:
+                self._batch_size_histogram[index] += 1
+                return
+        self._batch_size_histogram[-1] += 1
+
+
+@lru_cache
+def get_draft_write_coalescer() -> DraftWriteCoalescer | None:
+    settings = get_settings()
+    if not settings.draft_coalescing_enabled:
+        return None
+    return DraftWriteCoalescer(
+        session_factory=AsyncSessionLocal,
+        max_batch_size=settings.draft_coalescing_max_batch_size,
+        max_delay_seconds=settings.draft_coalescing_max_delay_ms / 1000,
+    )
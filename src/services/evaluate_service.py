@@ -1,47 +1,95 @@
 import logging
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any, NoReturn
+from uuid import UUID
+
 from fastapi import HTTPException, status
 
-from src.repositories.application_repository import ApplicationRepository
-from src.schemas.evaluate import EvaluateRequest, EvaluateResponse
+from src.core import serialization
+from src.repositories.application_repository import ApplicationAggregate, ApplicationRepository
+from src.schemas.evaluate import (
+    BatchEvaluateItem,
+    BatchEvaluateRequest,
+    EvaluateRequest,
+    EvaluateResponse,
+    EvaluateValuesResponse,
+)
+from src.services.evaluation_cache import EvaluationCacheBackend, etag_matches, evaluation_etag
 from src.services.rule_service import RuleService
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, slots=True)
+class EvaluationResult:
+    etag: str
+    # Serialized EvaluateResponse; None when the client's If-None-Match already matches.
+    body: bytes | None
+
+
 class EvaluateService:
-    def __init__(self, app_repository: ApplicationRepository, rule_service: RuleService) -> None:
+    def __init__(
+        self,
+        app_repository: ApplicationRepository,
+        rule_service: RuleService,
+        cache: EvaluationCacheBackend | None = None,
+        validate_responses: bool = False,
+    ) -> None:
         self.app_repository = app_repository
         self.rule_service = rule_service
+        self.cache = cache
+        self.validate_responses = validate_responses
 
-    async def evaluate(self, request: EvaluateRequest) -> EvaluateResponse:
+    async def evaluate(
+        self,
+        request: EvaluateRequest,
+        if_none_match: str | None = None,
+        values_only: bool = False,
+    ) -> EvaluationResult:
+        """Evaluate one application; ``values_only`` selects the lean EvaluateValuesResponse."""
         try:
             logger.info("Evaluate request for applicationId=%s, phase=%s", 
                        request.applicationId, request.phase)
-            
-            application = await self.app_repository.get_by_id(request.applicationId)
-            if application is None:
-                logger.error("Application not found: %s", request.applicationId)
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Application not found",
-                )
+            # A replica may not have the client's last save yet; data_version must not go back.
+            self.app_repository.read_own_writes([request.applicationId])
 
-            if request.phase != application.phase:
-                logger.error("Phase mismatch: expected %s, got %s", 
-                           application.phase, request.phase)
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail="Phase mismatch for application",
-                )
+            if self.cache is not None or if_none_match:
+                # Cheap header read: answers 304s and cache hits without loading any section data.
+                version = await self.app_repository.get_version(request.applicationId)
+                if version is None:
+                    self._raise_not_found(request)
+                self._check_phase(request, version.phase)
+                etag = self._etag(request, version.data_version, version.rule_version, values_only)
+                if etag_matches(if_none_match, etag):
+                    return EvaluationResult(etag=etag, body=None)
+                if self.cache is not None:
+                    body = await self.cache.get(etag)
+                    if body is not None:
+                        return EvaluationResult(etag=etag, body=body)
+
+            aggregate = await self.app_repository.get_aggregate(request.applicationId)
+            if aggregate is None:
+                self._raise_not_found(request)
 
-            result = await self.rule_service.evaluate(
-                application_id=application.id,
-                rule_version=application.rule_version,
-                phase=application.phase,
+            application = aggregate.application
+            self._check_phase(request, application.phase)
+
+            result = self.rule_service.evaluate(
+                aggregate,
                 request_section_data=request.sectionData,
+                evaluation_token=request.evaluationToken,
+                values_only=values_only,
             )
+            # Re-derived from the loaded row: a write committed after the header read must not
+            # be cached under the older version's key.
+            etag = self._etag(request, application.data_version, application.rule_version, values_only)
+            body = self._serialize(result, values_only)
+            if self.cache is not None:
+                await self.cache.set(etag, body)
+
             logger.info("Evaluate successful for applicationId=%s", request.applicationId)
-            return result
+            return EvaluationResult(etag=etag, body=body)
         except HTTPException:
             raise
         except Exception as exc:
@@ -50,3 +98,92 @@ class EvaluateService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Evaluate failed: {str(exc)}",
             ) from exc
+
+    def _etag(self, request: EvaluateRequest, data_version: int, rule_version: str, values_only: bool) -> str:
+        plan = self.rule_service.get_plan(rule_version)
+        return evaluation_etag(
+            request.applicationId,
+            data_version,
+            request.phase,
+            plan.digest,
+            request.sectionData,
+            request.evaluationToken,
+            view="values" if values_only else "full",
+        )
+
+    @staticmethod
+    def _raise_not_found(request: EvaluateRequest) -> NoReturn:
+        logger.error("Application not found: %s", request.applicationId)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Application not found",
+        )
+
+    @staticmethod
+    def _check_phase(request: EvaluateRequest, phase: str) -> None:
+        if request.phase != phase:
+            logger.error("Phase mismatch: expected %s, got %s", 
+                       phase, request.phase)
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Phase mismatch for application",
+            )
+
+    async def evaluate_batch(self, request: BatchEvaluateRequest) -> Iterator[bytes]:
+        """Load all aggregates up front with set-based queries, then evaluate lazily per application.
+
+        Yields one serialized :class:`BatchEvaluateItem` per line (NDJSON). The
+        returned iterator performs no I/O, so it can be streamed after the
+        request's DB session has been released.
+        """
+        application_ids = list(dict.fromkeys(request.applicationIds))
+        logger.info("Batch evaluate request for %d applications", len(application_ids))
+
+        self.app_repository.read_own_writes(application_ids)
+        aggregates = await self.app_repository.get_aggregates(application_ids)
+        return self._iter_batch(application_ids, aggregates)
+
+    def _iter_batch(
+        self,
+        application_ids: list[UUID],
+        aggregates: dict[UUID, ApplicationAggregate],
+    ) -> Iterator[bytes]:
+        for application_id in application_ids:
+            aggregate = aggregates.get(application_id)
+            if aggregate is None:
+                yield self._batch_line(application_id, status.HTTP_404_NOT_FOUND, error="Application not found")
+                continue
+
+            try:
+                result = self.rule_service.evaluate(aggregate, request_section_data=None)
+            except HTTPException as exc:
+                yield self._batch_line(application_id, exc.status_code, error=str(exc.detail))
+                continue
+            except Exception as exc:
+                logger.error("Batch evaluate error for %s: %s", application_id, str(exc), exc_info=True)
+                yield self._batch_line(
+                    application_id,
+                    status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    error=f"Evaluate failed: {str(exc)}",
+                )
+                continue
+
+            yield self._batch_line(application_id, status.HTTP_200_OK, result=result)
+
+    def _batch_line(
+        self,
+        application_id: UUID,
+        status_code: int,
+        result: dict[str, Any] | None = None,
+        error: str | None = None,
+    ) -> bytes:
+        item = {"applicationId": application_id, "statusCode": status_code, "result": result, "error": error}
+        if self.validate_responses:
+            BatchEvaluateItem.model_validate(item)
+        return serialization.dumps(item) + b"\n"
+
+    def _serialize(self, document: dict[str, Any], values_only: bool = False) -> bytes:
+        if self.validate_responses:
+            # Debug mode: hold the trusted fast path to the published schema.
+            (EvaluateValuesResponse if values_only else EvaluateResponse).model_validate(document)
+        return serialization.dumps(document)
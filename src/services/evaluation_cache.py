@@ -0,0 +1,171 @@
+"""Cache of serialized /evaluate responses.
+
+Entries are keyed by the response ETag, which hashes the application's
+``data_version`` together with the rule plan digest and the request inputs.
+Section-data and override writes bump ``data_version`` in the same transaction
+as the write, so a committed write changes the key for every worker sharing the
+database; nothing is ever deleted explicitly and stale entries age out via
+LRU/TTL. Because keys are content addresses, a shared backend can be fronted by
+the per-process cache without any coherence protocol.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from functools import lru_cache
+from typing import Any, Mapping, Protocol
+from uuid import UUID
+
+from src.core.cache import LRUCache
+from src.core.config import get_settings
+from src.services.rule_plan import canonical_digest
+
+logger = logging.getLogger(__name__)
+
+
+class EvaluationCacheBackend(Protocol):
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes) -> None: ...
+
+    async def close(self) -> None: ...
+
+    def stats(self) -> dict[str, Any]: ...
+
+
+class InMemoryEvaluationCache:
+    def __init__(self, maxsize: int, ttl_seconds: float | None = None) -> None:
+        self._entries: LRUCache[str, bytes] = LRUCache(maxsize, ttl_seconds)
+
+    async def get(self, key: str) -> bytes | None:
+        return self._entries.get(key)
+
+    async def set(self, key: str, value: bytes) -> None:
+        self._entries.set(key, value)
+
+    async def close(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {"backend": "memory", **self._entries.stats().as_dict()}
+
+
+class RedisEvaluationCache:
+    """Shared backend for multi-worker deployments, fronted by a small per-process cache.
+
+    Redis failures degrade to cache misses; an evaluation never fails because of the cache.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        ttl_seconds: float,
+        local: InMemoryEvaluationCache | None = None,
+        key_prefix: str = "evaluate:",
+    ) -> None:
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as exc:
+            raise RuntimeError("EVALUATION_CACHE_URL requires the 'redis' package") from exc
+
+        self._client = redis_asyncio.from_url(url)
+        self._ttl_seconds = max(int(ttl_seconds), 1) if ttl_seconds > 0 else None
+        self._local = local
+        self._key_prefix = key_prefix
+        self._hits = 0
+        self._misses = 0
+        self._errors = 0
+
+    async def get(self, key: str) -> bytes | None:
+        if self._local is not None:
+            value = await self._local.get(key)
+            if value is not None:
+                return value
+
+        try:
+            value = await self._client.get(self._key_prefix + key)
+        except Exception as exc:
+            self._errors += 1
+            logger.warning("Evaluation cache read failed: %s", exc)
+            return None
+
+        if value is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        if self._local is not None:
+            await self._local.set(key, value)
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        if self._local is not None:
+            await self._local.set(key, value)
+        try:
+            await self._client.set(self._key_prefix + key, value, ex=self._ttl_seconds)
+        except Exception as exc:
+            self._errors += 1
+            logger.warning("Evaluation cache write failed: %s", exc)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "backend": "redis",
+            "hits": self._hits,
+            "misses": self._misses,
+            "errors": self._errors,
+            "local": self._local.stats() if self._local is not None else None,
+        }
+
+
+def evaluation_etag(
+    application_id: UUID,
+    data_version: int,
+    phase: str,
+    plan_digest: str,
+    request_section_data: Mapping[str, Any] | None,
+    evaluation_token: str | None,
+    view: str = "full",
+) -> str:
+    """Strong ETag for one evaluation; changes whenever any input to the response changes."""
+    parts = (
+        view,
+        str(application_id),
+        str(data_version),
+        phase,
+        plan_digest,
+        canonical_digest(request_section_data) if request_section_data else "-",
+        evaluation_token or "-",
+    )
+    digest = hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison per RFC 9110 section 13.1.2, as required for If-None-Match."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+@lru_cache
+def get_evaluation_cache() -> EvaluationCacheBackend | None:
+    settings = get_settings()
+    if settings.evaluation_cache_size <= 0:
+        return None
+
+    ttl_seconds = settings.evaluation_cache_ttl_seconds or None
+    local = InMemoryEvaluationCache(settings.evaluation_cache_size, ttl_seconds)
+    if settings.evaluation_cache_url:
+        return RedisEvaluationCache(settings.evaluation_cache_url, settings.evaluation_cache_ttl_seconds, local)
+    return local
@@ -0,0 +1,53 @@
+"""Opaque evaluation tokens for incremental /evaluate.
+
+A token records what the client already holds: the rule plan and override
+overlay it was evaluated against, plus a short digest of every section's
+merged data in plan order. It is stateless, so any worker can decode it.
+Format: ``<plan digest>.<overlay fingerprint>.<base64url section digests>``.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import json
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from src.services.rule_plan import PlanOverlay, RulePlan
+
+_PREFIX_LENGTH = 16
+_SECTION_DIGEST_SIZE = 6
+
+
+def section_digest(section_data: Mapping[str, Any]) -> bytes:
+    canonical = json.dumps(section_data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=_SECTION_DIGEST_SIZE).digest()
+
+
+def encode_token(plan: RulePlan, overlay: PlanOverlay, section_digests: Sequence[bytes]) -> str:
+    packed = base64.urlsafe_b64encode(b"".join(section_digests)).decode("ascii").rstrip("=")
+    return f"{plan.digest[:_PREFIX_LENGTH]}.{overlay.fingerprint[:_PREFIX_LENGTH]}.{packed}"
+
+
+def decode_token(token: str | None, plan: RulePlan, overlay: PlanOverlay) -> list[bytes] | None:
+    """Return the client's per-section digests, or ``None`` if a full evaluation is needed."""
+    if not token:
+        return None
+
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    plan_prefix, overlay_prefix, packed = parts
+    if plan_prefix != plan.digest[:_PREFIX_LENGTH] or overlay_prefix != overlay.fingerprint[:_PREFIX_LENGTH]:
+        return None
+
+    try:
+        raw = base64.urlsafe_b64decode(packed + "=" * (-len(packed) % 4))
+    except (binascii.Error, ValueError):
+        return None
+    if len(raw) != _SECTION_DIGEST_SIZE * len(plan.sections):
+        return None
+
+    return [raw[offset:offset + _SECTION_DIGEST_SIZE] for offset in range(0, len(raw), _SECTION_DIGEST_SIZE)]
@@ -0,0 +1,64 @@
+from fastapi import HTTPException, status
+
+from src.repositories.application_field_value_repository import (
+    ApplicationFieldValueRepository,
+    normalize_field_value,
+)
+from src.schemas.application import FieldValueLookupResponse, FieldValueMatch
+from src.services.rule_service import RuleService
+
+
+class FieldLookupService:
+    """Exact and prefix lookups on fields the rule config flags ``"indexed": true``.
+
+    Answered from the application_field_values index alone, for fraud and dedupe
+    checks such as "which applications carry this PAN".
+    """
+
+    def __init__(self, repository: ApplicationFieldValueRepository, rule_service: RuleService) -> None:
+        self.repository = repository
+        self.rule_service = rule_service
+
+    async def lookup(
+        self,
+        section_id: str,
+        field_id: str,
+        limit: int,
+        value: str | None = None,
+        prefix: str | None = None,
+    ) -> FieldValueLookupResponse:
+        if (value is None) == (prefix is None):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Exactly one of value and prefix must be given",
+            )
+        if not self.rule_service.is_indexed(section_id, field_id):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Field {section_id}.{field_id} is not indexed",
+            )
+        # Same normalization as at write time, so "abcde1234f " finds "ABCDE1234F".
+        normalized = normalize_field_value(value if value is not None else prefix)
+        if normalized is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Lookup value must be non-blank and at most 256 characters",
+            )
+
+        # One extra row tells whether the result was cut off.
+        matches = await self.repository.find(
+            section_id,
+            field_id,
+            value=normalized if value is not None else None,
+            prefix=normalized if prefix is not None else None,
+            limit=limit + 1,
+        )
+        return FieldValueLookupResponse(
+            sectionId=section_id,
+            fieldId=field_id,
+            matches=[
+                FieldValueMatch(applicationId=match.application_id, value=match.value)
+                for match in matches[:limit]
+            ],
+            truncated=len(matches) > limit,
+        )
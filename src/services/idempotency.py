@@ -0,0 +1,342 @@
+"""Idempotency-Key handling for mutating endpoints.
+
+The first request with a given key claims a row in ``idempotency_keys``
+(committed before any work starts) and stores its response when done. A retry
+with the same key and body gets the stored response back, marked with
+``Idempotent-Replayed: true``, without repeating any work. A duplicate that
+arrives while the original is still running waits for it: in-process through
+an event, across processes by polling the row. If the wait runs out, the
+duplicate gets 409. The owner holds a lease on the row and renews it while the
+handler runs, however long that takes; only a key whose lease ran out (its
+owner died) is taken over by a duplicate.
+
+Client errors (4xx) are stored like successes, because a retry would fail
+the same way. Server errors and cancelled requests release the key so the
+client can retry for real. Rows expire after the retention window and are
+deleted in small batches by a background purge, started at most once per
+purge interval.
+
+Through ``RequestIdempotency`` the claim and the stored outcome are written on
+the request's own primary session, so a request never needs a second writer
+connection (the SQLite profile has exactly one).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import timedelta
+from functools import lru_cache
+from typing import Any
+
+from fastapi import HTTPException, Response, status
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.config import get_settings
+from src.core.database import AsyncSessionLocal
+from src.core.serialization import dumps
+from src.models.idempotency_key import IdempotencyKey
+from src.repositories.idempotency_repository import IdempotencyRepository
+from src.services.rule_plan import canonical_digest
+
+logger = logging.getLogger(__name__)
+
+MAX_KEY_LENGTH = 255
+REPLAYED_HEADER = "Idempotent-Replayed"
+# Response headers worth replaying; body framing headers are recomputed.
+_STORED_HEADERS = ("location", "etag", "cache-control")
+
+
+class IdempotencyStore:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        retention_seconds: float = 86400.0,
+        wait_seconds: float = 10.0,
+        lease_seconds: float = 60.0,
+        purge_interval_seconds: float = 60.0,
+        purge_batch_size: int = 500,
+        poll_interval_seconds: float = 0.05,
+    ) -> None:
+        self.session_factory = session_factory
+        self.retention_seconds = retention_seconds
+        self.wait_seconds = wait_seconds
+        self.lease_seconds = lease_seconds
+        self.purge_interval_seconds = purge_interval_seconds
+        self.purge_batch_size = purge_batch_size
+        self.poll_interval_seconds = poll_interval_seconds
+        self._in_flight: dict[str, asyncio.Event] = {}
+        self._last_purge = 0.0
+        self._purge_task: asyncio.Task[None] | None = None
+
+        self._executed = 0
+        self._replayed = 0
+        self._waited = 0
+        self._conflicts = 0
+        self._purged = 0
+
+    async def run(
+        self,
+        scope: str,
+        key: str | None,
+        request: BaseModel,
+        handler: Callable[[], Awaitable[Any]],
+        session: AsyncSession | None = None,
+    ) -> Any:
+        """Run ``handler`` at most once per (scope, key); returns its result or the stored response.
+
+        With ``session`` the key's rows are written on it (after rolling back whatever the
+        handler left open) instead of on a session of their own.
+        """
+        if key is None:
+            return await handler()
+        if not key.strip() or len(key) > MAX_KEY_LENGTH:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters",
+            )
+
+        key_hash = hashlib.sha256(f"{scope}\x1f{key}".encode("utf-8")).hexdigest()
+        request_hash = canonical_digest(request.model_dump(mode="json"))
+        self._maybe_purge()
+
+        stored = await self._claim_or_wait(key_hash, request_hash, session)
+        if stored is not None:
+            self._replayed += 1
+            return self._replay(stored)
+
+        event = asyncio.Event()
+        self._in_flight[key_hash] = event
+        try:
+            result = await self._execute(key_hash, handler, session)
+        finally:
+            self._in_flight.pop(key_hash, None)
+            event.set()
+        self._executed += 1
+        return result
+
+    async def close(self) -> None:
+        if self._purge_task is not None:
+            await self._purge_task
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "executed": self._executed,
+            "replayed": self._replayed,
+            "waited": self._waited,
+            "conflicts": self._conflicts,
+            "inFlight": len(self._in_flight),
+            "purged": self._purged,
+        }
+
+    async def _claim_or_wait(
+        self,
+        key_hash: str,
+        request_hash: str,
+        session: AsyncSession | None,
+    ) -> IdempotencyKey | None:
+        """None once this request owns the key; otherwise the completed row to replay."""
+        deadline = time.monotonic() + self.wait_seconds
+        waited = False
+        while True:
+            async with self._session(session) as bookkeeping:
+                repository = IdempotencyRepository(bookkeeping)
+                now = repository.now_utc()
+                lease_expires_at = now + timedelta(seconds=self.lease_seconds)
+                claimed = await repository.insert(key_hash, request_hash, lease_expires_at)
+                if not claimed:
+                    claimed = await repository.take_over(
+                        key_hash,
+                        request_hash,
+                        lease_expires_at=lease_expires_at,
+                        completed_before=now - timedelta(seconds=self.retention_seconds),
+                        unleased_before=now - timedelta(seconds=self.lease_seconds),
+                    )
+                stored = None if claimed else await repository.get(key_hash)
+                await repository.commit()
+
+            if claimed:
+                return None
+            if stored is None:
+                # Deleted between our insert and read (released or purged); try again.
+                continue
+            if stored.request_hash != request_hash:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="Idempotency-Key was already used with a different request",
+                )
+            if stored.status_code is not None:
+                return stored
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._conflicts += 1
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="A request with this Idempotency-Key is still in progress",
+                )
+            if not waited:
+                self._waited += 1
+                waited = True
+            event = self._in_flight.get(key_hash)
+            try:
+                if event is not None:
+                    await asyncio.wait_for(event.wait(), timeout=remaining)
+                else:
+                    # Owned by another process.
+                    await asyncio.sleep(min(self.poll_interval_seconds, remaining))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _execute(
+        self,
+        key_hash: str,
+        handler: Callable[[], Awaitable[Any]],
+        session: AsyncSession | None,
+    ) -> Any:
+        renewal = asyncio.create_task(self._renew_lease(key_hash))
+        try:
+            result = await handler()
+        except HTTPException as exc:
+            renewal.cancel()
+            if exc.status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR:
+                await self._release(key_hash, session)
+            else:
+                await self._store(key_hash, exc.status_code, dumps({"detail": exc.detail}), exc.headers, session)
+            raise
+        except BaseException:
+            renewal.cancel()
+            await self._release(key_hash, session)
+            raise
+
+        renewal.cancel()
+        if isinstance(result, Response):
+            await self._store(key_hash, result.status_code, bytes(result.body), dict(result.headers), session)
+        else:
+            await self._store(key_hash, status.HTTP_200_OK, dumps(result.model_dump(mode="json")), None, session)
+        return result
+
+    async def _store(
+        self,
+        key_hash: str,
+        status_code: int,
+        body: bytes,
+        headers: dict[str, str] | None,
+        session: AsyncSession | None,
+    ) -> None:
+        kept = {name: value for name, value in (headers or {}).items() if name.lower() in _STORED_HEADERS}
+        try:
+            async with self._session(session) as bookkeeping:
+                repository = IdempotencyRepository(bookkeeping)
+                await repository.complete(key_hash, status_code, body, kept or None)
+                await repository.commit()
+        except Exception as exc:
+            # The response itself is fine; a retry will simply find the key in progress and then take it over.
+            logger.warning("Failed to store idempotent response: %s", exc)
+
+    async def _renew_lease(self, key_hash: str) -> None:
+        """Keep the lease ahead of the clock until cancelled; renewing at a third leaves two retries."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                async with self.session_factory() as session:
+                    repository = IdempotencyRepository(session)
+                    await repository.renew(key_hash, repository.now_utc() + timedelta(seconds=self.lease_seconds))
+                    await repository.commit()
+            except Exception as exc:
+                logger.warning("Failed to renew Idempotency-Key lease: %s", exc)
+
+    async def _release(self, key_hash: str, session: AsyncSession | None) -> None:
+        try:
+            async with self._session(session) as bookkeeping:
+                repository = IdempotencyRepository(bookkeeping)
+                await repository.delete(key_hash)
+                await repository.commit()
+        except Exception as exc:
+            logger.warning("Failed to release Idempotency-Key: %s", exc)
+
+    @asynccontextmanager
+    async def _session(self, session: AsyncSession | None) -> AsyncIterator[AsyncSession]:
+        if session is None:
+            async with self.session_factory() as own_session:
+                yield own_session
+            return
+        # Drop whatever the handler left uncommitted; the request is done with it.
+        await session.rollback()
+        try:
+            yield session
+        except BaseException:
+            await session.rollback()
+            raise
+
+    @staticmethod
+    def _replay(stored: IdempotencyKey) -> Response:
+        headers = dict(stored.response_headers or {})
+        headers[REPLAYED_HEADER] = "true"
+        return Response(
+            content=stored.response_body,
+            status_code=stored.status_code,
+            headers=headers,
+            media_type="application/json",
+        )
+
+    def _maybe_purge(self) -> None:
+        now = time.monotonic()
+        if now - self._last_purge < self.purge_interval_seconds:
+            return
+        if self._purge_task is not None and not self._purge_task.done():
+            return
+        self._last_purge = now
+        self._purge_task = asyncio.create_task(self._purge())
+
+    async def _purge(self) -> None:
+        try:
+            while True:
+                async with self.session_factory() as session:
+                    repository = IdempotencyRepository(session)
+                    cutoff = repository.now_utc() - timedelta(seconds=self.retention_seconds)
+                    deleted = await repository.purge(cutoff, self.purge_batch_size)
+                    await repository.commit()
+                self._purged += deleted
+                if deleted < self.purge_batch_size:
+                    return
+                # Short transactions; let request traffic in between batches.
+                await asyncio.sleep(0)
+        except Exception as exc:
+            logger.warning("Idempotency key purge failed: %s", exc)
+
+
+@dataclass(frozen=True, slots=True)
+class RequestIdempotency:
+    """The store bound to the request's primary session."""
+
+    store: IdempotencyStore
+    session: AsyncSession
+
+    async def run(
+        self,
+        scope: str,
+        key: str | None,
+        request: BaseModel,
+        handler: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        return await self.store.run(scope, key, request, handler, session=self.session)
+
+
+@lru_cache
+def get_idempotency_store() -> IdempotencyStore:
+    settings = get_settings()
+    return IdempotencyStore(
+        session_factory=AsyncSessionLocal,
+        retention_seconds=settings.idempotency_retention_seconds,
+        wait_seconds=settings.idempotency_wait_seconds,
+        lease_seconds=settings.idempotency_lease_seconds,
+        purge_interval_seconds=settings.idempotency_purge_interval_seconds,
+        purge_batch_size=settings.idempotency_purge_batch_size,
+    )
@@ -0,0 +1,189 @@
+"""Conditional flags for rule configs.
+
+A section or field may declare ``visibleWhen``, ``mandatoryWhen`` or
+``editableWhen`` next to the static flag. The value is a small expression
+over field values, compiled once per rule version into a closure:
+
+    employmentType == 'SALARIED'
+    monthlyIncome >= 25000 and PERSONAL_INFO.panNumber != null
+    employmentType in ('SALARIED', 'SELF_EMPLOYED') or not present(employmentType)
+
+A bare name refers to a field of the declaring section and ``SECTION.field``
+to a field of any section. Supported are literals (strings, numbers,
+``true``/``false``/``null`` and their Python spellings), tuples/lists of
+literals, comparisons including ``in``/``not in``, ``and``/``or``/``not``,
+unary minus and ``present(field)``. Anything else is rejected when the rule
+version is compiled. Comparing incompatible values (e.g. ``null < 5``) is
+simply false. Each condition records the fields it reads, which the
+compiler turns into a section dependency graph.
+"""
+
+from __future__ import annotations
+
+import ast
+import operator
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+# (section_id, field_id) -> current value, or None when absent.
+Lookup = Callable[[str, str], Any]
+_Node = Callable[[Lookup], Any]
+
+_MAX_EXPRESSION_LENGTH = 500
+_LITERAL_NAMES = {"true": True, "false": False, "null": None}
+_COMPARISONS: dict[type[ast.cmpop], Callable[[Any, Any], bool]] = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda left, right: left in right,
+    ast.NotIn: lambda left, right: left not in right,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Condition:
+    expression: str
+    evaluate: Callable[[Lookup], bool]
+    # Every (section_id, field_id) the expression reads.
+    inputs: frozenset[tuple[str, str]]
+
+
+def compile_condition(
+    expression: str,
+    section_id: str,
+    known_fields: Mapping[str, frozenset[str]],
+) -> Condition:
+    """Compile ``expression`` declared in ``section_id``; raises ValueError when it is not allowed."""
+    if not isinstance(expression, str) or not expression.strip():
+        raise ValueError("condition must be a non-empty string")
+    if len(expression) > _MAX_EXPRESSION_LENGTH:
+        raise ValueError(f"condition longer than {_MAX_EXPRESSION_LENGTH} characters")
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as exc:
+        raise ValueError(f"invalid condition {expression!r}: {exc.msg}") from exc
+
+    compiler = _Compiler(section_id, known_fields)
+    node = compiler.compile(tree.body)
+
+    def evaluate(lookup: Lookup) -> bool:
+        try:
+            return bool(node(lookup))
+        except TypeError:
+            return False
+
+    return Condition(expression=expression, evaluate=evaluate, inputs=frozenset(compiler.inputs))
+
+
+class _Compiler:
+    def __init__(self, section_id: str, known_fields: Mapping[str, frozenset[str]]) -> None:
+        self.section_id = section_id
+        self.known_fields = known_fields
+        self.inputs: set[tuple[str, str]] = set()
+
+    def compile(self, node: ast.AST) -> _Node:
+        if isinstance(node, ast.Constant):
+            return self._literal(node)
+        if isinstance(node, ast.Name):
+            if node.id in _LITERAL_NAMES:
+                value = _LITERAL_NAMES[node.id]
+                return lambda lookup: value
+            return self._field(self.section_id, node.id)
+        if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name):
+            return self._field(node.value.id, node.attr)
+        if isinstance(node, (ast.Tuple, ast.List, ast.Set)):
+            values = tuple(self._constant(element) for element in node.elts)
+            return lambda lookup: values
+        if isinstance(node, ast.BoolOp):
+            return self._bool_op(node)
+        if isinstance(node, ast.UnaryOp):
+            return self._unary_op(node)
+        if isinstance(node, ast.Compare):
+            return self._compare(node)
+        if isinstance(node, ast.Call):
+            return self._call(node)
+        raise ValueError(f"unsupported expression: {ast.unparse(node)!r}")
+
+    def _literal(self, node: ast.Constant) -> _Node:
+        value = _literal_value(node)
+        return lambda lookup: value
+
+    def _constant(self, node: ast.AST) -> Any:
+        if isinstance(node, ast.Constant):
+            return _literal_value(node)
+        if isinstance(node, ast.Name) and node.id in _LITERAL_NAMES:
+            return _LITERAL_NAMES[node.id]
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub) and isinstance(node.operand, ast.Constant):
+            return -node.operand.value
+        raise ValueError(f"only literals are allowed in collections: {ast.unparse(node)!r}")
+
+    def _field(self, section_id: str, field_id: str) -> _Node:
+        if field_id not in self.known_fields.get(section_id, frozenset()):
+            raise ValueError(f"unknown field {section_id}.{field_id}")
+        self.inputs.add((section_id, field_id))
+        return lambda lookup: lookup(section_id, field_id)
+
+    def _bool_op(self, node: ast.BoolOp) -> _Node:
+        operands = tuple(self.compile(value) for value in node.values)
+        if isinstance(node.op, ast.And):
+            return lambda lookup: all(operand(lookup) for operand in operands)
+        return lambda lookup: any(operand(lookup) for operand in operands)
+
+    def _unary_op(self, node: ast.UnaryOp) -> _Node:
+        operand = self.compile(node.operand)
+        if isinstance(node.op, ast.Not):
+            return lambda lookup: not operand(lookup)
+        if isinstance(node.op, ast.USub):
+            return lambda lookup: -operand(lookup)
+        raise ValueError(f"unsupported operator in {ast.unparse(node)!r}")
+
+    def _compare(self, node: ast.Compare) -> _Node:
+        try:
+            comparisons = tuple(_COMPARISONS[type(op)] for op in node.ops)
+        except KeyError:
+            raise ValueError(f"unsupported comparison in {ast.unparse(node)!r}") from None
+        operands = (self.compile(node.left), *(self.compile(value) for value in node.comparators))
+
+        def compare(lookup: Lookup) -> bool:
+            left = operands[0](lookup)
+            for comparison, right_operand in zip(comparisons, operands[1:]):
+                right = right_operand(lookup)
+                if not comparison(left, right):
+                    return False
+                left = right
+            return True
+
+        return compare
+
+    def _call(self, node: ast.Call) -> _Node:
+        if not (isinstance(node.func, ast.Name) and node.func.id == "present"):
+            raise ValueError(f"unsupported call: {ast.unparse(node)!r}")
+        if len(node.args) != 1 or node.keywords:
+            raise ValueError("present() takes exactly one field")
+        argument = node.args[0]
+        if not isinstance(argument, (ast.Name, ast.Attribute)) or (
+            isinstance(argument, ast.Name) and argument.id in _LITERAL_NAMES
+        ):
+            raise ValueError("present() takes exactly one field")
+        operand = self.compile(argument)
+        return lambda lookup: _present(operand(lookup))
+
+
+def _literal_value(node: ast.Constant) -> Any:
+    value = node.value
+    if value is not None and not isinstance(value, (str, int, float, bool)):
+        raise ValueError(f"unsupported literal: {value!r}")
+    return value
+
+
+def _present(value: Any) -> bool:
+    # Same notion of "has a value" as section status (rule_plan.has_value).
+    if value is None:
+        return False
+    if isinstance(value, str):
+        return value.strip() != ""
+    return True
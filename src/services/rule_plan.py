@@ -0,0 +1,487 @@
+"""Compiled, immutable rule plans.
+
+A rule config is compiled once per rule version into a tree of frozen, slotted
+objects with precomputed index maps. Application overrides never touch the
+plan; they resolve to a small :class:`PlanOverlay` that only holds the flags
+they set.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any
+
+from src.services.rule_conditions import Condition, Lookup, compile_condition
+from src.services.rule_validation import Validator, compile_validators
+
+FLAG_NAMES: tuple[str, str, str] = ("mandatory", "editable", "visible")
+MANDATORY, EDITABLE, VISIBLE = 0, 1, 2
+
+Flags = tuple[bool, bool, bool]
+# Per flag (mandatory, editable, visible): whether an override sets it explicitly.
+FlagMask = tuple[bool, bool, bool]
+# Per flag (mandatory, editable, visible): the condition replacing the static value, if any.
+Conditions = tuple[Condition | None, Condition | None, Condition | None]
+
+STATUS_PENDING = "PENDING"
+STATUS_IN_PROGRESS = "IN_PROGRESS"
+STATUS_COMPLETED = "COMPLETED"
+STATUS_HIDDEN = "HIDDEN"
+
+
+@dataclass(frozen=True, slots=True)
+class FieldPlan:
+    field_id: str
+    type: str
+    flags: Flags
+    validation: Mapping[str, Any]
+    validators: tuple[Validator, ...] = ()
+    conditions: Conditions | None = None
+    # Kept in the application_field_values lookup index.
+    indexed: bool = False
+
+    def validate(self, value: Any) -> list[str]:
+        """Error messages for ``value``; empty values are never invalid."""
+        if not self.validators or not has_value(value):
+            return []
+        return [message for validator in self.validators if (message := validator(value)) is not None]
+
+
+@dataclass(frozen=True, slots=True)
+class SectionPlan:
+    section_id: str
+    flags: Flags
+    fields: tuple[FieldPlan, ...]
+    field_index: Mapping[str, int]
+    conditions: Conditions | None = None
+    # Other sections whose data the conditions of this section or its fields read.
+    external_inputs: frozenset[str] = frozenset()
+    indexed_fields: frozenset[str] = frozenset()
+
+    def validate(self, section_data: Mapping[str, Any]) -> dict[str, list[str]]:
+        """Per-field error messages for the known fields in ``section_data``."""
+        errors: dict[str, list[str]] = {}
+        for field in self.fields:
+            if field.validators and field.field_id in section_data:
+                messages = field.validate(section_data[field.field_id])
+                if messages:
+                    errors[field.field_id] = messages
+        return errors
+
+
+@dataclass(frozen=True, slots=True)
+class ActionPlan:
+    action_id: str
+    trigger_field: str
+    # First section declaring ``trigger_field``; None when no section does.
+    trigger_section_id: str | None = None
+
+
+_NO_FLAGS: FlagMask = (False, False, False)
+
+
+@dataclass(frozen=True, slots=True)
+class PlanOverlay:
+    """Copy-on-write delta of flags layered over a :class:`RulePlan`."""
+
+    section_flags: Mapping[str, Flags]
+    field_flags: Mapping[tuple[str, str], Flags]
+    # Which of the flags above the override sets; conditions never replace those.
+    section_masks: Mapping[str, FlagMask]
+    field_masks: Mapping[tuple[str, str], FlagMask]
+    # Stable hash of the flags and masks; empty for the no-op overlay.
+    fingerprint: str = ""
+
+    def section(self, section: SectionPlan) -> Flags:
+        if not self.section_flags:
+            return section.flags
+        return self.section_flags.get(section.section_id, section.flags)
+
+    def field(self, section: SectionPlan, field: FieldPlan) -> Flags:
+        if not self.field_flags:
+            return field.flags
+        return self.field_flags.get((section.section_id, field.field_id), field.flags)
+
+    def section_mask(self, section: SectionPlan) -> FlagMask:
+        return self.section_masks.get(section.section_id, _NO_FLAGS)
+
+    def field_mask(self, section: SectionPlan, field: FieldPlan) -> FlagMask:
+        return self.field_masks.get((section.section_id, field.field_id), _NO_FLAGS)
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.section_flags and not self.field_flags
+
+
+EMPTY_OVERLAY = PlanOverlay(
+    section_flags=MappingProxyType({}),
+    field_flags=MappingProxyType({}),
+    section_masks=MappingProxyType({}),
+    field_masks=MappingProxyType({}),
+)
+
+
+class ConditionalOverlay:
+    """A :class:`PlanOverlay` plus conditional flags evaluated against one set of section data.
+
+    A condition replaces the static flag unless the override sets that flag, even
+    to its static value; overrides always win. Interchangeable with :class:`PlanOverlay` wherever flags
+    are read; ``fingerprint`` is the underlying overlay's.
+    """
+
+    __slots__ = ("base", "lookup")
+
+    def __init__(self, base: PlanOverlay, lookup: Lookup) -> None:
+        self.base = base
+        self.lookup = lookup
+
+    @property
+    def fingerprint(self) -> str:
+        return self.base.fingerprint
+
+    def section(self, section: SectionPlan) -> Flags:
+        flags = self.base.section(section)
+        if section.conditions is None:
+            return flags
+        return _apply_conditions(flags, self.base.section_mask(section), section.conditions, self.lookup)
+
+    def field(self, section: SectionPlan, field: FieldPlan) -> Flags:
+        flags = self.base.field(section, field)
+        if field.conditions is None:
+            return flags
+        return _apply_conditions(flags, self.base.field_mask(section, field), field.conditions, self.lookup)
+
+
+@dataclass(frozen=True, slots=True)
+class RulePlan:
+    rule_version: str
+    digest: str
+    sections: tuple[SectionPlan, ...]
+    section_index: Mapping[str, int]
+    actions: tuple[ActionPlan, ...]
+    # Dependency graph: section id -> other sections whose conditional flags read its data.
+    section_dependents: Mapping[str, frozenset[str]]
+    has_conditions: bool = False
+    # True when some section-level flag is conditional, i.e. which sections are
+    # mandatory cannot be known without the application's data.
+    has_section_conditions: bool = False
+
+    def get_section(self, section_id: str) -> SectionPlan | None:
+        index = self.section_index.get(section_id)
+        return None if index is None else self.sections[index]
+
+    def get_field(self, section_id: str, field_id: str) -> FieldPlan | None:
+        section = self.get_section(section_id)
+        if section is None:
+            return None
+        index = section.field_index.get(field_id)
+        return None if index is None else section.fields[index]
+
+    def get_action(self, action_id: str) -> ActionPlan | None:
+        for action in self.actions:
+            if action.action_id == action_id:
+                return action
+        return None
+
+    def resolve_conditions(
+        self,
+        overlay: PlanOverlay,
+        section_data: Mapping[str, Any],
+    ) -> PlanOverlay | ConditionalOverlay:
+        """Layer the conditional flags, evaluated against ``section_data``, over ``overlay``."""
+        if not self.has_conditions:
+            return overlay
+
+        def lookup(section_id: str, field_id: str) -> Any:
+            payload = section_data.get(section_id)
+            return payload.get(field_id) if isinstance(payload, Mapping) else None
+
+        return ConditionalOverlay(overlay, lookup)
+
+    def overlay(self, override_patch: Mapping[str, Any] | None) -> PlanOverlay:
+        """Resolve an override patch into the flags it sets."""
+        if not override_patch:
+            return EMPTY_OVERLAY
+
+        section_overrides = override_patch.get("sections", override_patch)
+        if not isinstance(section_overrides, Mapping):
+            return EMPTY_OVERLAY
+
+        section_flags: dict[str, Flags] = {}
+        field_flags: dict[tuple[str, str], Flags] = {}
+        section_masks: dict[str, FlagMask] = {}
+        field_masks: dict[tuple[str, str], FlagMask] = {}
+
+        for section_id, patch in section_overrides.items():
+            section = self.get_section(section_id)
+            if section is None or not isinstance(patch, Mapping):
+                continue
+
+            patched = _patch_flags(section.flags, patch)
+            if patched is not None:
+                section_flags[section_id], section_masks[section_id] = patched
+
+            field_overrides = patch.get("fields")
+            if not isinstance(field_overrides, Mapping):
+                continue
+
+            for field_id, field_patch in field_overrides.items():
+                index = section.field_index.get(field_id)
+                if index is None or not isinstance(field_patch, Mapping):
+                    continue
+                patched = _patch_flags(section.fields[index].flags, field_patch)
+                if patched is not None:
+                    field_flags[(section_id, field_id)], field_masks[(section_id, field_id)] = patched
+
+        if not section_flags and not field_flags:
+            return EMPTY_OVERLAY
+        fingerprint = hashlib.sha256(
+            repr(
+                (
+                    sorted(section_flags.items()),
+                    sorted(field_flags.items()),
+                    sorted(section_masks.items()),
+                    sorted(field_masks.items()),
+                )
+            ).encode("utf-8")
+        ).hexdigest()
+        return PlanOverlay(
+            section_flags=MappingProxyType(section_flags),
+            field_flags=MappingProxyType(field_flags),
+            section_masks=MappingProxyType(section_masks),
+            field_masks=MappingProxyType(field_masks),
+            fingerprint=fingerprint,
+        )
+
+
+def canonical_digest(document: Mapping[str, Any]) -> str:
+    """Content hash of a JSON document, independent of key order and whitespace."""
+    canonical = json.dumps(document, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _versioned_content(config: Mapping[str, Any]) -> Mapping[str, Any]:
+    """The config without its ``indexed`` field flags.
+
+    They only choose which fields the server mirrors into its lookup index, so
+    flagging a field must not change the plan digest (schema hash, status stamps,
+    evaluation tokens).
+    """
+    sections = config.get("sections")
+    if not isinstance(sections, list):
+        return config
+    return {
+        **config,
+        "sections": [
+            {
+                **section,
+                "fields": [
+                    {key: value for key, value in field.items() if key != "indexed"}
+                    if isinstance(field, Mapping)
+                    else field
+                    for field in section["fields"]
+                ],
+            }
+            if isinstance(section, Mapping) and isinstance(section.get("fields"), list)
+            else section
+            for section in sections
+        ],
+    }
+
+
+def compile_rule_plan(rule_version: str, config: Mapping[str, Any]) -> RulePlan:
+    """Compile a raw rule config into an immutable :class:`RulePlan`."""
+    sections: list[SectionPlan] = []
+    section_index: dict[str, int] = {}
+    # Conditions may reference fields of sections declared later.
+    known_fields = {
+        section_config["sectionId"]: frozenset(field["fieldId"] for field in section_config.get("fields", []))
+        for section_config in config.get("sections", [])
+    }
+    section_dependents: dict[str, set[str]] = {}
+
+    for section_config in config.get("sections", []):
+        section_id = section_config["sectionId"]
+        if section_id in section_index:
+            raise ValueError(f"Duplicate sectionId {section_id!r} in rule version {rule_version}")
+
+        fields: list[FieldPlan] = []
+        field_index: dict[str, int] = {}
+        input_sections: set[str] = set()
+        for field_config in section_config.get("fields", []):
+            field_id = field_config["fieldId"]
+            if field_id in field_index:
+                raise ValueError(f"Duplicate fieldId {section_id}.{field_id} in rule version {rule_version}")
+            validation = dict(field_config.get("validation") or {})
+            try:
+                validators = compile_validators(validation)
+            except ValueError as exc:
+                raise ValueError(
+                    f"Invalid validation for {section_id}.{field_id} in rule version {rule_version}: {exc}"
+                ) from exc
+            indexed = field_config.get("indexed", False)
+            if not isinstance(indexed, bool):
+                raise ValueError(f"indexed of {section_id}.{field_id} must be a boolean in rule version {rule_version}")
+            field_conditions = _read_conditions(
+                field_config, section_id, known_fields, f"{section_id}.{field_id} in rule version {rule_version}"
+            )
+            input_sections.update(_condition_sections(field_conditions))
+            field_index[field_id] = len(fields)
+            fields.append(
+                FieldPlan(
+                    field_id=field_id,
+                    type=field_config["type"],
+                    flags=_read_flags(field_config),
+                    validation=MappingProxyType(validation),
+                    validators=validators,
+                    conditions=field_conditions,
+                    indexed=indexed,
+                )
+            )
+
+        section_conditions = _read_conditions(
+            section_config, section_id, known_fields, f"{section_id} in rule version {rule_version}"
+        )
+        input_sections.update(_condition_sections(section_conditions))
+        for input_section in input_sections:
+            section_dependents.setdefault(input_section, set()).add(section_id)
+
+        section_index[section_id] = len(sections)
+        sections.append(
+            SectionPlan(
+                section_id=section_id,
+                flags=_read_flags(section_config),
+                fields=tuple(fields),
+                field_index=MappingProxyType(field_index),
+                conditions=section_conditions,
+                external_inputs=frozenset(input_sections - {section_id}),
+                indexed_fields=frozenset(field.field_id for field in fields if field.indexed),
+            )
+        )
+
+    actions = tuple(
+        ActionPlan(
+            action_id=action["actionId"],
+            trigger_field=action["triggerField"],
+            trigger_section_id=next(
+                (section.section_id for section in sections if action["triggerField"] in section.field_index),
+                None,
+            ),
+        )
+        for action in config.get("actions", [])
+    )
+
+    return RulePlan(
+        rule_version=rule_version,
+        digest=canonical_digest(_versioned_content(config)),
+        sections=tuple(sections),
+        section_index=MappingProxyType(section_index),
+        actions=actions,
+        section_dependents=MappingProxyType(
+            {section_id: frozenset(dependents) for section_id, dependents in section_dependents.items()}
+        ),
+        # Not just section_dependents: a condition may read no fields at all ("false").
+        has_conditions=any(
+            section.conditions is not None or any(field.conditions is not None for field in section.fields)
+            for section in sections
+        ),
+        has_section_conditions=any(section.conditions is not None for section in sections),
+    )
+
+
+def derive_section_status(
+    section: SectionPlan,
+    overlay: PlanOverlay | ConditionalOverlay,
+    section_data: Mapping[str, Any],
+) -> str:
+    if not overlay.section(section)[VISIBLE]:
+        return STATUS_HIDDEN
+
+    has_mandatory = False
+    all_mandatory_completed = True
+    any_value_present = False
+    for field in section.fields:
+        flags = overlay.field(section, field)
+        present = has_value(section_data.get(field.field_id))
+        any_value_present = any_value_present or present
+        if flags[MANDATORY] and flags[VISIBLE]:
+            has_mandatory = True
+            all_mandatory_completed = all_mandatory_completed and present
+
+    if not has_mandatory or all_mandatory_completed:
+        return STATUS_COMPLETED
+    return STATUS_IN_PROGRESS if any_value_present else STATUS_PENDING
+
+
+def status_stamp(plan: RulePlan, overlay: PlanOverlay) -> str:
+    """Identifies the rules a persisted section status was derived under."""
+    return f"{plan.digest[:16]}:{overlay.fingerprint[:16] or '-'}"
+
+
+def has_value(value: Any) -> bool:
+    if value is None:
+        return False
+    if isinstance(value, str):
+        return value.strip() != ""
+    return True
+
+
+def _read_flags(config: Mapping[str, Any]) -> Flags:
+    return (bool(config["mandatory"]), bool(config["editable"]), bool(config["visible"]))
+
+
+def _read_conditions(
+    config: Mapping[str, Any],
+    section_id: str,
+    known_fields: Mapping[str, frozenset[str]],
+    owner: str,
+) -> Conditions | None:
+    conditions: list[Condition | None] = []
+    for flag in FLAG_NAMES:
+        expression = config.get(f"{flag}When")
+        if expression is None:
+            conditions.append(None)
+            continue
+        try:
+            conditions.append(compile_condition(expression, section_id, known_fields))
+        except ValueError as exc:
+            raise ValueError(f"Invalid {flag}When for {owner}: {exc}") from exc
+    if not any(conditions):
+        return None
+    return (conditions[0], conditions[1], conditions[2])
+
+
+def _condition_sections(conditions: Conditions | None) -> set[str]:
+    if conditions is None:
+        return set()
+    return {section_id for condition in conditions if condition is not None for section_id, _ in condition.inputs}
+
+
+def _apply_conditions(current: Flags, overridden: FlagMask, conditions: Conditions, lookup: Lookup) -> Flags:
+    # A flag the override sets keeps the override's value.
+    flags = list(current)
+    for index, condition in enumerate(conditions):
+        if condition is not None and not overridden[index]:
+            flags[index] = condition.evaluate(lookup)
+    return (flags[0], flags[1], flags[2])
+
+
+def _patch_flags(flags: Flags, patch: Mapping[str, Any]) -> tuple[Flags, FlagMask] | None:
+    """Return the patched flags and which of them the patch sets, or ``None`` when it sets none.
+
+    A flag set to its static value is kept: it still pins the flag against conditions.
+    """
+    patched = list(flags)
+    mask = [False, False, False]
+    for index, flag in enumerate(FLAG_NAMES):
+        value = patch.get(flag)
+        if isinstance(value, bool):
+            patched[index] = value
+            mask[index] = True
+    if not any(mask):
+        return None
+    return (patched[0], patched[1], patched[2]), (mask[0], mask[1], mask[2])
@@ -0,0 +1,159 @@
+"""Per-process registry of compiled rule plans.
+
+Rule configs live as ``<rule_version>.json`` files in ``Settings.rule_config_dir``.
+Each version is compiled exactly once; the registry re-scans the directory at
+most every ``rule_reload_interval_seconds`` and recompiles only files whose
+content changed. A reload swaps the whole snapshot in one assignment, so an
+evaluation that already holds a :class:`RulePlan` keeps using it untouched.
+
+Resolved override overlays are cached per plan and canonical override hash;
+many applications share identical override patches (branch/product templates).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+
+from src.core.cache import LRUCache
+from src.core.config import get_settings
+from src.services.rule_plan import EMPTY_OVERLAY, PlanOverlay, RulePlan, canonical_digest, compile_rule_plan
+
+logger = logging.getLogger(__name__)
+
+_RULE_FILE_SUFFIX = ".json"
+
+
+@dataclass(frozen=True, slots=True)
+class RuleSnapshot:
+    plans: Mapping[str, RulePlan]
+    # (mtime_ns, size) per version, used to skip unchanged files on re-scan.
+    file_stamps: Mapping[str, tuple[int, int]]
+
+
+_EMPTY_SNAPSHOT = RuleSnapshot(plans=MappingProxyType({}), file_stamps=MappingProxyType({}))
+
+
+class RuleRegistry:
+    def __init__(
+        self,
+        rule_config_dir: str | Path,
+        reload_interval_seconds: float = 0.0,
+        overlay_cache_size: int = 1024,
+    ) -> None:
+        self.rule_config_dir = Path(rule_config_dir)
+        self.reload_interval_seconds = reload_interval_seconds
+        # Keyed by (rule_version, plan digest, override hash): a reloaded version never sees stale overlays.
+        self.overlay_cache: LRUCache[tuple[str, str, str], PlanOverlay] = LRUCache(overlay_cache_size)
+        # Serialized rule schemas, keyed by (rule_version, plan digest).
+        self.schema_cache: LRUCache[tuple[str, str], bytes] = LRUCache(64)
+        self._snapshot = _EMPTY_SNAPSHOT
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.reload()
+
+    @property
+    def snapshot(self) -> RuleSnapshot:
+        return self._snapshot
+
+    def versions(self) -> list[str]:
+        self._maybe_reload()
+        return sorted(self._snapshot.plans)
+
+    def get_plan(self, rule_version: str) -> RulePlan | None:
+        self._maybe_reload()
+        return self._snapshot.plans.get(rule_version)
+
+    def resolve_overlay(self, plan: RulePlan, override_patch: Mapping[str, Any] | None) -> PlanOverlay:
+        if not override_patch:
+            return EMPTY_OVERLAY
+        key = (plan.rule_version, plan.digest, canonical_digest(override_patch))
+        return self.overlay_cache.get_or_set(key, lambda: plan.overlay(override_patch))
+
+    def reload(self) -> RuleSnapshot:
+        """Re-scan the rule directory and atomically publish a new snapshot."""
+        with self._lock:
+            current = self._snapshot
+            plans: dict[str, RulePlan] = {}
+            stamps: dict[str, tuple[int, int]] = {}
+
+            for version, path, stamp in self._scan():
+                previous = current.plans.get(version)
+                if current.file_stamps.get(version) == stamp:
+                    # Unchanged since the last scan (including files that failed to compile).
+                    if previous is not None:
+                        plans[version] = previous
+                    stamps[version] = stamp
+                    continue
+
+                try:
+                    config = json.loads(path.read_text(encoding="utf-8"))
+                    plan = compile_rule_plan(version, config)
+                except (OSError, ValueError, KeyError, TypeError) as exc:
+                    logger.error("Failed to load rule version %s from %s: %s", version, path, exc)
+                    if previous is not None:
+                        plans[version] = previous
+                    stamps[version] = stamp
+                    continue
+
+                if previous is not None and previous.digest == plan.digest:
+                    plan = previous
+                else:
+                    logger.info("Compiled rule version %s (digest=%s)", version, plan.digest[:12])
+                plans[version] = plan
+                stamps[version] = stamp
+
+            for version in current.plans.keys() - plans.keys():
+                logger.warning("Rule version %s is no longer available", version)
+
+            self._snapshot = RuleSnapshot(
+                plans=MappingProxyType(plans),
+                file_stamps=MappingProxyType(stamps),
+            )
+            self._checked_at = time.monotonic()
+            return self._snapshot
+
+    def _maybe_reload(self) -> None:
+        if self.reload_interval_seconds <= 0:
+            return
+        if time.monotonic() - self._checked_at < self.reload_interval_seconds:
+            return
+        if self._lock.locked():
+            # Another caller is already reloading; keep serving the current snapshot.
+            return
+        self.reload()
+
+    def _scan(self) -> list[tuple[str, Path, tuple[int, int]]]:
+        try:
+            entries = list(os.scandir(self.rule_config_dir))
+        except FileNotFoundError:
+            logger.error("Rule config directory not found: %s", self.rule_config_dir)
+            return []
+
+        found = []
+        for entry in entries:
+            if not entry.is_file() or not entry.name.endswith(_RULE_FILE_SUFFIX):
+                continue
+            stat = entry.stat()
+            version = entry.name[: -len(_RULE_FILE_SUFFIX)]
+            found.append((version, Path(entry.path), (stat.st_mtime_ns, stat.st_size)))
+        return found
+
+
+@lru_cache
+def get_rule_registry() -> RuleRegistry:
+    settings = get_settings()
+    return RuleRegistry(
+        rule_config_dir=settings.rule_config_dir,
+        reload_interval_seconds=settings.rule_reload_interval_seconds,
+        overlay_cache_size=settings.override_cache_size,
+    )
@@ -1,142 +1,187 @@
 from __future__ import annotations
 
-from copy import deepcopy
+from collections.abc import Mapping
 from typing import Any
-from uuid import UUID
 
 from fastapi import HTTPException, status
 
-from src.repositories.application_override_repository import ApplicationOverrideRepository
-from src.repositories.application_section_data_repository import ApplicationSectionDataRepository
-from src.schemas.evaluate import Action, EvaluateResponse, Field, Section
+from src.core import serialization
+from src.repositories.application_repository import ApplicationAggregate
+from src.services.evaluation_token import decode_token, encode_token, section_digest
+from src.services.rule_plan import (
+    EDITABLE,
+    FLAG_NAMES,
+    MANDATORY,
+    STATUS_COMPLETED,
+    VISIBLE,
+    ConditionalOverlay,
+    Conditions,
+    Flags,
+    PlanOverlay,
+    RulePlan,
+    SectionPlan,
+    derive_section_status,
+    status_stamp,
+)
+from src.services.rule_registry import RuleRegistry
 
 
 class RuleService:
-    _ALLOWED_OVERRIDE_FLAGS = {"mandatory", "editable", "visible"}
-    _SUPPORTED_RULE_VERSION = "1.0.0"
-
-    _BASE_RULE_CONFIG: dict[str, Any] = {
-        "sections": [
-            {
-                "sectionId": "PERSONAL_INFO",
-                "mandatory": True,
-                "editable": True,
-                "visible": True,
-                "fields": [
-                    {
-                        "fieldId": "fullName",
-                        "type": "string",
-                        "mandatory": True,
-                        "editable": True,
-                        "visible": True,
-                        "validation": {"minLength": 2},
-                    },
-                    {
-                        "fieldId": "dateOfBirth",
-                        "type": "date",
-                        "mandatory": True,
-                        "editable": True,
-                        "visible": True,
-                        "validation": {},
-                    },
-                    {
-                        "fieldId": "panNumber",
-                        "type": "string",
-                        "mandatory": True,
-                        "editable": True,
-                        "visible": True,
-                        "validation": {"pattern": "^[A-Z]{5}[0-9]{4}[A-Z]$"},
-                    },
-                ],
-            },
-            {
-                "sectionId": "KYC",
-                "mandatory": True,
-                "editable": True,
-                "visible": True,
-                "fields": [
-                    {
-                        "fieldId": "panVerified",
-                        "type": "boolean",
-                        "mandatory": True,
-                        "editable": False,
-                        "visible": True,
-                        "validation": {},
-                    },
-                    {
-                        "fieldId": "panHolderName",
-                        "type": "string",
-                        "mandatory": False,
-                        "editable": False,
-                        "visible": True,
-                        "validation": {},
-                    },
-                ],
-            },
-            {
-                "sectionId": "EMPLOYMENT",
-                "mandatory": False,
-                "editable": True,
-                "visible": True,
-                "fields": [
-                    {
-                        "fieldId": "employmentType",
-                        "type": "string",
-                        "mandatory": False,
-                        "editable": True,
-                        "visible": True,
-                        "validation": {},
-                    },
-                    {
-                        "fieldId": "monthlyIncome",
-                        "type": "number",
-                        "mandatory": False,
-                        "editable": True,
-                        "visible": True,
-                        "validation": {"min": 0},
-                    },
-                ],
-            },
-        ],
-        "actions": [
-            {
-                "actionId": "VERIFY_PAN",
-                "triggerField": "panNumber",
-            },
-        ],
-    }
+    def __init__(self, rule_registry: RuleRegistry) -> None:
+        self.rule_registry = rule_registry
 
-    def __init__(
-        self,
-        section_data_repository: ApplicationSectionDataRepository,
-        override_repository: ApplicationOverrideRepository,
-    ) -> None:
-        self.section_data_repository = section_data_repository
-        self.override_repository = override_repository
-
-    async def evaluate(
-        self,
-        application_id: UUID,
-        rule_version: str,
-        phase: str,
-        request_section_data: dict[str, Any] | None,
-    ) -> EvaluateResponse:
-        if rule_version != self._SUPPORTED_RULE_VERSION:
+    def get_plan(self, rule_version: str) -> RulePlan:
+        plan = self.rule_registry.get_plan(rule_version)
+        if plan is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Unsupported rule version",
             )
+        return plan
+
+    def resolve(self, rule_version: str, override_patch: dict[str, Any] | None) -> tuple[RulePlan, PlanOverlay]:
+        plan = self.get_plan(rule_version)
+        return plan, self.rule_registry.resolve_overlay(plan, override_patch)
+
+    def section_status(
+        self,
+        rule_version: str,
+        override_patch: dict[str, Any] | None,
+        section_id: str,
+        section_data: dict[str, Any],
+        other_sections: Mapping[str, Any] | None = None,
+    ) -> tuple[str | None, str | None]:
+        """(status, status_stamp) to persist with a section write; (None, None) for unknown sections.
+
+        ``other_sections`` must hold the sections listed by :meth:`input_sections`.
+        """
+        plan = self.rule_registry.get_plan(rule_version)
+        section = plan.get_section(section_id) if plan is not None else None
+        if section is None:
+            return None, None
+        overlay = self.rule_registry.resolve_overlay(plan, override_patch)
+        flags = plan.resolve_conditions(overlay, {**(other_sections or {}), section_id: section_data})
+        return derive_section_status(section, flags, section_data), status_stamp(plan, overlay)
+
+    def section_errors(
+        self,
+        rule_version: str,
+        override_patch: dict[str, Any] | None,
+        section_id: str,
+        section_data: dict[str, Any],
+        other_sections: Mapping[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Validation errors of one section payload; empty for unknown sections."""
+        plan = self.rule_registry.get_plan(rule_version)
+        if plan is None:
+            return []
+        overlay = self.rule_registry.resolve_overlay(plan, override_patch)
+        flags = plan.resolve_conditions(overlay, {**(other_sections or {}), section_id: section_data})
+        return self.validation_errors(plan, flags, {section_id: section_data})
+
+    def input_sections(self, rule_version: str, section_id: str) -> frozenset[str]:
+        """Other sections whose data the conditional flags of ``section_id`` read."""
+        plan = self.rule_registry.get_plan(rule_version)
+        section = plan.get_section(section_id) if plan is not None else None
+        return section.external_inputs if section is not None else frozenset()
+
+    def dependent_sections(self, rule_version: str, section_id: str) -> frozenset[str]:
+        """Other sections whose stored status goes stale when ``section_id`` is written."""
+        plan = self.rule_registry.get_plan(rule_version)
+        if plan is None:
+            return frozenset()
+        return plan.section_dependents.get(section_id, frozenset()) - {section_id}
+
+    def indexed_fields(self, rule_version: str, section_id: str) -> frozenset[str]:
+        """Fields of ``section_id`` kept in the field-value lookup index."""
+        plan = self.rule_registry.get_plan(rule_version)
+        section = plan.get_section(section_id) if plan is not None else None
+        return section.indexed_fields if section is not None else frozenset()
+
+    def is_indexed(self, section_id: str, field_id: str) -> bool:
+        """Whether any loaded rule version indexes ``section_id.field_id``."""
+        return any(
+            field_id in self.indexed_fields(rule_version, section_id)
+            for rule_version in self.rule_registry.versions()
+        )
+
+    def validation_errors(
+        self,
+        plan: RulePlan,
+        overlay: PlanOverlay | ConditionalOverlay,
+        section_data: Mapping[str, Any],
+    ) -> list[dict[str, Any]]:
+        """:class:`FieldError` documents for visible fields, in plan order.
+
+        Hidden sections and fields are skipped: their values are never shown
+        to the user, so they cannot be corrected.
+        """
+        errors: list[dict[str, Any]] = []
+        for section in plan.sections:
+            payload = section_data.get(section.section_id)
+            if not payload or not isinstance(payload, dict) or not overlay.section(section)[VISIBLE]:
+                continue
+            for field_id, messages in section.validate(payload).items():
+                if overlay.field(section, section.fields[section.field_index[field_id]])[VISIBLE]:
+                    errors.append({"sectionId": section.section_id, "fieldId": field_id, "messages": messages})
+        return errors
+
+    def section_statuses(
+        self,
+        plan: RulePlan,
+        overlay: PlanOverlay | ConditionalOverlay,
+        section_data: Mapping[str, Any],
+    ) -> dict[str, str]:
+        statuses: dict[str, str] = {}
+        for section_id, payload in section_data.items():
+            section = plan.get_section(section_id)
+            if section is not None:
+                statuses[section_id] = derive_section_status(
+                    section, overlay, payload if isinstance(payload, dict) else {}
+                )
+        return statuses
 
-        config = deepcopy(self._BASE_RULE_CONFIG)
+    def missing_mandatory_sections(
+        self,
+        plan: RulePlan,
+        overlay: PlanOverlay | ConditionalOverlay,
+        statuses: Mapping[str, str],
+    ) -> list[str]:
+        """Mandatory, visible sections that are not COMPLETED; sections without a stored
+        status are judged as if they had no data."""
+        missing: list[str] = []
+        for section in plan.sections:
+            flags = overlay.section(section)
+            if not (flags[MANDATORY] and flags[VISIBLE]):
+                continue
+            section_status = statuses.get(section.section_id)
+            if section_status is None:
+                section_status = derive_section_status(section, overlay, {})
+            if section_status != STATUS_COMPLETED:
+                missing.append(section.section_id)
+        return missing
 
-        override = await self.override_repository.get_by_application_id(application_id)
-        if override is not None:
-            self._apply_overrides(config, override.override_patch)
+    def evaluate(
+        self,
+        aggregate: ApplicationAggregate,
+        request_section_data: dict[str, Any] | None,
+        evaluation_token: str | None = None,
+        values_only: bool = False,
+    ) -> dict[str, Any]:
+        """Evaluate an already-loaded application aggregate; performs no I/O.
+
+        Returns the :class:`EvaluateResponse` document (or, with ``values_only``, the
+        :class:`EvaluateValuesResponse` document) as plain JSON-ready data built
+        straight from the compiled plan. It is trusted output and is not re-validated;
+        see ``Settings.validate_responses``.
+        """
+        application = aggregate.application
+        # The plan is pinned for the whole evaluation, even if a reload happens meanwhile.
+        plan = self.get_plan(application.rule_version)
+        overlay = self.rule_registry.resolve_overlay(plan, aggregate.override_patch)
 
-        persisted_section_data = await self.section_data_repository.get_by_application_id(application_id)
-        persisted_map = {item.section_id: item.data for item in persisted_section_data}
         request_map = self._normalize_section_input(request_section_data)
-        merged_map = dict(persisted_map)
+        merged_map = dict(aggregate.section_data)
         for section_id, section_payload in request_map.items():
             current = merged_map.get(section_id, {})
             if isinstance(current, dict):
@@ -146,98 +191,174 @@ class RuleService:
             else:
                 merged_map[section_id] = section_payload
 
-        sections = [
-            self._materialize_section(section_config, merged_map.get(section_config["sectionId"], {}))
-            for section_config in config["sections"]
+        section_payloads = [merged_map.get(section_plan.section_id, {}) for section_plan in plan.sections]
+        digests = [
+            section_digest(payload if isinstance(payload, dict) else {})
+            for payload in section_payloads
         ]
-        actions = [Action(**action_config) for action_config in config["actions"]]
-
-        return EvaluateResponse(
-            ruleVersion=rule_version,
-            applicationId=application_id,
-            phase=phase,
-            sections=sections,
-            actions=actions,
-        )
-
-    def _apply_overrides(self, config: dict[str, Any], override_patch: dict[str, Any]) -> None:
-        section_overrides = override_patch.get("sections", override_patch)
-        if not isinstance(section_overrides, dict):
-            return
+        previous_digests = decode_token(evaluation_token, plan, overlay)
+        affected: set[str] | None = None
+        if previous_digests is not None:
+            # Changed sections plus, via the dependency graph, every section whose conditions read them.
+            affected = set()
+            for section_plan, previous, current in zip(plan.sections, previous_digests, digests):
+                if previous != current:
+                    affected.add(section_plan.section_id)
+                    affected.update(plan.section_dependents.get(section_plan.section_id, ()))
 
-        sections_by_id = {section["sectionId"]: section for section in config["sections"]}
+        flags = plan.resolve_conditions(overlay, merged_map)
+        validation_errors = self.validation_errors(plan, flags, merged_map)
 
-        for section_id, patch in section_overrides.items():
-            section = sections_by_id.get(section_id)
-            if section is None or not isinstance(patch, dict):
-                continue
+        sections = [
+            self._materialize_section(section_plan, flags, payload, values_only)
+            for section_plan, payload in zip(plan.sections, section_payloads)
+            if affected is None or section_plan.section_id in affected
+        ]
+        if values_only:
+            return {
+                "ruleVersion": plan.rule_version,
+                "schemaHash": plan.digest,
+                "applicationId": application.id,
+                "phase": application.phase,
+                "sections": sections,
+                "evaluationToken": encode_token(plan, overlay, digests),
+                "incremental": previous_digests is not None,
+                "validationErrors": validation_errors,
+            }
 
-            self._apply_flag_patch(section, patch)
+        actions = [
+            {"actionId": action.action_id, "triggerField": action.trigger_field}
+            for action in plan.actions
+        ]
 
-            field_overrides = patch.get("fields")
-            if not isinstance(field_overrides, dict):
-                continue
+        return {
+            "ruleVersion": plan.rule_version,
+            "applicationId": application.id,
+            "phase": application.phase,
+            "sections": sections,
+            "actions": actions,
+            "evaluationToken": encode_token(plan, overlay, digests),
+            "incremental": previous_digests is not None,
+            "validationErrors": validation_errors,
+        }
 
-            fields_by_id = {field["fieldId"]: field for field in section["fields"]}
-            for field_id, field_patch in field_overrides.items():
-                field = fields_by_id.get(field_id)
-                if field is None or not isinstance(field_patch, dict):
-                    continue
-                self._apply_flag_patch(field, field_patch)
-
-    def _apply_flag_patch(self, target: dict[str, Any], patch: dict[str, Any]) -> None:
-        for flag in self._ALLOWED_OVERRIDE_FLAGS:
-            value = patch.get(flag)
-            if isinstance(value, bool):
-                target[flag] = value
-
-    def _materialize_section(self, section_config: dict[str, Any], section_data: dict[str, Any]) -> Section:
-        fields: list[Field] = []
+    def _materialize_section(
+        self,
+        section_plan: SectionPlan,
+        overlay: PlanOverlay | ConditionalOverlay,
+        section_data: dict[str, Any],
+        values_only: bool = False,
+    ) -> dict[str, Any]:
         normalized_section_data = section_data if isinstance(section_data, dict) else {}
 
-        for field_config in section_config["fields"]:
-            field_id = field_config["fieldId"]
-            value = normalized_section_data.get(field_id)
-            field = Field(
-                fieldId=field_id,
-                type=field_config["type"],
-                value=value,
-                mandatory=field_config["mandatory"],
-                editable=field_config["editable"],
-                visible=field_config["visible"],
-                validation=field_config["validation"],
+        section_flags = overlay.section(section_plan)
+        if values_only:
+            return self._section_values(section_plan, overlay, section_flags, normalized_section_data)
+
+        fields: list[dict[str, Any]] = []
+        for field_plan in section_plan.fields:
+            flags = overlay.field(section_plan, field_plan)
+            fields.append(
+                {
+                    "fieldId": field_plan.field_id,
+                    "type": field_plan.type,
+                    "value": normalized_section_data.get(field_plan.field_id),
+                    "mandatory": flags[MANDATORY],
+                    "editable": flags[EDITABLE],
+                    "visible": flags[VISIBLE],
+                    "validation": field_plan.validation,
+                }
             )
-            fields.append(field)
 
-        status = self._derive_section_status(
-            section_visible=section_config["visible"],
-            fields=fields,
-        )
+        return {
+            "sectionId": section_plan.section_id,
+            "mandatory": section_flags[MANDATORY],
+            "editable": section_flags[EDITABLE],
+            "visible": section_flags[VISIBLE],
+            "status": derive_section_status(section_plan, overlay, normalized_section_data),
+            "fields": fields,
+        }
 
-        return Section(
-            sectionId=section_config["sectionId"],
-            mandatory=section_config["mandatory"],
-            editable=section_config["editable"],
-            visible=section_config["visible"],
-            status=status,
-            fields=fields,
-        )
+    def _section_values(
+        self,
+        section_plan: SectionPlan,
+        overlay: PlanOverlay | ConditionalOverlay,
+        section_flags: Flags,
+        section_data: dict[str, Any],
+    ) -> dict[str, Any]:
+        values: dict[str, Any] = {}
+        field_flags: dict[str, dict[str, bool]] = {}
+        for field_plan in section_plan.fields:
+            value = section_data.get(field_plan.field_id)
+            if value is not None:
+                values[field_plan.field_id] = value
+            flags = overlay.field(section_plan, field_plan)
+            if flags != field_plan.flags:
+                field_flags[field_plan.field_id] = {
+                    "mandatory": flags[MANDATORY],
+                    "editable": flags[EDITABLE],
+                    "visible": flags[VISIBLE],
+                }
 
-    def _derive_section_status(self, section_visible: bool, fields: list[Field]) -> str:
-        if not section_visible:
-            return "HIDDEN"
+        return {
+            "sectionId": section_plan.section_id,
+            "mandatory": section_flags[MANDATORY],
+            "editable": section_flags[EDITABLE],
+            "visible": section_flags[VISIBLE],
+            "status": derive_section_status(section_plan, overlay, section_data),
+            "values": values,
+            "fieldFlags": field_flags,
+        }
 
-        mandatory_fields = [field for field in fields if field.mandatory and field.visible]
-        if not mandatory_fields:
-            return "COMPLETED"
+    def rule_schema(self, rule_version: str, schema_hash: str | None = None) -> tuple[str, bytes]:
+        """(schema hash, serialized :class:`RuleSchemaResponse`) of the current plan.
 
-        mandatory_values = [self._has_value(field.value) for field in mandatory_fields]
-        all_mandatory_completed = all(mandatory_values)
-        if all_mandatory_completed:
-            return "COMPLETED"
+        A ``schema_hash`` that no longer matches the loaded plan is reported as not
+        found: hash-addressed content must never change.
+        """
+        plan = self.rule_registry.get_plan(rule_version)
+        if plan is None or (schema_hash is not None and schema_hash != plan.digest):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Rule schema not found",
+            )
+        body = self.rule_registry.schema_cache.get_or_set(
+            (plan.rule_version, plan.digest),
+            lambda: serialization.dumps(self._schema_document(plan)),
+        )
+        return plan.digest, body
 
-        any_value_present = any(self._has_value(field.value) for field in fields)
-        return "IN_PROGRESS" if any_value_present else "PENDING"
+    def _schema_document(self, plan: RulePlan) -> dict[str, Any]:
+        return {
+            "ruleVersion": plan.rule_version,
+            "schemaHash": plan.digest,
+            "sections": [
+                {
+                    "sectionId": section.section_id,
+                    "mandatory": section.flags[MANDATORY],
+                    "editable": section.flags[EDITABLE],
+                    "visible": section.flags[VISIBLE],
+                    **_condition_expressions(section.conditions),
+                    "fields": [
+                        {
+                            "fieldId": field.field_id,
+                            "type": field.type,
+                            "mandatory": field.flags[MANDATORY],
+                            "editable": field.flags[EDITABLE],
+                            "visible": field.flags[VISIBLE],
+                            **_condition_expressions(field.conditions),
+                            "validation": field.validation,
+                        }
+                        for field in section.fields
+                    ],
+                }
+                for section in plan.sections
+            ],
+            "actions": [
+                {"actionId": action.action_id, "triggerField": action.trigger_field}
+                for action in plan.actions
+            ],
+        }
 
     def _normalize_section_input(self, section_data: dict[str, Any] | None) -> dict[str, dict[str, Any]]:
         if section_data is None:
@@ -249,9 +370,24 @@ class RuleService:
                 normalized[section_id] = payload
         return normalized
 
-    def _has_value(self, value: Any) -> bool:
-        if value is None:
-            return False
-        if isinstance(value, str):
-            return value.strip() != ""
-        return True
+
+def _condition_expressions(conditions: Conditions | None) -> dict[str, str]:
+    if conditions is None:
+        return {}
+    return {
+        f"{flag}When": condition.expression
+        for flag, condition in zip(FLAG_NAMES, conditions)
+        if condition is not None
+    }
+
+
+def validation_exception(errors: list[dict[str, Any]], location: tuple[str, ...]) -> HTTPException:
+    """422 in FastAPI's request-validation shape, one entry per message."""
+    return HTTPException(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        detail=[
+            {"loc": [*location, error["fieldId"]], "msg": message, "type": "value_error.rule"}
+            for error in errors
+            for message in error["messages"]
+        ],
+    )
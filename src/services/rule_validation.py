@@ -0,0 +1,143 @@
+"""Compile rule ``validation`` blocks into validator closures.
+
+Each supported key becomes one closure that returns an error message or
+``None``; regexes are compiled once, when the rule version is compiled.
+Empty values are never validated here: whether a value is required is
+expressed by the ``mandatory`` flag and reflected in section status.
+Unknown keys are passed through to clients untouched and not enforced.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable, Mapping
+from numbers import Real
+from typing import Any
+
+Validator = Callable[[Any], str | None]
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, Real) and not isinstance(value, bool)
+
+
+def _min_length(limit: int) -> Validator:
+    def validate(value: Any) -> str | None:
+        if not isinstance(value, str):
+            return "must be a string"
+        if len(value) < limit:
+            return f"must be at least {limit} characters"
+        return None
+
+    return validate
+
+
+def _max_length(limit: int) -> Validator:
+    def validate(value: Any) -> str | None:
+        if not isinstance(value, str):
+            return "must be a string"
+        if len(value) > limit:
+            return f"must be at most {limit} characters"
+        return None
+
+    return validate
+
+
+def _end_anchors(pattern: str) -> str:
+    """Rewrite ``$`` as ``\\Z``: Python's ``$`` also matches before a trailing newline."""
+    out: list[str] = []
+    index = 0
+    in_class = False
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\":
+            out.append(pattern[index:index + 2])
+            index += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            # A "]" right after "[" or "[^" is a literal member, not the end of the class.
+            end = index + 1
+            if pattern[end:end + 1] == "^":
+                end += 1
+            if pattern[end:end + 1] == "]":
+                end += 1
+            out.append(pattern[index:end])
+            index = end
+            in_class = True
+            continue
+        elif char == "$":
+            char = r"\Z"
+        out.append(char)
+        index += 1
+    return "".join(out)
+
+
+def _pattern(pattern: str) -> Validator:
+    try:
+        compiled = re.compile(_end_anchors(pattern))
+    except re.error as exc:
+        raise ValueError(f"invalid pattern {pattern!r}: {exc}") from exc
+
+    def validate(value: Any) -> str | None:
+        if not isinstance(value, str):
+            return "must be a string"
+        # JSON Schema semantics: unanchored search, and "$" only at the very end.
+        if compiled.search(value) is None:
+            return "has an invalid format"
+        return None
+
+    return validate
+
+
+def _minimum(limit: float) -> Validator:
+    def validate(value: Any) -> str | None:
+        if not _is_number(value):
+            return "must be a number"
+        if value < limit:
+            return f"must be at least {limit}"
+        return None
+
+    return validate
+
+
+def _maximum(limit: float) -> Validator:
+    def validate(value: Any) -> str | None:
+        if not _is_number(value):
+            return "must be a number"
+        if value > limit:
+            return f"must be at most {limit}"
+        return None
+
+    return validate
+
+
+def _int_limit(key: str, limit: Any) -> int:
+    if not isinstance(limit, int) or isinstance(limit, bool) or limit < 0:
+        raise ValueError(f"{key} must be a non-negative integer, got {limit!r}")
+    return limit
+
+
+def _number_limit(key: str, limit: Any) -> float:
+    if not _is_number(limit):
+        raise ValueError(f"{key} must be a number, got {limit!r}")
+    return limit
+
+
+_FACTORIES: dict[str, Callable[[Any], Validator]] = {
+    "minLength": lambda limit: _min_length(_int_limit("minLength", limit)),
+    "maxLength": lambda limit: _max_length(_int_limit("maxLength", limit)),
+    "pattern": lambda pattern: _pattern(str(pattern)),
+    "min": lambda limit: _minimum(_number_limit("min", limit)),
+    "max": lambda limit: _maximum(_number_limit("max", limit)),
+}
+
+
+def compile_validators(validation: Mapping[str, Any]) -> tuple[Validator, ...]:
+    """Compile a field's ``validation`` block; raises ValueError for malformed specs."""
+    return tuple(
+        factory(validation[key])
+        for key, factory in _FACTORIES.items()
+        if key in validation
+    )
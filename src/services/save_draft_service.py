@@ -1,8 +1,26 @@
+from datetime import datetime
+from typing import Any, NoReturn
+from uuid import UUID
+
 from fastapi import HTTPException, status
 
-from src.repositories.application_repository import ApplicationRepository
-from src.repositories.application_section_data_repository import ApplicationSectionDataRepository
-from src.schemas.save_draft import SaveDraftRequest, SaveDraftResponse
+from src.core import serialization
+from src.repositories.application_repository import ApplicationAggregate, ApplicationRepository
+from src.repositories.application_section_data_repository import (
+    ApplicationSectionDataRepository,
+    SectionDataWrite,
+)
+from src.schemas.save_draft import (
+    BulkSaveDraftRequest,
+    BulkSaveDraftResponse,
+    BulkSaveDraftResult,
+    SaveAndEvaluateRequest,
+    SaveAndEvaluateResponse,
+    SaveDraftRequest,
+    SaveDraftResponse,
+)
+from src.services.draft_write_coalescer import DraftWriteCoalescer
+from src.services.rule_service import RuleService, validation_exception
 
 
 class SaveDraftService:
@@ -10,24 +28,218 @@ class SaveDraftService:
         self,
         app_repository: ApplicationRepository,
         section_data_repository: ApplicationSectionDataRepository,
+        rule_service: RuleService,
+        write_coalescer: DraftWriteCoalescer | None = None,
+        validate_responses: bool = False,
     ) -> None:
         self.app_repository = app_repository
         self.section_data_repository = section_data_repository
+        self.rule_service = rule_service
+        self.write_coalescer = write_coalescer
+        self.validate_responses = validate_responses
 
     async def save(self, request: SaveDraftRequest) -> SaveDraftResponse:
-        application = await self.app_repository.get_by_id(request.applicationId)
-        if application is None:
+        timestamp, _ = await self._save(request)
+        return SaveDraftResponse(success=True, timestamp=timestamp)
+
+    async def save_and_evaluate(self, request: SaveAndEvaluateRequest) -> bytes:
+        """Save the draft and return the serialized :class:`SaveAndEvaluateResponse`.
+
+        The evaluation is built from the aggregate loaded for the write, with the
+        saved section replaced by the draft; nothing is read back after the write.
+        """
+        timestamp, evaluation = await self._save(request, evaluate=True, evaluation_token=request.evaluationToken)
+        document = {
+            **SaveDraftResponse(success=True, timestamp=timestamp).model_dump(mode="json"),
+            "evaluation": evaluation,
+        }
+        if self.validate_responses:
+            SaveAndEvaluateResponse.model_validate(document)
+        return serialization.dumps(document)
+
+    async def save_bulk(self, request: BulkSaveDraftRequest) -> BulkSaveDraftResponse:
+        """Save many sections, of one or many applications, in one transaction.
+
+        Every item is validated against its application's sections as they will
+        read after the write. Valid items are written with multi-row upserts;
+        invalid ones are reported per item (and, with ``atomic``, nothing is written).
+        """
+        items = request.items
+        if len({(item.applicationId, item.sectionId) for item in items}) != len(items):
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Application not found",
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Duplicate applicationId/sectionId pair",
             )
 
+        aggregates = await self.app_repository.get_aggregates(list(dict.fromkeys(item.applicationId for item in items)))
+        sections_after = self._sections_after(aggregates, items)
+        results: list[BulkSaveDraftResult] = []
+        for item in items:
+            aggregate = aggregates.get(item.applicationId)
+            if aggregate is None:
+                results.append(self._bulk_result(item, status.HTTP_404_NOT_FOUND, error="Application not found"))
+                continue
+            errors = self.rule_service.section_errors(
+                rule_version=aggregate.application.rule_version,
+                override_patch=aggregate.override_patch,
+                section_id=item.sectionId,
+                section_data=item.data,
+                other_sections=sections_after[item.applicationId],
+            )
+            if errors:
+                results.append(self._bulk_result(item, status.HTTP_422_UNPROCESSABLE_ENTITY, errors=errors))
+            else:
+                results.append(self._bulk_result(item, status.HTTP_200_OK))
+
+        if request.atomic and any(result.statusCode != status.HTTP_200_OK for result in results):
+            results = [
+                self._bulk_result(item, status.HTTP_424_FAILED_DEPENDENCY, error="Not saved: another item failed")
+                if result.statusCode == status.HTTP_200_OK
+                else result
+                for item, result in zip(items, results)
+            ]
+        accepted = [item for item, result in zip(items, results) if result.statusCode == status.HTTP_200_OK]
+        if not accepted:
+            return BulkSaveDraftResponse(success=False, timestamp=None, results=results)
+
+        # Statuses and invalidation follow from what is actually written.
+        sections_after = self._sections_after(aggregates, accepted)
+        rows: list[SectionDataWrite] = []
+        stale: dict[UUID, set[str]] = {}
+        for item in accepted:
+            aggregate = aggregates[item.applicationId]
+            rule_version = aggregate.application.rule_version
+            section_status, status_stamp = self.rule_service.section_status(
+                rule_version=rule_version,
+                override_patch=aggregate.override_patch,
+                section_id=item.sectionId,
+                section_data=item.data,
+                other_sections=sections_after[item.applicationId],
+            )
+            rows.append(
+                SectionDataWrite(
+                    item.applicationId,
+                    item.sectionId,
+                    item.data,
+                    section_status,
+                    status_stamp,
+                    self.rule_service.indexed_fields(rule_version, item.sectionId),
+                )
+            )
+            stale.setdefault(item.applicationId, set()).update(
+                self.rule_service.dependent_sections(rule_version, item.sectionId)
+            )
+        written = {(item.applicationId, item.sectionId) for item in accepted}
+
+        try:
+            await self.section_data_repository.upsert_many(rows)
+            for application_id, section_ids in stale.items():
+                await self.section_data_repository.clear_statuses(
+                    application_id,
+                    sorted(section_id for section_id in section_ids if (application_id, section_id) not in written),
+                )
+            await self.section_data_repository.commit()
+        except Exception as exc:  # pragma: no cover
+            await self.section_data_repository.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to save drafts",
+            ) from exc
+
+        return BulkSaveDraftResponse(
+            success=len(accepted) == len(items),
+            timestamp=self.section_data_repository.now_utc(),
+            results=results,
+        )
+
+    async def _save(
+        self,
+        request: SaveDraftRequest,
+        evaluate: bool = False,
+        evaluation_token: str | None = None,
+    ) -> tuple[datetime, dict[str, Any] | None]:
+        other_sections = None
+        if evaluate:
+            # One round trip for everything the evaluation needs besides the draft itself.
+            aggregate = await self.app_repository.get_aggregate(request.applicationId)
+            if aggregate is None:
+                self._raise_not_found()
+            application = aggregate.application
+            override_patch = aggregate.override_patch
+            other_sections = aggregate.section_data
+        else:
+            application = await self.app_repository.get_by_id(request.applicationId, with_override=True)
+            if application is None:
+                self._raise_not_found()
+            override_patch = application.override.override_patch if application.override is not None else None
+            if self.rule_service.input_sections(application.rule_version, request.sectionId):
+                # Conditional flags of this section read other sections' data.
+                aggregate = await self.app_repository.get_aggregate(application.id)
+                other_sections = aggregate.section_data if aggregate is not None else {}
+
+        errors = self.rule_service.section_errors(
+            rule_version=application.rule_version,
+            override_patch=override_patch,
+            section_id=request.sectionId,
+            section_data=request.data,
+            other_sections=other_sections,
+        )
+        if errors:
+            raise validation_exception(errors, ("body", "data"))
+
+        # A draft replaces the whole section, so its status follows from this payload
+        # (and the sections its conditions read).
+        section_status, status_stamp = self.rule_service.section_status(
+            rule_version=application.rule_version,
+            override_patch=override_patch,
+            section_id=request.sectionId,
+            section_data=request.data,
+            other_sections=other_sections,
+        )
+        # Sections whose conditions read this one; their stored status must be invalidated atomically.
+        dependent_sections = self.rule_service.dependent_sections(application.rule_version, request.sectionId)
+
+        evaluation = None
+        if evaluate:
+            # Pure computation; done before the write releases or expires the loaded rows.
+            saved = ApplicationAggregate(
+                application=application,
+                override_patch=override_patch,
+                section_data={**aggregate.section_data, request.sectionId: request.data},
+            )
+            evaluation = self.rule_service.evaluate(saved, request_section_data=None, evaluation_token=evaluation_token)
+
+        indexed_fields = self.rule_service.indexed_fields(application.rule_version, request.sectionId)
+        if self.write_coalescer is not None and not dependent_sections:
+            application_id = application.id
+            # Hand this request's connection back to the pool; the coalescer writes on its own session.
+            await self.app_repository.rollback()
+            try:
+                timestamp = await self.write_coalescer.submit(
+                    application_id=application_id,
+                    section_id=request.sectionId,
+                    data=request.data,
+                    status=section_status,
+                    status_stamp=status_stamp,
+                    indexed_fields=indexed_fields,
+                )
+            except Exception as exc:  # pragma: no cover
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="Failed to save draft",
+                ) from exc
+            return timestamp, evaluation
+
         try:
             await self.section_data_repository.upsert(
                 application_id=application.id,
                 section_id=request.sectionId,
                 data=request.data,
+                status=section_status,
+                status_stamp=status_stamp,
+                indexed_fields=indexed_fields,
             )
+            await self.section_data_repository.clear_statuses(application.id, dependent_sections)
             await self.section_data_repository.commit()
         except Exception as exc:  # pragma: no cover
             await self.section_data_repository.rollback()
@@ -36,7 +248,38 @@ class SaveDraftService:
                 detail="Failed to save draft",
             ) from exc
 
-        return SaveDraftResponse(
-            success=True,
-            timestamp=self.section_data_repository.now_utc(),
+        return self.section_data_repository.now_utc(), evaluation
+
+    @staticmethod
+    def _sections_after(
+        aggregates: dict[UUID, ApplicationAggregate],
+        items: list[SaveDraftRequest],
+    ) -> dict[UUID, dict[str, dict[str, Any]]]:
+        """Each application's section data with ``items`` applied."""
+        sections = {application_id: dict(aggregate.section_data) for application_id, aggregate in aggregates.items()}
+        for item in items:
+            if item.applicationId in sections:
+                sections[item.applicationId][item.sectionId] = item.data
+        return sections
+
+    @staticmethod
+    def _bulk_result(
+        item: SaveDraftRequest,
+        status_code: int,
+        errors: list[dict[str, Any]] | None = None,
+        error: str | None = None,
+    ) -> BulkSaveDraftResult:
+        return BulkSaveDraftResult(
+            applicationId=item.applicationId,
+            sectionId=item.sectionId,
+            statusCode=status_code,
+            errors=errors or [],
+            error=error,
+        )
+
+    @staticmethod
+    def _raise_not_found() -> NoReturn:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Application not found",
         )
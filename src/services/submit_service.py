@@ -1,45 +1,142 @@
+import logging
+from typing import Any
+from uuid import UUID
+
 from fastapi import HTTPException, status
 
+from src.repositories.application_override_repository import ApplicationOverrideRepository
 from src.repositories.application_repository import ApplicationRepository
-from src.schemas.submit import SubmitRequest, SubmitResponse
+from src.repositories.application_section_data_repository import ApplicationSectionDataRepository
+from src.schemas.submit import SubmitRequest, SubmitResponse, SubmittableApplicationsResponse
+from src.services.rule_plan import ConditionalOverlay, PlanOverlay, RulePlan, status_stamp
 from src.services.rule_service import RuleService
 
+logger = logging.getLogger(__name__)
+
 
 class SubmitService:
-    def __init__(self, app_repository: ApplicationRepository, rule_service: RuleService) -> None:
+    def __init__(
+        self,
+        app_repository: ApplicationRepository,
+        section_data_repository: ApplicationSectionDataRepository,
+        override_repository: ApplicationOverrideRepository,
+        rule_service: RuleService,
+    ) -> None:
         self.app_repository = app_repository
+        self.section_data_repository = section_data_repository
+        self.override_repository = override_repository
         self.rule_service = rule_service
 
     async def submit(self, request: SubmitRequest) -> SubmitResponse:
-        application = await self.app_repository.get_by_id(request.applicationId)
-        if application is None:
+        completion = await self.app_repository.get_completion(request.applicationId)
+        if completion is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Application not found",
             )
 
-        evaluation = await self.rule_service.evaluate(
-            application_id=application.id,
-            rule_version=application.rule_version,
-            phase=application.phase,
-            request_section_data={},
-        )
+        plan, overlay = self.rule_service.resolve(completion.rule_version, completion.override_patch)
+        stamp = status_stamp(plan, overlay)
 
-        mandatory_sections = [
-            section
-            for section in evaluation.sections
-            if section.mandatory and section.visible
-        ]
-        missing_mandatory_sections = [
-            section.sectionId
-            for section in mandatory_sections
-            if section.status != "COMPLETED"
-        ]
+        statuses: dict[str, str] = {}
+        errors: list[dict[str, Any]] = []
+        # Conditional section flags decide which sections are mandatory; they need the data.
+        stale = plan.has_section_conditions
+        for section_id, (section_status, section_stamp) in completion.section_statuses.items():
+            if plan.get_section(section_id) is None:
+                continue
+            if section_status is None or section_stamp != stamp:
+                stale = True
+                break
+            statuses[section_id] = section_status
 
-        if missing_mandatory_sections:
+        # A current stamp also certifies the section passed validation when it was written.
+        # Sections without a row are judged empty, conditions included.
+        flags = plan.resolve_conditions(overlay, {})
+        if stale:
+            statuses, errors, flags = await self._refresh_statuses(completion.application_id, plan, overlay, stamp)
+
+        missing_mandatory_sections = self.rule_service.missing_mandatory_sections(plan, flags, statuses)
+        if missing_mandatory_sections or errors:
             return SubmitResponse(
                 success=False,
                 missingMandatorySections=missing_mandatory_sections,
+                validationErrors=errors or None,
             )
 
         return SubmitResponse(success=True, nextPhase="POST_SANCTION")
+
+    async def list_submittable(self, rule_version: str, limit: int) -> SubmittableApplicationsResponse:
+        """Applications whose stored section statuses are current and complete for ``rule_version``."""
+        plan, base_overlay = self.rule_service.resolve(rule_version, None)
+        application_ids = await self.app_repository.get_ids_with_completed_sections(
+            rule_version=rule_version,
+            section_ids=self._required_sections(plan, base_overlay),
+            status_stamp=status_stamp(plan, base_overlay),
+            limit=limit,
+        )
+
+        # Overridden applications are grouped by effective overlay; identical patches share one query.
+        groups: dict[str, tuple[PlanOverlay, list[UUID]]] = {}
+        for override in await self.override_repository.get_by_rule_version(rule_version):
+            overlay = self.rule_service.rule_registry.resolve_overlay(plan, override.override_patch)
+            groups.setdefault(overlay.fingerprint, (overlay, []))[1].append(override.application_id)
+
+        for overlay, group_ids in groups.values():
+            if len(application_ids) >= limit:
+                break
+            application_ids += await self.app_repository.get_ids_with_completed_sections(
+                rule_version=rule_version,
+                section_ids=self._required_sections(plan, overlay),
+                status_stamp=status_stamp(plan, overlay),
+                application_ids=group_ids,
+                limit=limit - len(application_ids),
+            )
+
+        return SubmittableApplicationsResponse(ruleVersion=rule_version, applicationIds=application_ids)
+
+    def _required_sections(self, plan: RulePlan, overlay: PlanOverlay) -> list[str]:
+        """Sections that must be stored as COMPLETED for an application to be listed.
+
+        Sections with conditional flags are always required, which keeps the
+        listing conservative: it may omit a submittable application, never the reverse.
+        """
+        required = self.rule_service.missing_mandatory_sections(plan, plan.resolve_conditions(overlay, {}), {})
+        required += [
+            section.section_id
+            for section in plan.sections
+            if section.conditions is not None and section.section_id not in required
+        ]
+        return required
+
+    async def _refresh_statuses(
+        self,
+        application_id: UUID,
+        plan: RulePlan,
+        overlay: PlanOverlay,
+        stamp: str,
+    ) -> tuple[dict[str, str], list[dict[str, Any]], PlanOverlay | ConditionalOverlay]:
+        # Rules, overrides or a section read by conditions changed since these sections were
+        # written: recompute once and persist.
+        aggregate = await self.app_repository.get_aggregate(application_id)
+        section_data = aggregate.section_data if aggregate is not None else {}
+        flags = plan.resolve_conditions(overlay, section_data)
+        statuses = self.rule_service.section_statuses(plan, flags, section_data)
+        errors = self.rule_service.validation_errors(plan, flags, section_data)
+
+        # Sections that fail validation keep their stale stamp, so the next submit re-checks them.
+        invalid_sections = {error["sectionId"] for error in errors}
+        current = {
+            section_id: section_status
+            for section_id, section_status in statuses.items()
+            if section_id not in invalid_sections
+        }
+        try:
+            await self.section_data_repository.set_statuses(application_id, current, stamp)
+            await self.section_data_repository.commit()
+        except Exception as exc:
+            # The statuses are still correct for this request; persisting them is only an optimization.
+            logger.warning("Failed to persist refreshed section statuses for %s: %s", application_id, exc)
+            await self.section_data_repository.rollback()
+
+        return statuses, errors, flags
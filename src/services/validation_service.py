@@ -0,0 +1,63 @@
+import logging
+
+from fastapi import HTTPException, status
+
+from src.repositories.application_repository import ApplicationRepository
+from src.schemas.validation import BatchValidateItem, BatchValidateRequest, BatchValidateResponse, FieldError
+from src.services.rule_service import RuleService
+
+logger = logging.getLogger(__name__)
+
+
+class ValidationService:
+    def __init__(self, app_repository: ApplicationRepository, rule_service: RuleService) -> None:
+        self.app_repository = app_repository
+        self.rule_service = rule_service
+
+    async def validate_batch(self, request: BatchValidateRequest) -> BatchValidateResponse:
+        """Validate the persisted section data of many applications with set-based loading."""
+        application_ids = list(dict.fromkeys(request.applicationIds))
+        logger.info("Batch validate request for %d applications", len(application_ids))
+
+        self.app_repository.read_own_writes(application_ids)
+        aggregates = await self.app_repository.get_aggregates(application_ids)
+        results: list[BatchValidateItem] = []
+        for application_id in application_ids:
+            aggregate = aggregates.get(application_id)
+            if aggregate is None:
+                results.append(
+                    BatchValidateItem(
+                        applicationId=application_id,
+                        statusCode=status.HTTP_404_NOT_FOUND,
+                        error="Application not found",
+                    )
+                )
+                continue
+
+            try:
+                plan, overlay = self.rule_service.resolve(
+                    aggregate.application.rule_version,
+                    aggregate.override_patch,
+                )
+            except HTTPException as exc:
+                results.append(
+                    BatchValidateItem(
+                        applicationId=application_id,
+                        statusCode=exc.status_code,
+                        error=str(exc.detail),
+                    )
+                )
+                continue
+
+            flags = plan.resolve_conditions(overlay, aggregate.section_data)
+            errors = self.rule_service.validation_errors(plan, flags, aggregate.section_data)
+            results.append(
+                BatchValidateItem(
+                    applicationId=application_id,
+                    statusCode=status.HTTP_200_OK,
+                    valid=not errors,
+                    errors=[FieldError(**error) for error in errors],
+                )
+            )
+
+        return BatchValidateResponse(results=results)
@@ -0,0 +1,130 @@
+"""ActionService result-cache replays: ``python -m unittest src.tests.test_action_service``."""
+
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.core.database import Base
+from src.models.application import Application
+from src.repositories.application_repository import ApplicationRepository
+from src.repositories.application_section_data_repository import ApplicationSectionDataRepository
+from src.schemas.action import ActionItem, ActionRequest, BatchActionRequest
+from src.services.action_handlers import pull_bureau, verify_aadhaar, verify_pan
+from src.services.action_registry import ActionContext, ActionHandler, ActionOutcome, ActionRegistry
+from src.services.action_result_cache import ActionResultCache
+from src.services.action_service import ActionService
+from src.services.rule_registry import RuleRegistry
+from src.services.rule_service import RuleService
+
+RULE_CONFIG_DIR = Path(__file__).resolve().parents[1] / "rules"
+
+
+class ActionCacheReplayTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.engine = create_async_engine(f"sqlite+aiosqlite:///{self.directory.name}/actions.db")
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        self.session_factory = async_sessionmaker(self.engine, expire_on_commit=False)
+        self.rule_service = RuleService(RuleRegistry(RULE_CONFIG_DIR))
+        self.registry = ActionRegistry(default_timeout_seconds=5.0, default_max_concurrency=4)
+        self.calls: Counter[str] = Counter()
+
+    async def asyncTearDown(self) -> None:
+        await self.engine.dispose()
+        self.directory.cleanup()
+
+    def register(self, action_id: str, handler: ActionHandler) -> None:
+        async def counted(context: ActionContext) -> ActionOutcome:
+            self.calls[action_id] += 1
+            return await handler(context)
+
+        self.registry.register(action_id, counted, "KYC")
+
+    async def create_application(self, rule_version: str) -> UUID:
+        async with self.session_factory() as session:
+            application = Application(rule_version=rule_version, phase="PRE_SANCTION")
+            session.add(application)
+            await session.commit()
+            return application.id
+
+    async def run_action(self, cache: ActionResultCache, request: ActionRequest | BatchActionRequest):
+        async with self.session_factory() as session:
+            service = ActionService(
+                ApplicationRepository(session),
+                ApplicationSectionDataRepository(session),
+                self.rule_service,
+                self.registry,
+                result_cache=cache,
+            )
+            if isinstance(request, BatchActionRequest):
+                return await service.execute_batch(request)
+            return await service.execute(request)
+
+    async def test_retry_after_failed_action_calls_the_handler_again(self) -> None:
+        async def failing(context: ActionContext) -> ActionOutcome:
+            raise RuntimeError("provider unavailable")
+
+        self.register("VERIFY_PAN", failing)
+        cache = ActionResultCache(maxsize=16)
+        application_id = await self.create_application("1.0.0")
+        request = ActionRequest(
+            applicationId=application_id,
+            actionId="VERIFY_PAN",
+            payload={"panNumber": "ABCDE1234F"},
+        )
+
+        for _ in range(2):
+            response = await self.run_action(cache, request)
+            self.assertFalse(response.success)
+            self.assertEqual(response.message, "Action failed")
+        self.assertEqual(self.calls["VERIFY_PAN"], 2)
+
+    async def test_repeat_with_an_evicted_outcome_runs_that_action_again(self) -> None:
+        self.register("VERIFY_PAN", verify_pan)
+        self.register("VERIFY_AADHAAR", verify_aadhaar)
+        self.register("PULL_BUREAU", pull_bureau)
+        # Three outcomes in a two-entry cache: the first one is evicted.
+        cache = ActionResultCache(maxsize=2)
+        application_id = await self.create_application("1.1.0")
+        request = BatchActionRequest(
+            applicationId=application_id,
+            actions=[
+                ActionItem(actionId="VERIFY_PAN", payload={"panNumber": "ABCDE1234F"}),
+                ActionItem(actionId="VERIFY_AADHAAR", payload={"aadhaarNumber": "123412341234"}),
+                ActionItem(actionId="PULL_BUREAU", payload={"panNumber": "ABCDE1234F"}),
+            ],
+        )
+
+        first = await self.run_action(cache, request)
+        second = await self.run_action(cache, request)
+
+        self.assertTrue(first.success)
+        self.assertEqual(second, first)
+        self.assertEqual(self.calls, Counter({"VERIFY_PAN": 2, "VERIFY_AADHAAR": 1, "PULL_BUREAU": 1}))
+
+    async def test_repeat_of_an_applied_request_is_replayed(self) -> None:
+        self.register("VERIFY_PAN", verify_pan)
+        cache = ActionResultCache(maxsize=16)
+        application_id = await self.create_application("1.0.0")
+        request = ActionRequest(
+            applicationId=application_id,
+            actionId="VERIFY_PAN",
+            payload={"panNumber": "ABCDE1234F"},
+        )
+
+        first = await self.run_action(cache, request)
+        second = await self.run_action(cache, request)
+
+        self.assertTrue(first.success)
+        self.assertEqual(second, first)
+        self.assertEqual(self.calls["VERIFY_PAN"], 1)
+        self.assertEqual(cache.stats()["replayed"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()